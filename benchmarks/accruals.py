@@ -0,0 +1,68 @@
+"""Month-end close: full run vs. incremental rerun after one late invoice.
+
+    python benchmarks/accruals.py --properties 500 --invoices 40
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.accruals import AccrualEngine  # noqa: E402
+
+
+def synthetic_sources(properties, invoices_per_property, seed=0):
+    rng = np.random.default_rng(seed)
+    count = properties * invoices_per_property
+    service = pd.Timestamp("2025-03-01") + pd.to_timedelta(rng.integers(0, 31, count), "D")
+    posted = pd.Series(service + pd.to_timedelta(rng.integers(5, 45, count), "D")).dt.strftime("%Y-%m-%d")
+    invoices = pd.DataFrame({
+        "invoice": [f"INV-{i:07d}" for i in range(count)],
+        "property": rng.integers(0, properties, count).astype(str),
+        "account": rng.choice(["Maintenance", "Utilities", "Landscaping", "Cleaning"], count),
+        "amount": rng.uniform(20, 5_000, count).round(2),
+        "service_date": service.strftime("%Y-%m-%d"),
+        "posted_date": posted.where(rng.random(count) < 0.7, ""),
+    })
+    rules = pd.DataFrame({
+        "rule": [f"TAX-{i}" for i in range(properties)],
+        "property": np.arange(properties).astype(str),
+        "account": "Property Tax Expense",
+        "amount": rng.uniform(500, 5_000, properties).round(2),
+        "start": "2025-01",
+        "end": "",
+    })
+    return invoices, rules
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=500)
+    parser.add_argument("--invoices", type=int, default=40, help="open invoices per property")
+    args = parser.parse_args()
+
+    invoices, rules = synthetic_sources(args.properties, args.invoices)
+    engine = AccrualEngine()
+    close, seconds = timed(engine.close, "2025-03", invoices, rules)
+    print(f"full close: {len(invoices) + len(rules):,} sources -> {len(close):,} lines in {seconds * 1000:.0f} ms")
+
+    late = invoices.iloc[:1].assign(invoice="INV-LATE", amount=123.45)
+    close, seconds = timed(engine.close, "2025-03", pd.concat([invoices, late], ignore_index=True), rules)
+    print(f"rerun with one late invoice: {close.changes} in {seconds * 1000:.0f} ms")
+
+    journal, seconds = timed(close.journal)
+    print(f"journal: {len(journal):,} lines, balanced {journal.is_balanced()}, in {seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
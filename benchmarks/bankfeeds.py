@@ -0,0 +1,108 @@
+"""Ingestion of a year of overlapping bank feed downloads.
+
+    python benchmarks/bankfeeds.py --accounts 36 --per-day 12 --overlap 30
+
+Generates a year of transactions per account and, for every month, one
+statement download that also repeats the previous ``--overlap`` days (as
+banks' "last 60/90 days" exports do). Two thirds of the accounts download
+OFX, the rest CSV. All downloads are ingested into one FeedStore and the
+time, throughput and duplicate count are reported; the stored transactions
+must equal the generated ones exactly.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.bankfeeds import FeedStore  # noqa: E402
+
+PAYEES = np.array(["Coffee Bar", "Hardware Supply", "City Utilities", "Payroll", "Tenant Deposit",
+                   "Insurance Premium", "Landscaping", "Card Settlement"])
+
+
+def account_year(account, per_day, rng):
+    days = np.sort(rng.integers(0, 365, per_day * 365)) + int(np.datetime64("2025-01-01", "D").astype(int))
+    return pd.DataFrame({
+        "day": days,
+        "cents": rng.integers(-250_000, 250_000, len(days)),
+        "fitid": [f"{account}-{i:07d}" for i in range(len(days))],
+        "payee": PAYEES[rng.integers(0, len(PAYEES), len(days))],
+        "check": np.where(rng.random(len(days)) < 0.1, rng.integers(1000, 9999, len(days)).astype(str), ""),
+    })
+
+
+def ofx_download(account, lines):
+    dates = lines["day"].to_numpy().astype("datetime64[D]").astype(str)
+    records = "".join(
+        f"<STMTTRN><TRNTYPE>OTHER<DTPOSTED>{date.replace('-', '')}120000<TRNAMT>{cents / 100:.2f}"
+        f"<FITID>{fitid}{f'<CHECKNUM>{check}' if check else ''}<NAME>{payee}</STMTTRN>\n"
+        for date, cents, fitid, check, payee in zip(dates, lines["cents"], lines["fitid"], lines["check"],
+                                                    lines["payee"])
+    )
+    balance = lines["cents"].sum() / 100
+    return (f"OFXHEADER:100\nDATA:OFXSGML\nVERSION:102\nCHARSET:1252\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>"
+            f"<BANKACCTFROM><BANKID>021000021<ACCTID>{account}<ACCTTYPE>CHECKING</BANKACCTFROM>\n<BANKTRANLIST>\n"
+            f"{records}</BANKTRANLIST><LEDGERBAL><BALAMT>{balance:.2f}<DTASOF>{dates[-1].replace('-', '')}"
+            f"</LEDGERBAL></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n").encode("cp1252")
+
+
+def csv_download(account, lines):
+    frame = pd.DataFrame({
+        "Posted Date": lines["day"].to_numpy().astype("datetime64[D]").astype("datetime64[s]"),
+        "Description": lines["payee"].to_numpy(),
+        "Debit": np.where(lines["cents"] < 0, (-lines["cents"] / 100).map("{:,.2f}".format), ""),
+        "Credit": np.where(lines["cents"] >= 0, (lines["cents"] / 100).map("${:,.2f}".format), ""),
+        "Check Number": lines["check"].to_numpy(),
+        "Account": account,
+    })
+    frame["Posted Date"] = frame["Posted Date"].dt.strftime("%m/%d/%Y")
+    return f"Account: {account}\nExported by the bank\n\n".encode() + frame.to_csv(index=False).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=36)
+    parser.add_argument("--per-day", type=int, default=12, help="transactions per account per day")
+    parser.add_argument("--overlap", type=int, default=30, help="days each download repeats")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    downloads, generated = [], 0
+    month_starts = np.arange("2025-01", "2026-01", dtype="datetime64[M]").astype("datetime64[D]").astype(int)
+    for number in range(args.accounts):
+        account = f"ACCT-{number:03d}"
+        year = account_year(account, args.per_day, rng)
+        generated += len(year)
+        write = ofx_download if number % 3 else csv_download
+        extension = "qfx" if number % 3 else "csv"
+        for month, first in enumerate(month_starts):
+            last = month_starts[month + 1] if month + 1 < len(month_starts) else first + 31
+            lines = year[(year["day"] >= first - args.overlap) & (year["day"] < last)]
+            downloads.append((f"{account}-{month + 1:02d}.{extension}", write(account, lines)))
+    size = sum(len(data) for _, data in downloads)
+    print(f"generate {time.perf_counter() - start:7.2f} s   {len(downloads)} downloads, {size / 2**20:.0f} MB, "
+          f"{generated:,} distinct transactions")
+
+    store = FeedStore()
+    start = time.perf_counter()
+    summaries = [store.ingest(data, name) for name, data in downloads]
+    seconds = time.perf_counter() - start
+    lines = sum(summary["Lines"] for summary in summaries)
+    duplicates = sum(summary["Duplicates"] for summary in summaries)
+    print(f"ingest   {seconds:7.2f} s   {lines / seconds:,.0f} lines/s, {size / 2**20 / seconds:.0f} MB/s")
+    for kind in ("OFX", "CSV"):
+        part = [summary for summary in summaries if summary["Format"] == kind]
+        print(f"  {kind}  {len(part):4d} files  {sum(s['Lines'] for s in part):>10,} lines  "
+              f"{sum(s['Duplicates'] for s in part):>10,} duplicates dropped")
+    print(f"stored   {len(store):,} transactions ({duplicates:,} duplicates dropped), "
+          f"{'matches' if len(store) == generated else 'DOES NOT MATCH'} the generated year")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compile time and per-rerun lookup cost of a large content catalog.
+
+    python benchmarks/catalog.py --modules 50 --questions 20
+
+Writes a generated course (one page file per module, each with teaching
+text, an expander, a reference table, an exercise and a multiple-choice quiz)
+to a temporary directory, then reports:
+
+    compile   parsing, validating and compiling every page (once per process)
+    rerun     the stat digest main.py checks on every rerun before reusing
+              the compiled catalog
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.catalog import catalog_files, read_catalog  # noqa: E402
+from course.reference import files_digest  # noqa: E402
+
+TEACHING = [
+    "**Topic {module}.{part}:**  ",
+    "- Definition: every transaction is recorded as balanced debits and credits.",
+    "- Normal Balance: assets and expenses increase with debits; liabilities, equity and revenue with credits.",
+    "- Journal Entry: total debits must equal total credits.",
+    "",
+]
+
+
+def page(module, questions):
+    options = ["Please select", "Assets", "Liabilities", "Equity", "Revenue", "Expenses"]
+    return {
+        "label": f"Module {module}: Generated Module",
+        "blocks": [
+            {"type": "header", "text": f"Module {module}: Generated Module"},
+            {"type": "markdown", "text": "### Teaching Section"},
+            {"type": "expander", "title": "Learn the Basics", "expanded": True, "blocks": [
+                {"type": "markdown", "text": [line.format(module=module, part=part)
+                                              for part in range(8) for line in TEACHING]},
+                {"type": "table", "section": "module1", "name": "rental_example"},
+            ]},
+            {"type": "exercise", "function": "course.pages.module1:pipe_replacement_exercise"},
+            {"type": "multiple_choice", "section": f"generated{module}", "title": f"Module {module} Quiz",
+             "options": options,
+             "questions": [{"key": f"m{module}_q{i}", "prompt": f"{i}. Which category is account {i}?",
+                            "answer": options[1 + i % 5]} for i in range(questions)],
+             "submit": {"key": f"submit_m{module}_quiz", "label": "Submit Quiz"}},
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--reruns", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for module in range(1, args.modules + 1):
+            with open(os.path.join(directory, f"{module:03d}-module{module}.json"), "w") as f:
+                json.dump(page(module, args.questions), f, indent=2)
+        size = sum(os.path.getsize(path) for path in catalog_files(directory))
+        print(f"{args.modules} pages, {args.modules * args.questions:,} questions, {size / 1024:.0f} KB of JSON")
+
+        start = time.perf_counter()
+        catalog = read_catalog(directory)
+        print(f"compile  {(time.perf_counter() - start) * 1000:8.2f} ms  ({len(catalog.pages)} pages)")
+
+        timings = []
+        for _ in range(args.reruns):
+            start = time.perf_counter()
+            files_digest(catalog_files(directory))
+            timings.append(time.perf_counter() - start)
+        print(f"rerun    {statistics.median(timings) * 1e6:8.1f} us  median digest check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Chart of Accounts index build, type-ahead search and classification.
+
+    python benchmarks/chart_of_accounts.py --accounts 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.chart_of_accounts import ChartOfAccounts  # noqa: E402
+
+WORDS = ("rent", "cash", "tenant", "deposit", "repair", "roof", "hvac", "plumbing", "payroll", "tax",
+         "insurance", "utility", "receivable", "payable", "accrued", "marketing", "parking", "laundry")
+QUERIES = ("r", "ro", "roof", "roof ta", "2000", "5123-0", "rent cash hvac", "zzz")
+
+
+def synthetic_chart(accounts, children=7, seed=0):
+    """Header accounts every ``children`` rows, numbered across 1000-9999."""
+    rng = np.random.default_rng(seed)
+    row = np.arange(accounts)
+    header = 1000 + (row // children) % 9000
+    sub = row % children + (row // children // 9000) * children
+    numbers = [f"{h}-{s:02d}" for h, s in zip(header, sub)]
+    parents = ["" if s % children == 0 else f"{h}-{s - s % children:02d}" for h, s in zip(header, sub)]
+    names = [" ".join(words) + f" {i}" for i, words in enumerate(rng.choice(WORDS, (accounts, 3)))]
+    return pd.DataFrame({"number": numbers, "name": names, "parent": parents})
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=50_000)
+    args = parser.parse_args()
+
+    frame = synthetic_chart(args.accounts)
+    chart, seconds = timed(ChartOfAccounts, frame)
+    print(f"index {len(chart):,} accounts in {seconds:.2f} s")
+
+    for query in QUERIES:
+        matches, seconds = timed(chart.search, query)
+        print(f"search {query!r:18} {len(matches):3} matches in {seconds * 1000:.3f} ms")
+
+    numbers = frame["number"].sample(10_000, random_state=0).tolist()
+    _, seconds = timed(lambda: [chart.classify(number) for number in numbers])
+    print(f"classify: {seconds / len(numbers) * 1e6:.2f} us per account")
+
+    balances = pd.Series(1.0, index=frame["number"])
+    totals, seconds = timed(chart.rollup, balances)
+    print(f"roll up {len(balances):,} balances in {seconds * 1000:.1f} ms (top-level total {totals.max():,.0f})")
+
+
+if __name__ == "__main__":
+    main()
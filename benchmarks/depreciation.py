@@ -0,0 +1,97 @@
+"""Asset register depreciation: streamed array schedule vs. a per-asset loop.
+
+    python benchmarks/depreciation.py --assets 100000 --months 360
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.depreciation import METHODS, AssetRegister  # noqa: E402
+
+
+def synthetic_register(assets, seed=0):
+    rng = np.random.default_rng(seed)
+    life = rng.choice([36, 60, 120, 240, 300], assets)
+    cost = rng.uniform(1_000, 1_000_000, assets).round(2)
+    disposal = pd.Series(pd.NaT, index=range(assets))
+    disposed = rng.random(assets) < 0.1
+    disposal[disposed] = pd.Timestamp("2030-01-01") + pd.to_timedelta(rng.integers(0, 3650, disposed.sum()), "D")
+    return pd.DataFrame({
+        "asset": [f"A{i:06d}" for i in range(assets)],
+        "asset_class": rng.choice(["Buildings", "Improvements", "Equipment", "Vehicles"], assets),
+        "cost": cost,
+        "salvage": (cost * rng.choice([0, 0.05, 0.1], assets)).round(2),
+        "life_months": life,
+        "method": rng.choice(METHODS, assets, p=[0.7, 0.2, 0.1]),
+        "in_service": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 730, assets), "D"),
+        "disposal": disposal,
+        "proceeds": (cost * 0.2).round(2),
+        "total_units": life * 100.0,
+        "monthly_units": rng.uniform(50, 150, assets),
+    })
+
+
+def naive_straight_line(register, months):
+    """Per-asset, per-month loop for straight-line only (the cheapest method)."""
+    rows = []
+    for asset in register.itertuples(index=False):
+        monthly = (asset.cost - asset.salvage) / asset.life_months
+        accumulated = 0.0
+        for month in range(months):
+            charge = min(monthly, asset.cost - asset.salvage - accumulated)
+            if charge <= 0:
+                break
+            accumulated += charge
+            rows.append({"asset": asset.asset, "month": month, "depreciation": charge, "accumulated": accumulated})
+    return pd.DataFrame(rows)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--naive-sample", type=int, default=500,
+                        help="assets to run through the naive loop (time is extrapolated)")
+    args = parser.parse_args()
+
+    frame = synthetic_register(args.assets)
+    register, seconds = timed(AssetRegister, frame)
+    print(f"encode {args.assets:,} assets in {seconds:.2f} s")
+
+    def stream():
+        total = 0
+        for _, depreciation, _, _ in register.periods(months=args.months):
+            total += int(depreciation.sum())
+        return total
+
+    total, seconds = timed(stream)
+    print(f"streamed schedule: {args.months} months in {seconds:.2f} s "
+          f"({seconds / args.months * 1000:.1f} ms per month), total depreciation ${total / 100:,.2f}")
+
+    def entries():
+        return sum(len(journal) for _, journal in register.journal_entries(months=args.months))
+
+    lines, seconds = timed(entries)
+    print(f"journal entries: {lines:,} lines in {seconds:.2f} s")
+
+    sample = frame.head(min(args.naive_sample, args.assets))
+    _, naive_seconds = timed(naive_straight_line, sample, args.months)
+    projected = naive_seconds * args.assets / len(sample)
+    print(f"naive straight-line loop: {len(sample)} assets in {naive_seconds:.2f} s, projected {projected:.0f} s "
+          f"for {args.assets:,} assets")
+
+
+if __name__ == "__main__":
+    main()
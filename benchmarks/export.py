@@ -0,0 +1,48 @@
+"""Streaming export of a large recurring schedule to CSV, Parquet and Excel.
+
+    python benchmarks/export.py --leases 41667 --months 120
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.export import export  # noqa: E402
+from course.recurring import recurring_schedule  # noqa: E402
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=41_667)
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--formats", nargs="+", default=["parquet", "csv", "xlsx"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    schedule = recurring_schedule(rng.uniform(1_000, 50_000, args.leases).round(2), "Monthly", args.months,
+                                  start_date="2025-01-01", spread=True)
+    print(f"schedule: {len(schedule):,} lines, {schedule.nbytes / 2**20:.0f} MB encoded, "
+          f"peak RSS {peak_rss_mb():.0f} MB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in args.formats:
+            path = os.path.join(directory, f"schedule.{file_format}")
+            start = time.perf_counter()
+            export(schedule, path, file_format)
+            seconds = time.perf_counter() - start
+            print(f"{file_format:8} {seconds:6.1f} s  {os.path.getsize(path) / 2**20:8.0f} MB  "
+                  f"{len(schedule) / seconds:12,.0f} lines/s  peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cohort grading: every learner's journal entries graded in one pass.
+
+    python benchmarks/grading.py --learners 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.grading import cohort_report, grade  # noqa: E402
+
+CONTENT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "course", "content")
+
+
+def answer_key():
+    import json
+
+    frames = []
+    for section in ("module1", "module2"):
+        with open(os.path.join(CONTENT, f"{section}.json"), encoding="utf-8") as f:
+            frames.append(pd.DataFrame(json.load(f)["answer_key"]["data"]))
+    return pd.concat(frames, ignore_index=True)
+
+
+def cohort(key, learners, seed=0):
+    """Every learner answers every exercise; about a third of lines have a mistake."""
+    rng = np.random.default_rng(seed)
+    lines = pd.concat([key] * learners, ignore_index=True)
+    lines.insert(0, "Submission", np.repeat(np.arange(learners), len(key)).astype(str))
+    mistake = rng.integers(0, 9, len(lines))
+    lines.loc[mistake == 0, "Amount ($)"] += 10
+    lines.loc[mistake == 1, "Entry Type"] = lines.loc[mistake == 1, "Entry Type"].map({"Debit": "Credit", "Credit": "Debit"})
+    lines.loc[mistake == 2, "Account"] = "Cash"
+    return lines
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--learners", type=int, default=10_000)
+    args = parser.parse_args()
+
+    key = answer_key()
+    submissions = cohort(key, args.learners)
+    grades, seconds = timed(grade, submissions, key)
+    passed = int(grades.summary["passed"].sum())
+    print(f"graded {len(submissions):,} lines / {len(grades.summary):,} entries in {seconds:.2f} s "
+          f"({passed:,} passed)")
+    report, seconds = timed(cohort_report, grades)
+    print(f"cohort report for {len(report):,} learners in {seconds * 1000:.0f} ms")
+    print(grades.lines["status"].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
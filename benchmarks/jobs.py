@@ -0,0 +1,111 @@
+"""Statement matching inline vs. as a background job.
+
+    python benchmarks/jobs.py --lines 1000000 --sessions 8
+
+Matches a generated bank statement against a cash book of the same size
+three ways and reports wall time and how responsive the calling process
+stays (the worst gap seen by a thread that wakes every millisecond, which
+stands in for the Streamlit server's event loop):
+
+    inline      reconcile_statements on the calling thread
+    background  one job through course.jobs.JobRunner
+    deduped     --sessions identical submissions at once (one job runs)
+
+Finally a fresh job is cancelled mid-run and the time until it stops is shown.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.jobs import Cancelled, JobRunner  # noqa: E402
+from course.reconciliation import reconcile_statements  # noqa: E402
+
+
+def statements(lines, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, lines), unit="D")
+    book = pd.DataFrame({
+        "date": days.strftime("%Y-%m-%d"),
+        "amount": rng.integers(-500_000, 500_000, lines) / 100,
+        "reference": np.where(rng.random(lines) < 0.5, pd.Series(np.arange(lines)).map("CHK{}".format), ""),
+    })
+    cleared = rng.random(lines) < 0.95
+    bank = book[cleared].assign(date=(days[cleared] + pd.to_timedelta(rng.integers(0, 3, cleared.sum()), unit="D"))
+                                .strftime("%Y-%m-%d"))
+    return bank.to_csv(index=False).encode(), book.to_csv(index=False).encode()
+
+
+class Heartbeat:
+    """Measures the longest stall of a thread that sleeps 1 ms at a time."""
+
+    def __enter__(self):
+        self.running, self.worst = True, 0.0
+        self.thread = threading.Thread(target=self.beat, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+
+    def beat(self):
+        last = time.perf_counter()
+        while self.running:
+            time.sleep(0.001)
+            now = time.perf_counter()
+            self.worst = max(self.worst, now - last)
+            last = now
+
+
+def timed(label, run):
+    with Heartbeat() as heartbeat:
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+    print(f"{label:12} {seconds:7.2f} s   worst stall {heartbeat.worst * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--tolerance", type=int, default=3)
+    args = parser.parse_args()
+
+    bank, book = statements(args.lines)
+    print(f"{args.lines:,} book lines, {len(bank) / 2**20:.0f} MB + {len(book) / 2**20:.0f} MB of CSV")
+    runner = JobRunner()
+    # Start the workers (and their imports) before timing anything.
+    runner.submit(reconcile_statements, b"date,amount\n", b"date,amount\n").result()
+
+    timed("inline", lambda: reconcile_statements(bank, book, args.tolerance))
+    timed("background", lambda: runner.submit(reconcile_statements, bank, book, args.tolerance).result())
+
+    def deduped():
+        jobs = [runner.submit(reconcile_statements, bank, book, args.tolerance + 1) for _ in range(args.sessions)]
+        assert len({id(job) for job in jobs}) == 1
+        jobs[0].result()
+    timed(f"deduped x{args.sessions}", deduped)
+
+    job = runner.submit(reconcile_statements, bank, book, args.tolerance + 2)
+    while job.progress < 0.3:
+        time.sleep(0.01)
+    start = time.perf_counter()
+    job.cancel()
+    try:
+        job.result()
+    except Cancelled:
+        pass
+    print(f"cancel       {time.perf_counter() - start:7.2f} s   until the job stopped ({job.status})")
+    runner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Journal store persistence: Arrow (memory-mapped) vs. Parquet vs. CSV.
+
+    python benchmarks/journal_store.py --leases 10000 --periods 360
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.recurring import Schedule, recurring_schedule  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=10_000)
+    parser.add_argument("--periods", type=int, default=360)
+    parser.add_argument("--csv", action="store_true", help="also time a CSV round trip of the decoded frame")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    totals = rng.uniform(1_000, 100_000, args.leases).round(2)
+    schedule = recurring_schedule(totals, "Monthly", args.periods, start_date="2025-01-01", spread=True)
+    debit, credit = schedule.totals_cents()
+    print(f"{len(schedule):,} lines, {schedule.nbytes / 2**20:.0f} MiB in memory, "
+          f"debits {debit:,} = credits {credit:,} cents; lease totals exact: "
+          f"{debit == int(np.round(totals * 100).sum())}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ("arrow", "parquet"):
+            path = os.path.join(directory, f"journal.{extension}")
+            _, save_seconds = timed(schedule.save, path)
+            loaded, open_seconds = timed(Schedule.open, path)
+            _, total_seconds = timed(loaded.totals_cents)
+            print(f"{extension:8} save {save_seconds:6.2f} s  open {open_seconds * 1000:8.1f} ms  "
+                  f"totals {total_seconds * 1000:6.1f} ms  {os.path.getsize(path) / 2**20:6.0f} MiB on disk")
+        if args.csv:
+            path = os.path.join(directory, "journal.csv")
+            frame = schedule.to_frame()
+            _, save_seconds = timed(frame.to_csv, path, index=False)
+            _, open_seconds = timed(pd.read_csv, path)
+            print(f"{'csv':8} save {save_seconds:6.2f} s  open {open_seconds * 1000:8.1f} ms  "
+                  f"{os.path.getsize(path) / 2**20:6.0f} MiB on disk")
+
+
+if __name__ == "__main__":
+    main()
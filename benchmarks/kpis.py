@@ -0,0 +1,53 @@
+"""KPI cube build time and per-filter slicing latency.
+
+    python benchmarks/kpis.py --properties 5000 --years 10 --queries 500
+
+Builds the cube from a generated portfolio, then runs random dashboard
+filter changes (regions, portfolios, year range, grain, breakdown level) and
+reports p50 / p99 / max latency of the three lookups one change triggers.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.kpis import LEVELS, KpiCube, sample_portfolio  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=5_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    inputs = sample_portfolio(args.properties, args.years)
+    print(f"generate  {time.perf_counter() - start:6.2f} s  ({len(inputs[1]):,} leases, {len(inputs[2]):,} GL lines)")
+    start = time.perf_counter()
+    cube = KpiCube(*inputs)
+    print(f"build     {time.perf_counter() - start:6.2f} s")
+
+    rng = np.random.default_rng(1)
+    years = cube.years()
+    latencies = []
+    for _ in range(args.queries):
+        regions = list(rng.choice(cube.regions, rng.integers(0, 3), replace=False))
+        portfolios = list(rng.choice(cube.portfolios, rng.integers(0, 2), replace=False))
+        first, last = sorted(rng.choice(years, 2))
+        start = time.perf_counter()
+        cube.summary(regions, portfolios, first, last)
+        cube.series(regions, portfolios, first, last, rng.choice(["Month", "Year"]))
+        cube.breakdown(rng.choice(LEVELS), regions, portfolios, first, last)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    print(f"filter change  p50 {np.percentile(latencies, 50):6.2f} ms  p99 {np.percentile(latencies, 99):6.2f} ms  "
+          f"max {latencies.max():6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
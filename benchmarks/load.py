@@ -0,0 +1,287 @@
+"""Concurrent-learner load test against a locally started Streamlit server.
+
+    python benchmarks/load.py --users 1 5 10 25 --walks 2
+
+For each N in ``--users`` a fresh server is started on localhost and N
+simulated learners connect to it over Streamlit's websocket protocol, the
+same one the browser speaks. Each learner walks the course:
+
+    open the app, switch to Module 1 and submit both journal entry editors,
+    switch to Module 2 and submit the accrual entry, switch to Module 4 and
+    run the Lease Incentive Simulator (term, incentive, recurring entry),
+    switch to Module 7 and submit the final quiz.
+
+Every step is one rerun round trip: the widget states are sent as a BackMsg
+and the step ends when the server reports the script (or fragment) finished.
+The report gives, per N, reruns per second, p50/p99 rerun latency, script
+exceptions, and the server's baseline and peak RSS. Nothing leaves the
+machine: the server is bound to 127.0.0.1 with usage stats off.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+
+from course.catalog import course_catalog  # noqa: E402
+from course.reference import reference_frame  # noqa: E402
+
+FINISHED = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+            ForwardMsg.FINISHED_WITH_COMPILE_ERROR}
+NAVIGATION_LABEL = "Go to"
+STARTUP_TIMEOUT = 60  # seconds
+
+
+# --- Server -----------------------------------------------------------------------
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class Server:
+    """``streamlit run main.py`` on a free localhost port, with RSS sampling."""
+
+    def __init__(self):
+        self.port = free_port()
+        self.directory = tempfile.TemporaryDirectory()
+        env = dict(os.environ, COURSE_PROGRESS_DB=os.path.join(self.directory.name, "progress.db"))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "main.py"),
+             "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(self.port),
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+             "--global.developmentMode", "false"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.peak = 0
+        self.sampling = False
+
+    def wait_ready(self):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("Streamlit server did not start")
+
+    def rss(self):
+        try:
+            with open(f"/proc/{self.process.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def sample(self):
+        while self.sampling:
+            self.peak = max(self.peak, self.rss())
+            time.sleep(0.05)
+
+    def start_sampling(self):
+        self.peak = self.rss()
+        self.sampling = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def stop_sampling(self):
+        self.sampling = False
+        self.thread.join()
+        return self.peak
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.directory.cleanup()
+
+
+# --- Learner session ----------------------------------------------------------------
+
+class Learner:
+    """One browser tab: keeps widget states and sends reruns over the websocket."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.widgets = {}  # key (or label for unkeyed widgets) -> (element id, fragment id)
+        self.states = {}  # element id -> WidgetState sent with every rerun
+        self.latencies = []
+        self.exceptions = 0
+
+    def widget(self, name):
+        return self.widgets[name]
+
+    def set(self, name, **value):
+        element_id, _ = self.widget(name)
+        state = WidgetState(id=element_id, **value)
+        self.states[element_id] = state
+
+    def edit(self, name, rows):
+        self.set(name, string_value=json.dumps({
+            "edited_rows": {str(row): values for row, values in rows.items()},
+            "added_rows": [],
+            "deleted_rows": [],
+        }))
+
+    async def rerun(self, trigger=None):
+        """One round trip; ``trigger`` names a button to press."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            element_id, fragment_id = self.widget(trigger)
+            client_state.widget_states.widgets.append(WidgetState(id=element_id, trigger_value=True))
+            client_state.fragment_id = fragment_id
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.websocket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self.read_delta(forward.delta)
+            elif kind == "script_finished" and forward.script_finished in FINISHED:
+                break
+        self.latencies.append(time.perf_counter() - start)
+
+    def read_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element_type = delta.new_element.WhichOneof("type")
+        if element_type == "exception":
+            self.exceptions += 1
+            return
+        element = getattr(delta.new_element, element_type)
+        element_id = getattr(element, "id", "")
+        if not element_id.startswith("$$ID-"):
+            return
+        key = element_id.rsplit("-", 1)[-1]
+        name = getattr(element, "label", "") if key == "None" else key
+        self.widgets[name] = (element_id, delta.fragment_id)
+
+
+def answer_rows(section, exercise):
+    key = reference_frame(section, "answer_key")
+    key = key[key["Exercise"] == exercise].drop(columns="Exercise").reset_index(drop=True)
+    return dict(enumerate(key.to_dict("records")))
+
+
+async def walk(learner, pages):
+    await learner.rerun()
+
+    learner.set(NAVIGATION_LABEL, string_value=pages[1])
+    await learner.rerun()
+    learner.edit("invoice_editor", answer_rows("module1", "pipe_invoice"))
+    learner.edit("payment_editor", answer_rows("module1", "pipe_payment"))
+    await learner.rerun("submit_quiz_mod1_table")
+
+    learner.set(NAVIGATION_LABEL, string_value=pages[2])
+    await learner.rerun()
+    learner.edit("accrual_editor", answer_rows("module2", "tax_accrual"))
+    await learner.rerun("submit_accrual")
+
+    learner.set(NAVIGATION_LABEL, string_value=pages[4])
+    await learner.rerun()
+    learner.set("lease_term", string_value="12")
+    await learner.rerun()
+    learner.set("lease_incentive", double_value=1200)
+    await learner.rerun()
+    line = {"Amount ($)": 100, "Duration": 12}
+    learner.edit("lease_entry_editor", {0: line, 1: line})
+    await learner.rerun("submit_lease_entry")
+
+    learner.set(NAVIGATION_LABEL, string_value=pages[7])
+    await learner.rerun()
+    for question in course_catalog().quizzes["module6"].questions:
+        learner.set(question.key, string_value=question.options[1])
+    await learner.rerun("submit_final_quiz")
+
+
+async def learner_session(port, pages, walks):
+    async with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                       max_size=None) as websocket:
+        learner = Learner(websocket)
+        for _ in range(walks):
+            await walk(learner, pages)
+        return learner
+
+
+async def run_learners(port, pages, users, walks):
+    return await asyncio.gather(*(learner_session(port, pages, walks) for _ in range(users)))
+
+
+def run_load(users, walks, pages):
+    server = Server()
+    try:
+        server.wait_ready()
+        # One learner warms the server (imports, caches) before measuring.
+        asyncio.run(run_learners(server.port, pages, 1, 1))
+        baseline = server.rss()
+        server.start_sampling()
+        start = time.perf_counter()
+        learners = asyncio.run(run_learners(server.port, pages, users, walks))
+        seconds = time.perf_counter() - start
+        peak = server.stop_sampling()
+    finally:
+        server.stop()
+    latencies = np.concatenate([learner.latencies for learner in learners])
+    return {
+        "users": users,
+        "reruns": len(latencies),
+        "seconds": round(seconds, 2),
+        "reruns_per_second": round(len(latencies) / seconds, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 1),
+        "exceptions": sum(learner.exceptions for learner in learners),
+        "baseline_rss_mb": round(baseline / 2**20, 1),
+        "peak_rss_mb": round(peak / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--walks", type=int, default=2, help="course walks per learner")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    pages = list(course_catalog().pages)
+    results = []
+    print(f"{'users':>5} {'reruns':>7} {'rerun/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6} "
+          f"{'base MB':>8} {'peak MB':>8}")
+    for users in args.users:
+        result = run_load(users, args.walks, pages)
+        results.append(result)
+        print(f"{users:5d} {result['reruns']:7d} {result['reruns_per_second']:8.1f} {result['p50_ms']:8.1f} "
+              f"{result['p99_ms']:8.1f} {result['exceptions']:6d} {result['baseline_rss_mb']:8.1f} "
+              f"{result['peak_rss_mb']:8.1f}")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
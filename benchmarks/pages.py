@@ -0,0 +1,294 @@
+"""Headless page benchmark: wall time, reruns, peak RSS and delta bytes per interaction.
+
+    python benchmarks/pages.py --output benchmarks/pages_baseline.json
+    python benchmarks/pages.py --compare benchmarks/pages_baseline.json
+
+Every page in the sidebar is opened with Streamlit's AppTest harness and put
+through the interactions a learner would make (filling in journal entry
+editors, pressing submit buttons, changing number inputs). For each one the
+suite records:
+
+    wall_ms        time for the script run(s) the interaction triggers
+    reruns         script runs started (st.rerun counts as another)
+    peak_rss_mb    highest resident set size sampled during the interaction
+    delta_bytes    serialized size of the ForwardMsgs sent to the browser
+
+``--compare`` reruns the suite and fails (exit 1) if any interaction's wall
+time or delta bytes grew past ``--threshold`` times the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Keep quiz submissions made by the suite out of the real progress database.
+os.environ.setdefault("COURSE_PROGRESS_DB", os.path.join(tempfile.mkdtemp(), "progress.db"))
+
+import streamlit  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.element_tree import ElementTree, user_key_from_element_id  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+from course.reference import reference_frame  # noqa: E402
+from course.registry import pages  # noqa: E402
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+SAMPLE_INTERVAL = 0.002  # seconds between RSS samples
+
+
+# --- Harness hooks ------------------------------------------------------------
+# AppTest does not expose the messages a run sends, and it cannot edit
+# st.data_editor cells. Two small wrappers add both: every LocalScriptRunner.run
+# is recorded, and pending editor edits are sent with the widget states the
+# way the browser would send them.
+
+RUNS = []  # (script runs started, bytes sent) per LocalScriptRunner.run
+EDITS = {}  # data_editor element id -> serialized edit state
+
+original_run = LocalScriptRunner.run
+original_widget_states = ElementTree.get_widget_states
+
+
+def recorded_run(self, *args, **kwargs):
+    tree = original_run(self, *args, **kwargs)
+    started = sum(event == ScriptRunnerEvent.SCRIPT_STARTED for event in self.events)
+    sent = sum(data["forward_msg"].ByteSize() for event, data in zip(self.events, self.event_data)
+               if event == ScriptRunnerEvent.ENQUEUE_FORWARD_MSG)
+    RUNS.append((started, sent))
+    return tree
+
+
+def widget_states_with_edits(self):
+    states = original_widget_states(self)
+    for element_id, value in EDITS.items():
+        state = WidgetState(id=element_id)
+        state.string_value = value
+        states.widgets.append(state)
+    return states
+
+
+LocalScriptRunner.run = recorded_run
+ElementTree.get_widget_states = widget_states_with_edits
+
+
+def edit_cells(at, key, rows):
+    """Edit a data_editor's cells: ``rows`` maps row position -> {column: value}."""
+    # Editors are parsed as Dataframe elements with an editing mode set.
+    editor = next(frame for frame in at.dataframe if user_key_from_element_id(frame.proto.id) == key)
+    EDITS[editor.proto.id] = json.dumps({
+        "edited_rows": {str(row): values for row, values in rows.items()},
+        "added_rows": [],
+        "deleted_rows": [],
+    })
+
+
+def answer_rows(section, exercise):
+    key = reference_frame(section, "answer_key")
+    key = key[key["Exercise"] == exercise].drop(columns="Exercise").reset_index(drop=True)
+    return {row: values for row, values in enumerate(key.to_dict("records"))}
+
+
+class PeakRSS:
+    """Samples this process's resident set size on a thread while active."""
+
+    def __enter__(self):
+        self.peak = self.current()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+        self.peak = max(self.peak, self.current())
+
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, self.current())
+            time.sleep(SAMPLE_INTERVAL)
+
+    @staticmethod
+    def current():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * PAGE_SIZE
+        except OSError:  # not Linux: lifetime peak is the best available
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# --- Interactions ---------------------------------------------------------------
+# Page label -> [(interaction, action)]. Each action changes widgets and runs
+# the app once, as one browser round trip would.
+
+def click(key):
+    return lambda at: at.button(key=key).click().run()
+
+
+def set_value(kind, key, value):
+    return lambda at: getattr(at, kind)(key=key).set_value(value).run()
+
+
+def submit_editors(edits, button):
+    def action(at):
+        for key, rows in edits:
+            edit_cells(at, key, rows)
+        return at.button(key=button).click().run()
+    return action
+
+
+def answer_final_quiz(at):
+    for radio in at.radio:
+        if radio.key and radio.key.startswith("q"):
+            radio.set_value(radio.options[1])
+    return at.button(key="submit_final_quiz").click().run()
+
+
+INTERACTIONS = {
+    "Introduction": [],
+    "Module 1: Accounting Fundamentals & the 5 Categories": [
+        ("submit journal entries", submit_editors(
+            [("invoice_editor", answer_rows("module1", "pipe_invoice")),
+             ("payment_editor", answer_rows("module1", "pipe_payment"))], "submit_quiz_mod1_table")),
+    ],
+    "Module 2: Journal Entries & Accruals": [
+        ("submit accrual entry", submit_editors(
+            [("accrual_editor", answer_rows("module2", "tax_accrual"))], "submit_accrual")),
+        ("submit depreciation entry", submit_editors(
+            [("depreciation_editor", answer_rows("module2", "depreciation"))], "submit_depreciation")),
+        ("change depreciation months", set_value("number_input", "depreciation_months", 60)),
+        ("run month-end close", click("run_month_end_close")),
+    ],
+    "Module 3: Managing the Chart of Accounts": [
+        ("submit chart of accounts", click("submit_coa_custom")),
+        ("search accounts", set_value("text_input", "coa_search", "cash")),
+    ],
+    "Module 4: Real Estate Practices": [
+        ("choose lease term", set_value("selectbox", "lease_term", 12)),
+        ("change incentive", set_value("number_input", "lease_incentive", 1200)),
+        ("submit recurring entry", submit_editors(
+            [("lease_entry_editor", {0: {"Amount ($)": 100, "Duration": 12}, 1: {"Amount ($)": 100, "Duration": 12}})],
+            "submit_lease_entry")),
+    ],
+    "Module 5: Bank Reconciliation": [
+        ("change bank balance", set_value("number_input", "bank_balance", 12000)),
+        ("calculate reconciliation", click("calc_reconcile")),
+        ("change match tolerance", set_value("number_input", "match_tolerance", 5)),
+    ],
+    "Module 6: Budgeting, Forecasting & Consolidation": [
+        ("change rental income", set_value("number_input", "mod4_rental", 5500)),
+        ("change forecast horizon", set_value("number_input", "mod4_horizon", 60)),
+        ("submit reconciliation answer", click("submit_mod4_answer")),
+    ],
+    "Module 7: Review & Assessment": [
+        ("submit final quiz", answer_final_quiz),
+        ("post statement entry", submit_editors(
+            [("post_entry_editor", {0: {"Account": "Maintenance Expense", "Category": "Expense", "Amount ($)": 250},
+                                    1: {"Account": "Cash", "Category": "Asset", "Amount ($)": 250}})],
+            "post_entry")),
+    ],
+}
+
+
+def measure(action, at):
+    RUNS.clear()
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        action(at)
+        wall = time.perf_counter() - start
+    return {
+        "wall_ms": round(wall * 1000, 2),
+        "reruns": sum(started for started, _ in RUNS),
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+        "delta_bytes": sum(sent for _, sent in RUNS),
+        "exceptions": [exception.message for exception in at.exception],
+    }
+
+
+def run_page(label, timeout):
+    EDITS.clear()
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=timeout).run()
+    steps = [("open page", lambda at: at.sidebar.radio[0].set_value(label).run())] + INTERACTIONS.get(label, [])
+    return {name: measure(action, at) for name, action in steps}
+
+
+def run_suite(repeat, timeout):
+    """Median of ``repeat`` runs per interaction (counts and bytes from the last)."""
+    results = {}
+    for label in pages():
+        runs = [run_page(label, timeout) for _ in range(repeat)]
+        results[label] = {
+            name: dict(runs[-1][name], wall_ms=round(statistics.median(run[name]["wall_ms"] for run in runs), 2))
+            for name in runs[-1]
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for label, steps in results.items():
+        for name, result in steps.items():
+            before = baseline["pages"].get(label, {}).get(name)
+            if before is None:
+                continue
+            for metric in ("wall_ms", "delta_bytes"):
+                if before[metric] and result[metric] > before[metric] * threshold:
+                    regressions.append(f"{label} / {name}: {metric} {before[metric]} -> {result[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed growth factor against the baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page (median wall time is kept)")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    results = run_suite(args.repeat, args.timeout)
+    for label, steps in results.items():
+        print(label)
+        for name, result in steps.items():
+            failed = f"  EXCEPTION: {result['exceptions'][0]}" if result["exceptions"] else ""
+            print(f"  {name:30} {result['wall_ms']:8.1f} ms  {result['reruns']} rerun(s)  "
+                  f"{result['peak_rss_mb']:7.1f} MB  {result['delta_bytes']:9,} B{failed}")
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "pages": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+        print(f"baseline written to {args.output}")
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.compare} (threshold {args.threshold}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Learner progress store: submit latency, write-behind throughput, cohort queries.
+
+    python benchmarks/progress.py --attempts 100000 --questions 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.progress import ProgressStore  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=100_000)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    correct = rng.random((args.attempts, args.questions)) < np.linspace(0.95, 0.4, args.questions)
+    questions = [f"q{i + 1}" for i in range(args.questions)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProgressStore(os.path.join(directory, "progress.db"))
+        latencies = np.empty(args.attempts)
+        start = time.perf_counter()
+        for attempt, row in enumerate(correct):
+            submitted = time.perf_counter()
+            store.submit(f"learner-{attempt % 5_000}", "module6", zip(questions, row.astype(int), row))
+            latencies[attempt] = time.perf_counter() - submitted
+        store.flush()
+        seconds = time.perf_counter() - start
+        print(f"{args.attempts:,} attempts written in {seconds:.2f} s ({args.attempts / seconds:,.0f}/s); "
+              f"submit p50 {np.percentile(latencies, 50) * 1e6:.0f} us, p99 {np.percentile(latencies, 99) * 1e6:.0f} us")
+
+        scores, seconds = timed(store.score_distribution, "module6")
+        print(f"score distribution from summary: {len(scores)} rows in {seconds * 1000:.2f} ms")
+        rates, seconds = timed(store.question_error_rates, "module6")
+        print(f"error rates from summary: {len(rates)} rows in {seconds * 1000:.2f} ms")
+        _, seconds = timed(store.query, "SELECT question, COUNT(*), SUM(1 - correct) FROM answers GROUP BY question")
+        print(f"error rates by full scan of answers: {seconds * 1000:.0f} ms")
+        _, seconds = timed(store.learner_attempts, "learner-42")
+        print(f"one learner's history: {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Question bank build, per-question pick cost and a cohort starting an exam.
+
+    python benchmarks/questionbank.py --variants 1000 --learners 10000 --questions 20
+
+Reports:
+
+    build     generating and indexing every template's variants (once per process)
+    pick      the next question for a learner, next to scanning the bank for
+              the learner's topic and level and drawing from the matches
+    cohort    ``--learners`` learners each starting an exam and answering
+              ``--questions`` adaptive questions, and how many distinct exams
+              they got
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.questionbank import TOPICS, Learner, QuestionBank, learner_seed  # noqa: E402
+
+
+def scan_pick(bank, learner, rng):
+    """The naive pick: filter the whole bank, then draw at random."""
+    topic = min(learner.topics, key=lambda name: (learner.level[name], learner.seen(name)))
+    codes = [code for code, template in enumerate(bank.templates)
+             if template.topic == topic and template.level == learner.level[topic]]
+    return int(rng.choice(np.flatnonzero(np.isin(bank.template_of, codes))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=1000, help="questions per template")
+    parser.add_argument("--learners", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=20, help="questions per exam")
+    parser.add_argument("--picks", type=int, default=10_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bank = QuestionBank(args.variants)
+    print(f"build    {(time.perf_counter() - start) * 1000:8.1f} ms   {len(bank):,} questions in "
+          f"{len(bank.cells)} topic/level cells")
+
+    rng = np.random.default_rng(0)
+    learner = Learner(learner_seed("benchmark"), TOPICS)
+    for label, pick in (("pick", lambda: bank.pick(learner)), ("scan", lambda: scan_pick(bank, learner, rng))):
+        timings = []
+        for _ in range(args.picks):
+            began = time.perf_counter()
+            number = pick()
+            timings.append(time.perf_counter() - began)
+            learner.record(bank.cell(number), rng.random() < 0.7)
+        print(f"{label:8} {statistics.median(timings) * 1e6:8.1f} us median per question")
+
+    start = time.perf_counter()
+    learners = [Learner(learner_seed(f"learner-{number}"), TOPICS) for number in range(args.learners)]
+    first = [bank.question(bank.pick(learner)) for learner in learners]
+    seconds = time.perf_counter() - start
+    print(f"cohort   {seconds * 1000:8.1f} ms   {args.learners:,} learners shown their first question "
+          f"({seconds / args.learners * 1e6:.1f} us each)")
+
+    start = time.perf_counter()
+    exams = set()
+    for learner, question in zip(learners, first):
+        numbers = [question.number]
+        learner.record(bank.cell(question.number), rng.random() < 0.7)
+        for _ in range(args.questions - 1):
+            numbers.append(bank.pick(learner))
+            learner.record(bank.cell(numbers[-1]), rng.random() < 0.7)
+        exams.add(tuple(numbers))
+    seconds = time.perf_counter() - start
+    answered = args.learners * args.questions
+    print(f"exams    {seconds * 1000:8.1f} ms   {answered:,} adaptive questions "
+          f"({seconds / answered * 1e6:.1f} us each), {len(exams):,} distinct exams")
+
+
+if __name__ == "__main__":
+    main()
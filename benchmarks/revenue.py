@@ -0,0 +1,68 @@
+"""Straight-line rent recognition for a generated lease portfolio.
+
+    python benchmarks/revenue.py --leases 50000
+
+Recognizes the whole rent roll once, then amends one lease's rent and
+recognizes again (only that lease is recomputed), then builds one month's
+journal for the whole portfolio.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.revenue import RecognitionEngine  # noqa: E402
+
+
+def rent_roll(leases, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01") + rng.integers(0, 730, leases)
+    end = start + rng.integers(365, 3650, leases)
+    return pd.DataFrame({
+        "lease": [f"L{i:06d}" for i in range(leases)],
+        "property": [f"P{i:04d}" for i in rng.integers(0, 500, leases)],
+        "start": start.astype(str),
+        "end": end.astype(str),
+        "monthly_rent": rng.uniform(800, 40_000, leases).round(2),
+        "escalation": rng.choice([0, 0.02, 0.03, 0.04], leases),
+        "escalation_months": 12,
+        "free_months": rng.choice([0, 0, 1, 2, 3], leases),
+        "incentive": np.where(rng.random(leases) < 0.3, rng.uniform(1_000, 100_000, leases).round(2), 0),
+    })
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=50_000)
+    args = parser.parse_args()
+
+    roll = rent_roll(args.leases)
+    engine = RecognitionEngine()
+    recognition = timed("recognize rent roll", lambda: engine.recognize(roll))
+    print(f"{len(recognition):,} lease months")
+
+    amended = roll.copy()
+    amended.loc[args.leases // 2, "monthly_rent"] += 100
+    recognition = timed("recognize after amendment", lambda: engine.recognize(amended))
+    print(f"changes: {recognition.changes}")
+
+    month = str(np.datetime64(int(np.median(recognition.rows["month"])), "M"))
+    journal = timed(f"journal for {month}", lambda: recognition.journal(month=month))
+    print(f"{len(journal):,} lines, balanced: {journal.is_balanced()}")
+    timed("monthly totals", recognition.monthly_totals)
+
+
+if __name__ == "__main__":
+    main()
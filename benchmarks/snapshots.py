@@ -0,0 +1,132 @@
+"""Memory and latency of what-if scenario branches over a shared ledger.
+
+    python benchmarks/snapshots.py --lines 2000000 --sessions 40 --branches 10
+
+Builds one root snapshot of a synthetic ledger, then for every session
+branches it ``--branches`` times and in each branch posts accruals,
+reschedules and voids a few entries. Reports the memory all branches hold
+beyond the shared root (traced with tracemalloc) next to what copying the
+journal as a DataFrame per branch would cost, and the time of each operation,
+of a diff and merge between branches, and of assembling a branch's ledger for
+its statements.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.journal import Journal  # noqa: E402
+from course.snapshots import Diff, Snapshot, merge  # noqa: E402
+
+CATEGORIES = ("Asset", "Liability", "Equity", "Revenue", "Expense")
+
+
+def synthetic_journal(lines, accounts, months, seed=0):
+    """Balanced two-line entries between random accounts, in entry order."""
+    rng = np.random.default_rng(seed)
+    entries = lines // 2
+    category = rng.integers(0, len(CATEGORIES), accounts).astype(np.int32)
+    pair = rng.integers(0, accounts, (entries, 2)).astype(np.int32)
+    account = pair.ravel()
+    return Journal(
+        entry=np.repeat(np.arange(entries, dtype=np.int32), 2),
+        date=np.repeat(np.sort(rng.integers(0, months * 30, entries)).astype(np.int32), 2),
+        account=account,
+        category=category[account],
+        entry_type=np.tile(np.array([0, 1], dtype=np.int8), entries),
+        cents=np.repeat(rng.integers(100, 1_000_000, entries), 2),
+        accounts=[f"{1000 + i} Account" for i in range(accounts)],
+        categories=list(CATEGORIES),
+        dates=np.datetime64("2021-01-01", "D") + np.arange(months * 30),
+    )
+
+
+def accrual(rng, day):
+    return Journal(
+        entry=np.zeros(2, dtype=np.int32),
+        date=np.zeros(2, dtype=np.int32),
+        account=np.array([0, 1], dtype=np.int32),
+        category=np.array([0, 1], dtype=np.int32),
+        entry_type=np.array([0, 1], dtype=np.int8),
+        cents=np.repeat(rng.integers(100, 500_000), 2),
+        accounts=["Utilities Expense", "Accrued Liabilities"],
+        categories=["Expense", "Liability"],
+        dates=np.array([day], dtype="datetime64[D]"),
+    )
+
+
+def median_ms(timings):
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--branches", type=int, default=10, help="scenarios per session")
+    parser.add_argument("--changes", type=int, default=5, help="accruals, reschedules and voids per scenario")
+    args = parser.parse_args()
+
+    journal = synthetic_journal(args.lines, args.accounts, args.months)
+    start = time.perf_counter()
+    root = Snapshot.from_journal(journal)
+    print(f"root     {time.perf_counter() - start:7.2f} s   {len(journal):,} lines in {len(root.chunks)} chunks")
+    frame_bytes = int(journal.to_frame().memory_usage(deep=True).sum())
+
+    rng = np.random.default_rng(1)
+    last_day = journal.dates[-1]
+    timings = {"post": [], "reschedule": [], "void": []}
+    tracemalloc.start()
+    sessions = []
+    for _ in range(args.sessions):
+        branches = {"Actual": root}
+        for number in range(args.branches):
+            snapshot = root
+            for _ in range(args.changes):
+                operations = (
+                    ("post", lambda s: s.post(accrual(rng, last_day))),
+                    ("reschedule", lambda s: s.reschedule([int(rng.integers(0, root.next_entry))],
+                                                          last_day + int(rng.integers(1, 60)))),
+                    ("void", lambda s: s.void([int(rng.integers(0, root.next_entry))])),
+                )
+                for name, operation in operations:
+                    began = time.perf_counter()
+                    try:
+                        snapshot = operation(snapshot)
+                    except ValueError:  # the same random entry drawn twice
+                        continue
+                    timings[name].append(time.perf_counter() - began)
+            branches[f"Scenario {number}"] = snapshot
+        sessions.append(branches)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = args.sessions * args.branches
+    print(f"branches {count:,} ({args.sessions} sessions x {args.branches}), {args.changes * 3} changes each")
+    print(f"  held beyond the root   {held / 2**20:8.1f} MB   {held / count / 1024:8.1f} KB per branch")
+    print(f"  a DataFrame per branch {frame_bytes * count / 2**20:8.1f} MB   "
+          f"{frame_bytes / 1024:8.1f} KB per branch")
+    for name, values in timings.items():
+        print(f"{name:10} {median_ms(values):8.3f} ms median")
+
+    a, b = sessions[0]["Scenario 0"], sessions[0]["Scenario 1"]
+    for label, operation in (("diff", lambda: Diff(a, b).balances()), ("merge", lambda: merge(a, b)),
+                             ("ledger", lambda: a.ledger())):
+        runs = []
+        for _ in range(20):
+            began = time.perf_counter()
+            operation()
+            runs.append(time.perf_counter() - began)
+        print(f"{label:10} {median_ms(runs):8.3f} ms median")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Cold-start import cost of the course app, before and after lazy page loading.
+
+Runs each scenario in a fresh interpreter under ``python -X importtime`` and
+reports the total import time plus the most expensive top-level imports.
+
+    python benchmarks/startup_importtime.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE_MODULES = [
+    "course.pages.module1",
+    "course.pages.module2",
+    "course.pages.module3",
+    "course.pages.module4",
+    "course.pages.module5",
+    "course.pages.module6",
+    "course.pages.module7",
+]
+
+SCENARIOS = {
+    # The original main.py imported pandas and defined every page up front.
+    "before (eager)": "import streamlit, pandas\n" + "".join(f"import {m}\n" for m in PAGE_MODULES),
+    # Now main.py only imports the registry and catalog, and the default page is
+    # catalog markdown only.
+    "after (lazy)": "import main\n",
+}
+
+
+def parse_importtime(stderr):
+    """Return {module: cumulative_us} for top-level imports."""
+    top = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if name.startswith("  "):
+            continue
+        top[name.strip()] = int(cumulative)
+    return top
+
+
+def run(code):
+    code += "import sys; print('pandas' in sys.modules)\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr), result.stdout.strip() == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for name, code in SCENARIOS.items():
+        runs = [run(code) for _ in range(args.repeat)]
+        totals = [sum(top.values()) / 1000 for top, _ in runs]
+        print(f"{name}: median {statistics.median(totals):.1f} ms "
+              f"(min {min(totals):.1f}, max {max(totals):.1f}, n={args.repeat})")
+        top, pandas_loaded = runs[-1]
+        for module, us in sorted(top.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {us / 1000:9.1f} ms  {module}")
+        print(f"    pandas loaded: {pandas_loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Financial statements over a large ledger: bulk post, single posts, refresh.
+
+    python benchmarks/statements.py --lines 20000000 --accounts 2000 --months 120
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course.journal import Journal  # noqa: E402
+from course.statements import Ledger  # noqa: E402
+
+CATEGORIES = ("Asset", "Liability", "Equity", "Revenue", "Expense")
+
+
+def synthetic_journal(lines, accounts, months, seed=0):
+    """Balanced two-line entries between random accounts."""
+    rng = np.random.default_rng(seed)
+    entries = lines // 2
+    names = [f"{1000 + i} Account" for i in range(accounts)]
+    category = rng.integers(0, len(CATEGORIES), accounts).astype(np.int32)
+    pair = rng.integers(0, accounts, (entries, 2)).astype(np.int32)
+    cents = rng.integers(100, 1_000_000, entries)
+    account = pair.ravel()
+    return Journal(
+        entry=np.repeat(np.arange(entries, dtype=np.int32), 2),
+        date=np.repeat(rng.integers(0, months, entries).astype(np.int32), 2),
+        account=account,
+        category=category[account],
+        entry_type=np.tile(np.array([0, 1], dtype=np.int8), entries),
+        cents=np.repeat(cents, 2),
+        accounts=names,
+        categories=list(CATEGORIES),
+        dates=np.datetime64("2020-01", "M") + np.arange(months),
+    )
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000_000)
+    parser.add_argument("--accounts", type=int, default=2_000)
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--posts", type=int, default=1_000, help="single entries posted one at a time")
+    args = parser.parse_args()
+
+    journal = synthetic_journal(args.lines, args.accounts, args.months)
+    ledger = Ledger()
+    balanced, seconds = timed(ledger.post, journal)
+    print(f"bulk post {len(journal):,} lines in {seconds:.2f} s, A = L + E: {balanced}")
+
+    entries = [synthetic_journal(2, args.accounts, args.months, seed=i) for i in range(args.posts)]
+    start = time.perf_counter()
+    for entry in entries:
+        ledger.post(entry)
+    seconds = time.perf_counter() - start
+    print(f"single posts: {seconds / args.posts * 1000:.3f} ms per entry (with the equation check)")
+
+    last = ledger.months[-1]
+    for name, fn, fn_args in (
+        ("trial balance", ledger.trial_balance, (last,)),
+        ("income statement", ledger.income_statement, (last - 11, last)),
+        ("balance sheet", ledger.balance_sheet, (last,)),
+        ("cash flow", ledger.cash_flow, (last - 11, last)),
+    ):
+        _, seconds = timed(fn, *fn_args)
+        print(f"{name:16} refresh in {seconds * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
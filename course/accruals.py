@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from course.journal import Journal, encode_dates, encode_labels, to_cents
+
+# --- Month-End Accruals and Reversals ---
+# Posts month-end accruals for expenses incurred but not yet recorded, and the
+# reversing entries that undo them on the first day of the next month. Two
+# kinds of source produce accruals:
+#
+#   open invoices   ``invoice``, ``property``, ``account``, ``amount``,
+#                   ``service_date`` and ``posted_date`` (blank until the
+#                   invoice is recorded). An invoice is accrued at every
+#                   month-end between its service date and its posting.
+#   accrual rules   ``rule``, ``property``, ``account``, ``amount`` (per
+#                   month), ``start`` and optionally ``end`` months, e.g.
+#                   property taxes accrued monthly and paid annually.
+#
+# Each source accrued in a month gives two entries: Debit the expense / Credit
+# the accrued liability dated the month-end, and the reverse dated the next
+# day. Lines for all sources are generated together with array operations.
+#
+# A close remembers, per month, a hash of every source row and the lines it
+# produced. Re-running the month after an invoice arrives or a rule changes
+# only regenerates the sources whose hash changed; the rest are reused.
+
+LIABILITY_ACCOUNT = "Accrued Expenses"
+SOURCE_COLUMNS = {
+    "invoice": ("invoice", "property", "account", "amount", "service_date", "posted_date"),
+    "rule": ("rule", "property", "account", "amount", "start", "end"),
+}
+
+
+def read_sources(frame, kind):
+    frame = frame.rename(columns=lambda name: str(name).strip().lower().replace(" ", "_"))
+    required = set(SOURCE_COLUMNS[kind][:5])
+    missing = required - set(frame.columns)
+    if missing:
+        raise ValueError(f"{kind.title()}s are missing column(s): {', '.join(sorted(missing))}.")
+    columns = {name: frame[name] if name in frame else "" for name in SOURCE_COLUMNS[kind]}
+    sources = pd.DataFrame(columns, index=frame.index).fillna("")
+    sources = sources.astype({name: str for name in SOURCE_COLUMNS[kind] if name != "amount"})
+    sources["source"] = kind + ":" + sources[kind]
+    if sources["source"].duplicated().any():
+        raise ValueError(f"Duplicate {kind} id: {sources.loc[sources['source'].duplicated(), kind].iloc[0]}")
+    sources["cents"] = to_cents(sources.pop("amount").replace("", 0))
+    return sources.drop(columns=kind).reset_index(drop=True)
+
+
+def month_days(month):
+    """(last day of ``month``, first day of the next) as datetime64[D]."""
+    month = np.datetime64(month, "M")
+    next_first = (month + 1).astype("datetime64[D]")
+    return next_first - 1, next_first
+
+
+def accrued_in(sources, kind, month):
+    """Which sources accrue at the end of ``month``."""
+    month_end, next_first = month_days(month)
+    if kind == "invoice":
+        service = pd.to_datetime(sources["service_date"], errors="coerce").to_numpy().astype("datetime64[D]")
+        posted = pd.to_datetime(sources["posted_date"], errors="coerce").to_numpy().astype("datetime64[D]")
+        return (service <= month_end) & (np.isnat(posted) | (posted > month_end))
+    start = pd.to_datetime(sources["start"], errors="coerce").to_numpy().astype("datetime64[M]")
+    end = pd.to_datetime(sources["end"], errors="coerce").to_numpy().astype("datetime64[M]")
+    month = np.datetime64(month, "M")
+    return (start <= month) & (np.isnat(end) | (end >= month))
+
+
+def generate_lines(sources, month, liability_account=LIABILITY_ACCOUNT):
+    """Accrual and reversal lines for every source, four lines each.
+
+    Entry 0 is the accrual (Debit expense, Credit liability) at month-end,
+    entry 1 the reversal on the first day of the next month.
+    """
+    month_end, next_first = month_days(month)
+    count = len(sources)
+    rows = np.repeat(np.arange(count), 4)
+    position = np.tile(np.arange(4), count)
+    entry = (position >= 2).astype(np.int8)
+    # accrual: expense Dr, liability Cr; reversal: liability Dr, expense Cr
+    entry_type = np.tile(np.array([0, 1, 0, 1], dtype=np.int8), count)
+    is_expense = np.tile(np.array([True, False, False, True]), count)
+    expense = sources["account"].to_numpy(dtype=object)[rows]
+    return pd.DataFrame({
+        "source": sources["source"].to_numpy()[rows],
+        "entry": entry,
+        "date": np.where(entry == 0, month_end, next_first),
+        "property": sources["property"].to_numpy()[rows],
+        "account": np.where(is_expense, expense, liability_account),
+        "entry_type": entry_type,
+        "cents": sources["cents"].to_numpy()[rows],
+    })
+
+
+class MonthClose:
+    """The accruals and reversals of one closed month."""
+
+    def __init__(self, month, lines, versions, changes, liability_account=LIABILITY_ACCOUNT):
+        self.month = month
+        self.liability_account = liability_account
+        self.lines = lines
+        self.versions = versions  # source -> content hash
+        self.changes = changes  # {"added": n, "changed": n, "removed": n, "reused": n}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def journal(self, entry=None):
+        """Lines as a Journal; ``entry`` 0 for accruals only, 1 for reversals only."""
+        lines = self.lines if entry is None else self.lines[self.lines["entry"] == entry]
+        entries, _ = pd.factorize(lines["source"].to_numpy() + ":" + lines["entry"].astype(str).to_numpy())
+        accounts, (account,) = encode_labels(lines["account"].to_numpy())
+        is_liability = lines["account"] == self.liability_account
+        categories, (category,) = encode_labels(np.where(is_liability, "Liability", "Expense"))
+        date, dates = encode_dates(lines["date"].to_numpy())
+        return Journal(
+            entry=entries.astype(np.int32),
+            date=date,
+            account=account,
+            category=category,
+            entry_type=lines["entry_type"].to_numpy(dtype=np.int8),
+            cents=lines["cents"].to_numpy(dtype=np.int64),
+            accounts=accounts,
+            categories=categories,
+            dates=dates,
+        )
+
+    def to_frame(self, start=0, stop=None):
+        lines = self.lines.iloc[start:stop]
+        return pd.DataFrame({
+            "Date": lines["date"].to_numpy(),
+            "Entry": np.where(lines["entry"] == 0, "Accrual", "Reversal"),
+            "Source": lines["source"].to_numpy(),
+            "Property": lines["property"].to_numpy(),
+            "Account": lines["account"].to_numpy(),
+            "Entry Type": np.where(lines["entry_type"] == 0, "Debit", "Credit"),
+            "Amount ($)": lines["cents"].to_numpy() / 100,
+        })
+
+
+class AccrualEngine:
+    """Runs month-end closes, reusing unchanged sources' lines between runs."""
+
+    def __init__(self, liability_account=LIABILITY_ACCOUNT):
+        self.liability_account = liability_account
+        self.closes = {}  # month -> MonthClose
+
+    def close(self, month, invoices=None, rules=None):
+        month = np.datetime64(month, "M")
+        sources = []
+        for kind, frame in (("invoice", invoices), ("rule", rules)):
+            if frame is None or frame.empty:
+                continue
+            kind_sources = read_sources(frame, kind)
+            sources.append(kind_sources[accrued_in(kind_sources, kind, month)])
+        columns = ["property", "account", "cents", "source"]
+        sources = (pd.concat([frame[columns] for frame in sources], ignore_index=True) if sources
+                   else pd.DataFrame(columns=columns))
+
+        versions = pd.Series(pd.util.hash_pandas_object(sources[columns], index=False).to_numpy(),
+                             index=pd.Index(sources["source"].to_numpy()), dtype=np.uint64)
+        # Lines are stored four per source, in source order, so a source's
+        # previous lines are found by position.
+        previous = self.closes.get(month)
+        if previous is None:
+            old_position = np.full(len(sources), -1)
+            removed = 0
+        else:
+            old_position = previous.versions.index.get_indexer(versions.index)
+            removed = len(previous.versions) - int((old_position >= 0).sum())
+        new = old_position < 0
+        changed = new.copy()
+        if previous is not None:
+            changed[~new] = previous.versions.to_numpy()[old_position[~new]] != versions.to_numpy()[~new]
+
+        fresh = generate_lines(sources[changed].reset_index(drop=True), month, self.liability_account)
+        if changed.all():
+            lines = fresh
+        else:
+            kept_rows = (4 * old_position[~changed])[:, None] + np.arange(4)
+            kept = previous.lines.take(kept_rows.ravel())
+            source_order = np.concatenate([np.flatnonzero(~changed), np.flatnonzero(changed)])
+            order = np.argsort(np.repeat(source_order, 4), kind="stable")
+            lines = pd.concat([kept, fresh], ignore_index=True).take(order).reset_index(drop=True)
+        changes = {
+            "added": int(new.sum()),
+            "changed": int((changed & ~new).sum()),
+            "removed": removed,
+            "reused": int((~changed).sum()),
+        }
+        result = MonthClose(month, lines, versions, changes, self.liability_account)
+        self.closes[month] = result
+        return result
@@ -0,0 +1,108 @@
+import streamlit as st
+
+from course.jobs import Cancelled, JobRunner, job_key
+
+# --- Background Jobs on a Page ---
+# Page-side wrappers around course.jobs. One JobRunner serves the whole
+# process. A page submits its job with ``run_in_background``, which remembers
+# the job's key in session_state so later reruns find the same job, then asks
+# ``job_outcome`` for the result: while the job runs that shows a progress bar,
+# the job's partial result and a Cancel button, refreshed by a small polling
+# fragment, and returns None. When the job ends the fragment reruns the app
+# once so the page can render the result.
+#
+# A job this session cancelled stays cancelled on later reruns instead of
+# being resubmitted, until the page passes ``restart=True``.
+#
+# ``background_result`` wraps both for the common case: it keeps the finished
+# result in session_state until the job's identity changes, and shows the
+# cancelled and failed states itself (with a Restart button).
+
+POLL_SECONDS = 0.5
+
+
+@st.cache_resource(show_spinner=False)
+def job_runner():
+    """The process-wide worker pool, started on first use."""
+    return JobRunner()
+
+
+def run_in_background(key, fn, *args, label=None, restart=False, identity=None, **kwargs):
+    """Submit ``fn(*args, **kwargs)`` (or join the identical job) and remember it under ``key``.
+
+    ``identity`` keys the job instead of its arguments (see JobRunner.submit).
+    """
+    previous = session_job(key)
+    if (previous is not None and not restart and previous.status == "cancelled"
+            and previous.key == job_key(fn, (args, sorted(kwargs.items())) if identity is None else identity)):
+        return previous
+    job = job_runner().submit(fn, *args, label=label, identity=identity, **kwargs)
+    st.session_state[key] = job.key
+    return job
+
+
+def background_result(key, fn, *args, label=None, identity=None, show_partial=None, **kwargs):
+    """The result of ``fn(*args, **kwargs)`` run in the background, kept in session_state under ``key``.
+
+    Returns None until the job has finished, after showing its progress, a
+    Restart button if it was cancelled, or its ValueError. Other errors are
+    raised. ``identity`` (default: the arguments) also decides when the kept
+    result is stale.
+    """
+    version = (args, sorted(kwargs.items())) if identity is None else identity
+    kept = st.session_state.get(key)
+    if kept is not None and kept[0] == version:
+        return kept[1]
+    job = run_in_background(f"{key}_job", fn, *args, label=label, identity=identity,
+                            restart=st.session_state.get(f"{key}_restart", False), **kwargs)
+    outcome = job_outcome(job, show_partial)
+    if outcome is None:
+        return None
+    status, value = outcome
+    if status == "cancelled":
+        st.info(f"{job.label} was cancelled.")
+        st.button("Restart", key=f"{key}_restart")
+        return None
+    if status == "failed":
+        if not isinstance(value, ValueError):
+            raise value
+        st.error(f"{job.label} failed: {value}")
+        return None
+    st.session_state[key] = (version, value)
+    return value
+
+
+def session_job(key):
+    """The job this session last submitted under ``key``, if the runner still has it."""
+    submitted = st.session_state.get(key)
+    return job_runner().get(submitted) if submitted is not None else None
+
+
+def job_outcome(job, show_partial=None):
+    """(status, result or error) once ``job`` has ended; otherwise show its progress and return None.
+
+    ``show_partial`` renders the job's latest partial result while it runs.
+    """
+    if not job.done():
+        job_progress(job.key, show_partial)
+        return None
+    try:
+        return "finished", job.result()
+    except Cancelled as error:
+        return "cancelled", error
+    except Exception as error:
+        return "failed", error
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def job_progress(key, show_partial=None):
+    job = job_runner().get(key)
+    if job is None or job.done():
+        st.rerun()
+    st.progress(job.progress, text=f"{job.label}: {job.message}")
+    if show_partial is not None and job.partial is not None:
+        show_partial(job.partial)
+    if not job.cancel_requested and st.button("Cancel", key=f"cancel_job_{key[:12]}"):
+        job.cancel()
+    if job.cancel_requested:
+        st.caption("Cancelling after the current step...")
@@ -0,0 +1,460 @@
+import importlib
+import json
+import os
+import textwrap
+from types import MappingProxyType
+
+import streamlit as st
+
+from course import instrumentation
+from course.reference import CONTENT_DIR, files_digest, reference_data, reference_frame
+
+# --- Course Content Catalog ---
+# Every sidebar page is a JSON file in course/content/pages/, listed in file
+# name order (hence the numeric prefixes):
+#
+#   {"label": "Module 1: ...", "blocks": [{"type": "header", "text": "..."}, ...]}
+#
+# Block types:
+#   title, header     {"text": "..."}
+#   markdown          {"text": "..." or ["line", ...]}
+#   expander          {"title": "...", "expanded": false, "blocks": [...]}
+#   table             {"section": "module1", "name": "rental_example"}   a reference_frame
+#   exercise          {"function": "course.pages.module1:pipe_replacement_exercise"}
+#   multiple_choice   {"section", "title", "submit": {"key", "label"}, "questions": [
+#                        {"key", "prompt", "answer", "options", "label"}, ...],
+#                      "options", "widget": "radio" | "selectbox", "question_column",
+#                      "results_heading", "export": {"key", "file_name"}}
+#   free_text         {"section", "title", "key", "prompt", "submit": {...}, "model_answer"}
+#   adaptive_quiz     {"section", "title", "key", "submit": {...}, "questions": 10, "topics": [...]}
+#
+# Quizzes save their submissions under ``section`` (see feedback.record_progress)
+# and ``title`` is how instructors see them. Questions may share the quiz's
+# ``options``; ``label`` (default: the key) names a question in results. Any
+# block marked ``"instructor": true`` renders only for instructors (see
+# instrumentation.is_admin), for tools that show other learners' work. An
+# adaptive quiz asks ``questions`` questions from course.questionbank, one at a
+# time, each picked for the learner from their answers so far, and saves the
+# run as one attempt when its last question is answered.
+#
+# The files are parsed, validated and compiled into render callables once per
+# process and shared through st.cache_resource, keyed by a stat digest of the
+# files like the reference data, so a rerun only walks prebuilt blocks and an
+# edited file is picked up on the next rerun. Adding a page or a question is a
+# content change; exercises are the one block that names Python code, and
+# their module is imported the first time they render.
+
+CATALOG_DIR = os.path.join(CONTENT_DIR, "pages")
+WIDGETS = {"radio": st.radio, "selectbox": st.selectbox}
+
+
+class Page:
+    def __init__(self, label, name, blocks):
+        self.label = label
+        self.name = name
+        self.blocks = blocks
+
+    def render(self):
+        for block in self.blocks:
+            block()
+
+
+class Catalog:
+    def __init__(self, pages, quizzes):
+        self.pages = MappingProxyType(pages)
+        self.quizzes = MappingProxyType(quizzes)
+
+    def sections(self):
+        """Section -> title of every quiz that saves its submissions."""
+        return {section: quiz.title for section, quiz in self.quizzes.items()}
+
+
+class Expander:
+    def __init__(self, title, expanded, blocks):
+        self.title = title
+        self.expanded = expanded
+        self.blocks = blocks
+
+    def __call__(self):
+        with st.expander(self.title, expanded=self.expanded):
+            for block in self.blocks:
+                block()
+
+
+class Instructor:
+    def __init__(self, block):
+        self.block = block
+
+    def __call__(self):
+        if instrumentation.is_admin():
+            self.block()
+
+
+class Table:
+    def __init__(self, section, name):
+        self.section = section
+        self.name = name
+
+    def __call__(self):
+        instrumentation.show("table", lambda: reference_frame(self.section, self.name))
+
+
+class Exercise:
+    def __init__(self, module, function, page):
+        self.module = module
+        self.function = function
+        self.page = page
+
+    def __call__(self):
+        render = getattr(importlib.import_module(self.module), self.function)
+        if instrumentation.enabled():
+            render = instrumentation.profiled_fragment(render, self.page, self.function)
+        render()
+
+
+class Question:
+    def __init__(self, key, prompt, options, answer, label):
+        self.key = key
+        self.prompt = prompt
+        self.options = options
+        self.answer = answer
+        self.label = label
+
+
+class MultipleChoice:
+    def __init__(self, section, title, questions, widget, submit, question_column="Question",
+                 results_heading="Quiz Results", export=None):
+        self.section = section
+        self.title = title
+        self.questions = questions
+        self.widget = widget
+        self.submit = submit
+        self.question_column = question_column
+        self.results_heading = results_heading
+        self.export = export
+
+    def __call__(self):
+        widget = WIDGETS[self.widget]
+        answers = [widget(question.prompt, options=question.options, key=question.key)
+                   for question in self.questions]
+        if not st.button(self.submit["label"], key=self.submit["key"]):
+            return
+        import pandas as pd
+
+        from course.feedback import record_progress
+        from course.grid import download_buttons
+
+        labels = [question.label for question in self.questions]
+        correct = [answer == question.answer for answer, question in zip(answers, self.questions)]
+        results = pd.DataFrame({
+            self.question_column: labels,
+            "Your Answer": answers,
+            "Correct Answer": [question.answer for question in self.questions],
+            "Result": ["Correct" if right else "Incorrect" for right in correct],
+        })
+        record_progress(self.section, zip(labels, answers, correct))
+        st.markdown(f"### {self.results_heading}")
+        instrumentation.show("table", lambda: results)
+        st.markdown(f"**Total Score: {sum(correct)} out of {len(correct)}**")
+        if self.export is not None:
+            download_buttons(results, key=self.export["key"], file_name=self.export["file_name"])
+
+
+class FreeText:
+    def __init__(self, section, title, key, prompt, submit, model_answer=None):
+        self.section = section
+        self.title = title
+        self.key = key
+        self.prompt = prompt
+        self.submit = submit
+        self.model_answer = model_answer
+
+    def __call__(self):
+        answer = st.text_area(self.prompt, key=self.key)
+        if not st.button(self.submit["label"], key=self.submit["key"]):
+            return
+        from course.feedback import record_progress
+
+        record_progress(self.section, [(self.key, answer, None)])
+        st.write("Your response:")
+        st.write(answer)
+        if self.model_answer:
+            st.info(self.model_answer)
+
+
+class AdaptiveQuiz:
+    def __init__(self, section, title, key, topics, questions, submit):
+        self.section = section
+        self.title = title
+        self.key = key
+        self.topics = topics
+        self.questions = questions
+        self.submit = submit
+
+    def learner(self, bank):
+        """This session's Learner, caught up once on the answers saved in earlier sessions."""
+        learner = st.session_state.get(self.key)
+        if learner is None:
+            from course.feedback import learner_id, progress_store
+            from course.questionbank import Learner, learner_seed
+
+            history = progress_store().learner_answers(learner_id(), self.section)
+            learner = Learner(learner_seed(learner_id()), self.topics).replay(
+                bank, zip(history["Question"], history["Correct"]))
+            st.session_state[self.key] = learner
+            st.session_state[f"{self.key}_exam"] = {"question": None, "asked": 0, "correct": 0, "last": None,
+                                                    "answers": []}
+        return learner
+
+    def __call__(self):
+        from course.questionbank import TOPICS, question_bank
+
+        bank = question_bank()
+        learner = self.learner(bank)
+        exam = st.session_state[f"{self.key}_exam"]
+        if exam["last"] is not None:
+            question, correct = exam["last"]
+            if correct:
+                st.success("Correct!")
+            else:
+                st.error(f"Not quite: the answer is {question.options[question.answer]}.")
+        st.caption("Level by topic: " + ", ".join(f"{TOPICS[topic]} {learner.level[topic]}"
+                                                  for topic in learner.topics))
+        if exam["asked"] >= self.questions:
+            st.markdown(f"**Total Score: {exam['correct']} out of {exam['asked']}**")
+            if st.button("Start Again", key=f"{self.key}_restart"):
+                exam.update(asked=0, correct=0, last=None, answers=[])
+                st.rerun()
+            return
+        if exam["question"] is None:
+            exam["question"] = bank.pick(learner)
+        question = bank.question(exam["question"])
+        topic, level = bank.cell(question.number)
+        st.markdown(f"**Question {exam['asked'] + 1} of {self.questions}** ({TOPICS[topic]}, level {level})")
+        st.markdown(question.prompt)
+        # A new widget key per question, so the previous choice is not carried over.
+        choice = st.radio("Your answer", options=question.options, index=None,
+                          key=f"{self.key}_{sum(learner.drawn.values())}")
+        if not st.button(self.submit["label"], key=self.submit["key"]):
+            return
+        if choice is None:
+            st.warning("Choose an answer first.")
+            return
+        correct = choice == question.options[question.answer]
+        learner.record((topic, level), correct)
+        exam["answers"].append((question.template.key, choice, correct))
+        exam.update(question=None, asked=exam["asked"] + 1, correct=exam["correct"] + correct,
+                    last=(question, correct))
+        if exam["asked"] >= self.questions:
+            from course.feedback import record_progress
+
+            # One attempt per finished run, so the cohort's scores are out of the whole exam.
+            record_progress(self.section, exam["answers"])
+        st.rerun()
+
+
+MISSING = object()
+KINDS = {str: "a non-empty string", bool: "true or false", int: "a whole number", list: "a list",
+         dict: "an object"}
+
+
+class Compiler:
+    """Validates one page file and compiles its blocks.
+
+    Errors are ValueErrors naming the file and the block, e.g.
+    ``03-module2.json: blocks[4].blocks[0]: unknown block type 'markdwon'``.
+    Widget keys and quiz sections must be unique across the whole catalog, so
+    the compilers of one catalog share ``keys`` and ``quizzes``.
+    """
+
+    def __init__(self, file_name, keys, quizzes):
+        self.file_name = file_name
+        self.keys = keys
+        self.quizzes = quizzes
+        self.label = None  # the page's label, once read
+
+    def fail(self, where, message):
+        raise ValueError(f"{self.file_name}: {where}: {message}")
+
+    def field(self, spec, where, name, kind=str, default=MISSING):
+        if name not in spec:
+            if default is MISSING:
+                self.fail(where, f"missing {name!r}")
+            return default
+        value = spec[name]
+        if not isinstance(value, kind) or (kind is str and not value):
+            self.fail(where, f"{name!r} must be {KINDS[kind]}")
+        return value
+
+    def text(self, spec, where, name="text", default=MISSING):
+        if name not in spec:
+            if default is MISSING:
+                self.fail(where, f"missing {name!r}")
+            return default
+        value = spec[name]
+        if isinstance(value, list) and all(isinstance(line, str) for line in value):
+            value = "\n".join(value)
+        if not isinstance(value, str):
+            self.fail(where, f"{name!r} must be a string or a list of lines")
+        # Dedented once here rather than by Streamlit on every rerun.
+        return textwrap.dedent(value).strip()
+
+    def claim(self, key, where):
+        if key in self.keys:
+            self.fail(where, f"widget key {key!r} is already used by {self.keys[key]}")
+        self.keys[key] = f"{self.file_name}: {where}"
+        return key
+
+    def page(self, spec, name):
+        if not isinstance(spec, dict):
+            self.fail("page", "expected an object with 'label' and 'blocks'")
+        self.label = self.field(spec, "page", "label")
+        return Page(self.label, name, self.blocks(spec, "page"))
+
+    def blocks(self, spec, where):
+        blocks = self.field(spec, where, "blocks", list)
+        where = "blocks" if where == "page" else f"{where}.blocks"
+        return tuple(self.block(block, f"{where}[{i}]") for i, block in enumerate(blocks))
+
+    def block(self, spec, where):
+        if not isinstance(spec, dict):
+            self.fail(where, "expected an object with a 'type'")
+        kind = spec.get("type")
+        compile_block = getattr(self, f"compile_{kind}", None) if isinstance(kind, str) else None
+        if compile_block is None:
+            self.fail(where, f"unknown block type {kind!r}")
+        block = compile_block(spec, where)
+        return Instructor(block) if self.field(spec, where, "instructor", bool, False) else block
+
+    def compile_title(self, spec, where):
+        text = self.field(spec, where, "text")
+        return lambda: st.title(text)
+
+    def compile_header(self, spec, where):
+        text = self.field(spec, where, "text")
+        return lambda: st.header(text)
+
+    def compile_markdown(self, spec, where):
+        text = self.text(spec, where)
+        return lambda: st.markdown(text)
+
+    def compile_expander(self, spec, where):
+        return Expander(self.field(spec, where, "title"), self.field(spec, where, "expanded", bool, False),
+                        self.blocks(spec, where))
+
+    def compile_table(self, spec, where):
+        section, name = self.field(spec, where, "section"), self.field(spec, where, "name")
+        try:
+            reference_data(section)[name]["data"]
+        except (KeyError, TypeError):
+            self.fail(where, f"no reference table {name!r} in content/{section}.json")
+        return Table(section, name)
+
+    def compile_exercise(self, spec, where):
+        target = self.field(spec, where, "function")
+        module, _, function = target.partition(":")
+        if not function or not all(part.isidentifier() for part in [*module.split("."), function]):
+            self.fail(where, f"'function' must look like 'package.module:function', not {target!r}")
+        return Exercise(module, function, self.label)
+
+    def quiz(self, spec, where):
+        section = self.field(spec, where, "section")
+        if section in self.quizzes:
+            self.fail(where, f"quiz section {section!r} is already used by {self.quizzes[section].title!r}")
+        submit = self.field(spec, where, "submit", dict)
+        submit = {"key": self.claim(self.field(submit, f"{where}.submit", "key"), f"{where}.submit"),
+                  "label": self.field(submit, f"{where}.submit", "label")}
+        return section, self.field(spec, where, "title"), submit
+
+    def compile_multiple_choice(self, spec, where):
+        section, title, submit = self.quiz(spec, where)
+        widget = self.field(spec, where, "widget", str, "radio")
+        if widget not in WIDGETS:
+            self.fail(where, f"'widget' must be one of {', '.join(WIDGETS)}")
+        shared = self.field(spec, where, "options", list, None)
+        questions = []
+        for i, question in enumerate(self.field(spec, where, "questions", list)):
+            at = f"{where}.questions[{i}]"
+            if not isinstance(question, dict):
+                self.fail(at, "expected an object with 'key', 'prompt' and 'answer'")
+            key = self.claim(self.field(question, at, "key"), at)
+            options = self.field(question, at, "options", list, shared)
+            if options is None:
+                self.fail(at, "missing 'options' (on the question or the quiz)")
+            answer = self.field(question, at, "answer")
+            if answer not in options:
+                self.fail(at, f"answer {answer!r} is not one of the options")
+            questions.append(Question(key, self.text(question, at, "prompt"), tuple(options), answer,
+                                      self.field(question, at, "label", str, key)))
+        if not questions:
+            self.fail(where, "a quiz needs at least one question")
+        export = self.field(spec, where, "export", dict, None)
+        if export is not None:
+            export = {"key": self.claim(self.field(export, f"{where}.export", "key"), f"{where}.export"),
+                      "file_name": self.field(export, f"{where}.export", "file_name")}
+        quiz = MultipleChoice(section, title, tuple(questions), widget, submit,
+                              question_column=self.field(spec, where, "question_column", str, "Question"),
+                              results_heading=self.field(spec, where, "results_heading", str, "Quiz Results"),
+                              export=export)
+        self.quizzes[section] = quiz
+        return quiz
+
+    def compile_free_text(self, spec, where):
+        section, title, submit = self.quiz(spec, where)
+        quiz = FreeText(section, title, self.claim(self.field(spec, where, "key"), where),
+                        self.text(spec, where, "prompt"), submit, self.text(spec, where, "model_answer", None))
+        self.quizzes[section] = quiz
+        return quiz
+
+    def compile_adaptive_quiz(self, spec, where):
+        from course.questionbank import TOPICS
+
+        section, title, submit = self.quiz(spec, where)
+        topics = self.field(spec, where, "topics", list, list(TOPICS))
+        unknown = [topic for topic in topics if topic not in TOPICS]
+        if unknown or not topics:
+            self.fail(where, f"'topics' must be some of {', '.join(TOPICS)}")
+        questions = self.field(spec, where, "questions", int, 10)
+        if isinstance(questions, bool) or questions < 1:
+            self.fail(where, "'questions' must be a whole number above zero")
+        quiz = AdaptiveQuiz(section, title, self.claim(self.field(spec, where, "key"), where), tuple(topics),
+                            questions, submit)
+        self.quizzes[section] = quiz
+        return quiz
+
+
+def catalog_files(directory=CATALOG_DIR):
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".json")
+    )
+
+
+def read_catalog(directory=CATALOG_DIR):
+    """Parse, validate and compile every page file in ``directory``."""
+    pages, keys, quizzes = {}, {}, {}
+    for path in catalog_files(directory):
+        file_name = os.path.basename(path)
+        with open(path, encoding="utf-8") as f:
+            try:
+                spec = json.load(f)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"{file_name}: {error}") from None
+        # "03-module2.json" -> "module2"
+        name = os.path.splitext(file_name)[0].split("-", 1)[-1]
+        page = Compiler(file_name, keys, quizzes).page(spec, name)
+        if page.label in pages:
+            raise ValueError(f"{file_name}: page label {page.label!r} is already used")
+        pages[page.label] = page
+    return Catalog(pages, quizzes)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_catalog(digest):
+    return read_catalog()
+
+
+def course_catalog():
+    """The compiled catalog of course/content/pages/, shared by every session."""
+    return load_catalog(files_digest(catalog_files()))
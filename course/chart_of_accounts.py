@@ -0,0 +1,233 @@
+import bisect
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+from course.trees import ROOT, ancestors, subtree_sums, tree_depths
+
+# --- Chart of Accounts ---
+# Accounts are identified by number, named, and arranged in a parent/child
+# tree (header accounts roll up their children). Classification and search are
+# precomputed when the chart is built so lookups stay constant-time no matter
+# how many accounts there are:
+#
+#   - category: the leading RANGE_DIGITS of an account number index a dense
+#     table built from the numbering ranges (1000-1999 Assets, ...)
+#   - normal balance: follows the category unless the chart overrides it
+#     (contra accounts such as Accumulated Depreciation)
+#   - search: a trie over every word of every account name and over account
+#     numbers; each node keeps the first SUGGESTIONS_PER_NODE matches, so
+#     type-ahead is a walk of the typed prefix with no scan of the chart.
+#     Multi-word queries use the full row list of every word instead (the
+#     words of the sorted vocabulary a prefix covers are one bisect range).
+
+CATEGORIES = ("Assets", "Liabilities", "Equity", "Revenue", "Expenses")
+NORMAL_BALANCE = {
+    "Assets": "Debit",
+    "Liabilities": "Credit",
+    "Equity": "Credit",
+    "Revenue": "Credit",
+    "Expenses": "Debit",
+}
+RANGE_DIGITS = 4
+DEFAULT_RANGES = (
+    (1000, 1999, "Assets"),
+    (2000, 2999, "Liabilities"),
+    (3000, 3999, "Equity"),
+    (4000, 4999, "Revenue"),
+    (5000, 9999, "Expenses"),
+)
+SUGGESTIONS_PER_NODE = 50
+WIDE_PREFIX = 8  # a query word covering this many times the candidate rows is checked row by row
+UNCLASSIFIED = -1
+
+
+class CategoryRanges:
+    """Constant-time account number -> category lookup from numbering ranges."""
+
+    def __init__(self, ranges=DEFAULT_RANGES, digits=RANGE_DIGITS):
+        self.digits = digits
+        self.table = np.full(10 ** digits, UNCLASSIFIED, dtype=np.int8)
+        for low, high, category in ranges:
+            self.table[low:high + 1] = CATEGORIES.index(category)
+
+    def prefix(self, number):
+        digits = re.sub(r"\D", "", str(number))[:self.digits]
+        return int(digits.ljust(self.digits, "0")) if digits else None
+
+    def classify(self, number):
+        prefix = self.prefix(number)
+        code = UNCLASSIFIED if prefix is None else self.table[prefix]
+        return None if code == UNCLASSIFIED else CATEGORIES[code]
+
+    def classify_many(self, numbers):
+        """Category codes (UNCLASSIFIED if outside every range) for a Series of numbers."""
+        digits = numbers.astype(str).str.replace(r"\D", "", regex=True).str[:self.digits]
+        blank = digits == ""
+        prefixes = digits.where(~blank, "0").str.ljust(self.digits, "0").astype(np.int64).to_numpy()
+        return np.where(blank.to_numpy(), UNCLASSIFIED, self.table[prefixes])
+
+
+class Trie:
+    """Prefix tree of lower-cased tokens; each node keeps up to ``limit`` ids."""
+
+    IDS = ""  # key holding a node's ids; never a single character
+
+    def __init__(self, limit=SUGGESTIONS_PER_NODE):
+        self.root = {}
+        self.limit = limit
+
+    def insert(self, token, item):
+        node = self.root
+        for char in token:
+            node = node.setdefault(char, {})
+            ids = node.setdefault(self.IDS, [])
+            if len(ids) < self.limit and (not ids or ids[-1] != item):
+                ids.append(item)
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get(self.IDS, [])
+
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+
+class ChartOfAccounts:
+    """Accounts from a frame with ``number``, ``name`` and ``parent`` columns.
+
+    ``parent`` holds the number of the header account above (blank at the top)
+    and an optional ``normal_balance`` column overrides the category default.
+    """
+
+    def __init__(self, accounts, ranges=DEFAULT_RANGES):
+        accounts = accounts.fillna("")
+        self.numbers = pd.Index(accounts["number"].astype(str), name="number")
+        if not self.numbers.is_unique:
+            raise ValueError("Account numbers must be unique.")
+        self.names = accounts["name"].astype(str).to_numpy()
+        parents = accounts["parent"].astype(str) if "parent" in accounts else pd.Series("", index=accounts.index)
+        self.parent = self.numbers.get_indexer(parents)
+        unknown = parents[(self.parent == ROOT) & (parents != "")]
+        if len(unknown):
+            raise ValueError(f"Unknown parent account: {unknown.iloc[0]}")
+        self.depth = tree_depths(self.parent)
+
+        self.ranges = CategoryRanges(ranges)
+        self.category = self.ranges.classify_many(accounts["number"])
+        self.normal_balance = np.array(
+            [NORMAL_BALANCE[CATEGORIES[code]] if code != UNCLASSIFIED else "" for code in self.category],
+            dtype=object,
+        )
+        if "normal_balance" in accounts:
+            override = accounts["normal_balance"].astype(str).to_numpy()
+            self.normal_balance = np.where(override != "", override, self.normal_balance)
+
+        # Insert in account-number order so each node keeps the lowest numbers.
+        # Whole words also keep every row, for filtering multi-word queries.
+        self.trie = Trie()
+        self.postings = {}
+        by_number = np.argsort(self.numbers.to_numpy(), kind="stable")
+        self.order = np.empty(len(by_number), dtype=np.int64)
+        self.order[by_number] = np.arange(len(by_number))
+        for row in by_number:
+            tokens = tokenize(self.numbers[row]) + tokenize(self.names[row])
+            for token in tokens:
+                self.trie.insert(token, int(row))
+                rows = self.postings.setdefault(token, [])
+                if not rows or rows[-1] != row:
+                    rows.append(int(row))
+        self.postings = {token: np.array(rows, dtype=np.int64) for token, rows in self.postings.items()}
+        self.vocabulary = sorted(self.postings)
+        self.posting_ends = np.concatenate([[0], np.cumsum([len(self.postings[token]) for token in self.vocabulary])])
+        self.tokens = [set(tokenize(number) + tokenize(name)) for number, name in zip(self.numbers, self.names)]
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def row(self, number):
+        return self.numbers.get_loc(str(number))
+
+    def classify(self, number):
+        """(category, normal balance) of an account number, listed or not."""
+        number = str(number)
+        if number in self.numbers:
+            row = self.row(number)
+            code = self.category[row]
+            return (CATEGORIES[code] if code != UNCLASSIFIED else None), self.normal_balance[row] or None
+        category = self.ranges.classify(number)
+        return category, NORMAL_BALANCE.get(category)
+
+    def search(self, query, limit=20):
+        """Rows of accounts whose number or name words start with every query word."""
+        words = tokenize(query)
+        if not words:
+            return []
+        if len(words) == 1:
+            return self.trie.lookup(words[0])[:limit]
+        # Every word is a prefix: the rows it matches are the full row lists of
+        # the vocabulary words it covers. Start from the word covering the
+        # fewest rows and intersect the rows of words covering a similar
+        # number; for a much wider word (a prefix such as "0" can cover every
+        # account number) the candidates' own words are checked instead.
+        ranges = sorted((self.covered(*bounds), bounds, word) for word in words
+                        for bounds in [self.prefix_range(word)])
+        rows = self.prefix_rows(*ranges[0][1])
+        wide = []
+        for covered, bounds, word in ranges[1:]:
+            if covered <= WIDE_PREFIX * len(rows):
+                rows = np.intersect1d(rows, self.prefix_rows(*bounds), assume_unique=True)
+            else:
+                wide.append(word)
+        rows = rows[np.argsort(self.order[rows], kind="stable")].tolist()
+        matches = (row for row in rows
+                   if all(any(token.startswith(word) for token in self.tokens[row]) for word in wide))
+        return list(itertools.islice(matches, limit))
+
+    def prefix_rows(self, start, stop):
+        """Rows of every vocabulary word from ``start`` to ``stop``."""
+        if stop - start == 1:
+            return self.postings[self.vocabulary[start]]
+        if stop == start:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.postings[token] for token in self.vocabulary[start:stop]]))
+
+    def covered(self, start, stop):
+        """Posting entries of vocabulary words ``start`` to ``stop`` (an upper bound on their rows)."""
+        return int(self.posting_ends[stop] - self.posting_ends[start])
+
+    def prefix_range(self, prefix):
+        """Bounds of the vocabulary words starting with ``prefix``."""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        return start, bisect.bisect_left(self.vocabulary, prefix + "{", start)  # "{" sorts after "z" and digits
+
+    def path(self, number):
+        """Rows from the account up to its top-level header."""
+        return ancestors(self.parent, self.row(number))
+
+    def rollup(self, balances):
+        """Roll a Series of balances (indexed by account number) up the tree."""
+        local = np.zeros(len(self.numbers), dtype=np.float64)
+        rows = self.numbers.get_indexer(balances.index.astype(str))
+        if (rows == ROOT).any():
+            raise ValueError(f"Unknown account: {balances.index[rows == ROOT][0]}")
+        np.add.at(local, rows, balances.to_numpy(dtype=np.float64))
+        return pd.Series(subtree_sums(self.parent, self.depth, local), index=self.numbers, name="Balance")
+
+    def to_frame(self, rows=None):
+        rows = np.arange(len(self.numbers)) if rows is None else np.asarray(rows, dtype=int)
+        parent = self.parent[rows]
+        return pd.DataFrame({
+            "Number": self.numbers[rows],
+            "Account": self.names[rows],
+            "Category": [CATEGORIES[code] if code != UNCLASSIFIED else "" for code in self.category[rows]],
+            "Normal Balance": self.normal_balance[rows],
+            "Parent": np.where(parent == ROOT, "", self.numbers[np.maximum(parent, 0)]),
+        })
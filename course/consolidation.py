@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from course.journal import to_cents
+from course.trees import ROOT, ancestors, descendants, lowest_common_ancestor, subtree_sums, tree_depths
+
+# --- Consolidation with Intercompany Elimination ---
+# Consolidates trial balances up an ownership hierarchy. Each trial balance
+# line has an ``entity``, an ``account``, a signed ``amount`` (debits positive,
+# credits negative) and, for intercompany balances, the ``counterparty``
+# entity. The hierarchy lists each ``entity`` with its ``parent`` (blank for a
+# top-level entity).
+#
+# An intercompany balance between two entities is eliminated at their lowest
+# common ancestor: from there up, both sides are inside the group. So every
+# node's consolidated balance is the sum, over its subtree, of
+#
+#     local = own balances - intercompany balances eliminated at that node
+#
+# Balances are kept as an (entities x accounts) int64 matrix in cents. The
+# full build is grouped sums plus one pass per tree level. Replacing one
+# entity's trial balance only changes that entity and its ancestors, so
+# ``update_entity`` adds the difference along that path and nothing else.
+
+# Where the amount two sides of an intercompany balance disagree by is kept,
+# so the consolidated trial balance still balances.
+DIFFERENCE_ACCOUNT = "Intercompany Differences"
+
+
+class Consolidation:
+    def __init__(self, hierarchy, trial_balances):
+        hierarchy = hierarchy.fillna("")
+        self.entities = pd.Index(hierarchy["entity"].astype(str), name="entity")
+        if not self.entities.is_unique:
+            raise ValueError("Each entity may appear only once in the hierarchy.")
+        parents = hierarchy["parent"].astype(str)
+        parent = self.entities.get_indexer(parents)
+        unknown = parents[(parent == ROOT) & (parents != "")]
+        if len(unknown):
+            raise ValueError(f"Unknown parent entity: {unknown.iloc[0]}")
+        self.parent = parent
+        self.depth = tree_depths(parent)
+
+        self.accounts = pd.Index([], dtype=object, name="account")
+        self.categories = {}
+        self.own = np.zeros((len(self.entities), 0), dtype=np.int64)
+        self.eliminated = np.zeros_like(self.own)  # by lowest common ancestor
+        self.intercompany = {}  # entity code -> (counterparty, account, cents, lca) arrays
+
+        self.difference_account = self.account_codes(pd.Series([DIFFERENCE_ACCOUNT]))[0]
+        lines = self.encode(trial_balances)
+        np.add.at(self.own, (lines["entity"].to_numpy(), lines["account"].to_numpy()), lines["cents"].to_numpy())
+        ic = self.intercompany_groups(lines)
+        order = np.argsort(ic[0], kind="stable")
+        entity, counterparty, account, cents, lca = (column[order] for column in ic)
+        bounds = np.flatnonzero(np.diff(entity)) + 1
+        for part in zip(*(np.split(column, bounds) for column in (entity, counterparty, account, cents, lca))):
+            if len(part[0]):
+                self.intercompany[int(part[0][0])] = part[1:]
+        keep = lca != ROOT  # entities in different trees are never eliminated
+        self.post_eliminations(self.eliminated, lca[keep], account[keep], cents[keep])
+        self.totals = self.subtree_sums(self.own - self.eliminated)
+
+    # --- Encoding -----------------------------------------------------------
+
+    def encode(self, trial_balances):
+        frame = trial_balances
+        missing = {"entity", "account", "amount"} - set(frame.columns)
+        if missing:
+            raise ValueError(f"Trial balances are missing column(s): {', '.join(sorted(missing))}.")
+        entity = self.entity_codes(frame["entity"])
+        counterparty = (self.entity_codes(frame["counterparty"], allow_blank=True)
+                        if "counterparty" in frame else np.full(len(frame), ROOT))
+        if "category" in frame:
+            categories = frame[["account", "category"]].drop_duplicates("account").fillna("")
+            for account, category in categories.itertuples(index=False):
+                self.categories.setdefault(str(account), category)
+        return pd.DataFrame({
+            "entity": entity,
+            "account": self.account_codes(frame["account"]),
+            "counterparty": counterparty,
+            "cents": to_cents(frame["amount"]),
+        })
+
+    def entity_codes(self, names, allow_blank=False):
+        # Factorize first so only the distinct names are looked up.
+        local, distinct = pd.factorize(names)
+        distinct = pd.Index(distinct).astype(str)
+        mapping = self.entities.get_indexer(distinct)
+        blank = distinct == ""
+        unknown = distinct[(mapping == ROOT) & ~(blank & allow_blank)]
+        if len(unknown) or (not allow_blank and (local == -1).any()):
+            raise ValueError(f"Entity not in the hierarchy: {unknown[0] if len(unknown) else '(blank)'}")
+        return np.where(local == -1, ROOT, mapping[local])
+
+    def account_codes(self, names):
+        local, distinct = pd.factorize(names)
+        distinct = pd.Index(distinct).astype(str)
+        new = distinct.difference(self.accounts)
+        if len(new):
+            self.accounts = self.accounts.append(new)
+            grow = ((0, 0), (0, len(new)))
+            self.own = np.pad(self.own, grow)
+            self.eliminated = np.pad(self.eliminated, grow)
+            if hasattr(self, "totals"):
+                self.totals = np.pad(self.totals, grow)
+        return self.accounts.get_indexer(distinct)[local]
+
+    # --- Tree operations ----------------------------------------------------
+
+    def ancestors(self, entity):
+        return ancestors(self.parent, entity)
+
+    def descendants(self, entity):
+        return descendants(self.parent, self.depth, entity)
+
+    def lowest_common_ancestor(self, a, b):
+        return lowest_common_ancestor(self.parent, self.depth, a, b)
+
+    def subtree_sums(self, local):
+        return subtree_sums(self.parent, self.depth, local)
+
+    # --- Intercompany -------------------------------------------------------
+
+    def intercompany_groups(self, lines):
+        """Intercompany lines summed by (entity, counterparty, account), with the
+        lowest common ancestor where each group is eliminated."""
+        grouped = (lines[lines["counterparty"] != ROOT]
+                   .groupby(["entity", "counterparty", "account"], as_index=False)["cents"].sum())
+        entity = grouped["entity"].to_numpy()
+        counterparty = grouped["counterparty"].to_numpy()
+        lca = self.lowest_common_ancestor(entity, counterparty)
+        return entity, counterparty, grouped["account"].to_numpy(), grouped["cents"].to_numpy(), lca
+
+    def post_eliminations(self, target, rows, account, cents):
+        np.add.at(target, (rows, account), cents)
+        np.add.at(target[:, self.difference_account], rows, -cents)
+
+    def intercompany_frame(self):
+        rows = []
+        for entity, (counterparty, account, cents, lca) in self.intercompany.items():
+            rows.append(pd.DataFrame({"entity": entity, "counterparty": counterparty, "account": account,
+                                      "cents": cents, "lca": lca}))
+        if not rows:
+            return pd.DataFrame(columns=["entity", "counterparty", "account", "cents", "lca"])
+        return pd.concat(rows, ignore_index=True)
+
+    # --- Updates ------------------------------------------------------------
+
+    def update_entity(self, entity_name, trial_balance):
+        """Replace one entity's trial balance; only it and its ancestors change.
+
+        Returns the names of the entities whose consolidated balances changed.
+        """
+        entity = self.entities.get_loc(entity_name)
+        lines = self.encode(trial_balance.assign(entity=entity_name))
+        new_own = np.zeros(len(self.accounts), dtype=np.int64)
+        np.add.at(new_own, lines["account"].to_numpy(), lines["cents"].to_numpy())
+
+        path = self.ancestors(entity)
+        position = np.full(len(self.entities), ROOT)
+        position[path] = np.arange(len(path))
+        old_ic = self.intercompany.pop(entity, None)
+        _, *new_ic = self.intercompany_groups(lines)
+        if len(new_ic[0]):
+            self.intercompany[entity] = tuple(new_ic)
+        delta_eliminated = np.zeros((len(path), len(self.accounts)), dtype=np.int64)
+        for sign, ic in ((-1, old_ic), (1, new_ic)):
+            if ic is None:
+                continue
+            _, account, cents, lca = ic
+            keep = lca != ROOT
+            # The common ancestor of this entity and anything else is on its path.
+            self.post_eliminations(delta_eliminated, position[lca[keep]], account[keep], sign * cents[keep])
+
+        delta_own = new_own - self.own[entity]
+        self.own[entity] = new_own
+        self.eliminated[path] += delta_eliminated
+        # Node k on the path gains the entity's change minus the eliminations
+        # recorded at path nodes 0..k (those are all inside its subtree).
+        self.totals[path] += delta_own[None, :] - np.cumsum(delta_eliminated, axis=0)
+        return list(self.entities[path])
+
+    # --- Results ------------------------------------------------------------
+
+    def consolidated(self, entity_name):
+        """Consolidated trial balance of ``entity_name`` and everything below it."""
+        balances = self.totals[self.entities.get_loc(entity_name)]
+        frame = pd.DataFrame({"Account": self.accounts, "Balance ($)": balances / 100})
+        if self.categories:
+            frame.insert(1, "Category", [self.categories.get(account, "") for account in self.accounts])
+        return frame[balances != 0].reset_index(drop=True)
+
+    def eliminations(self, entity_name):
+        """Intercompany balances eliminated within ``entity_name``'s group.
+
+        ``Unmatched ($)`` is what the two sides disagree by: a receivable and
+        its matching payable should sum to zero.
+        """
+        node = self.entities.get_loc(entity_name)
+        ic = self.intercompany_frame()
+        below = np.isin(ic["lca"], self.descendants(node))
+        ic = ic[below]
+        pair = np.sort(ic[["entity", "counterparty"]].to_numpy(), axis=1)
+        summary = ic.assign(a=pair[:, 0], b=pair[:, 1], gross=ic["cents"].abs()).groupby(["a", "b"], as_index=False).agg(
+            eliminated=("gross", "sum"), unmatched=("cents", "sum"))
+        return pd.DataFrame({
+            "Entity": self.entities[summary["a"]],
+            "Counterparty": self.entities[summary["b"]],
+            "Eliminated ($)": summary["eliminated"] / 200,
+            "Unmatched ($)": summary["unmatched"] / 100,
+        })
@@ -0,0 +1,272 @@
+import numpy as np
+import pandas as pd
+
+from course.jobs import report
+from course.journal import Journal, encode_labels, to_cents
+
+# --- Depreciation Schedules ---
+# Depreciates a whole asset register month by month. The register has one row
+# per asset: ``asset``, ``cost``, ``salvage``, ``life_months``, ``method``,
+# ``in_service`` date and optionally ``disposal`` date, ``proceeds``,
+# ``asset_class``, ``rate`` (declining-balance multiple, default 2) and
+# ``total_units`` / ``monthly_units`` for units of production.
+#
+# Each month is one set of array operations over every asset, so a register
+# of 100k assets costs a few milliseconds per month and the schedule is
+# streamed: ``periods`` yields one month at a time and nothing holds the full
+# (assets x months) schedule. Amounts are whole cents. Each month reports its
+# progress, so schedules of large registers can run as background jobs (see
+# course.jobs) and be cancelled between months.
+#
+#   - partial periods: each month's charge is scaled by the fraction of its
+#     days the asset was in service (from the in-service date, up to the
+#     disposal date)
+#   - straight-line and units of production are computed from the cumulative
+#     fraction of life (or units) used, rounded once, so rounding never drifts
+#     and accumulated depreciation lands exactly on cost - salvage
+#   - declining balance charges book value x rate / life and switches to
+#     straight-line over the remaining life once that is larger
+#   - nothing depreciates below salvage or after disposal
+
+METHODS = ("Straight-Line", "Declining Balance", "Units of Production")
+METHOD_NAMES = {
+    "straight-line": 0, "straight line": 0, "sl": 0,
+    "declining balance": 1, "declining-balance": 1, "double declining balance": 1, "ddb": 1, "db": 1,
+    "units of production": 2, "units-of-production": 2, "uop": 2,
+}
+DEFAULT_RATE = 2.0
+MAX_MONTHS = 1200  # when no horizon is given, stop after 100 years regardless
+EXPENSE_ACCOUNT = "Depreciation Expense"
+ACCUMULATED_ACCOUNT = "Accumulated Depreciation"
+DEFAULT_CLASS = "Property & Equipment"
+NO_DATE = np.iinfo(np.int64).max
+
+ENTRY_CATEGORIES = {
+    EXPENSE_ACCOUNT: "Expense",
+    ACCUMULATED_ACCOUNT: "Asset",
+    "Cash": "Asset",
+    "Loss on Disposal": "Expense",
+    "Gain on Disposal": "Revenue",
+}
+
+
+def day_numbers(values, missing=NO_DATE):
+    dates = pd.to_datetime(values, errors="coerce").to_numpy().astype("datetime64[D]")
+    days = dates.astype(np.int64)
+    return np.where(np.isnat(dates), missing, days)
+
+
+def column(frame, name, default):
+    return frame[name] if name in frame else pd.Series(default, index=frame.index)
+
+
+class AssetRegister:
+    """Encoded asset register; see the module comment for the columns."""
+
+    def __init__(self, register, usage=None):
+        register = register.rename(columns=lambda name: str(name).strip().lower().replace(" ", "_"))
+        missing = {"asset", "cost", "life_months", "in_service"} - set(register.columns)
+        if missing:
+            raise ValueError(f"Asset register is missing column(s): {', '.join(sorted(missing))}.")
+        self.assets = pd.Index(register["asset"].astype(str), name="asset")
+        if not self.assets.is_unique:
+            raise ValueError("Each asset may appear only once in the register.")
+        self.cost = to_cents(register["cost"])
+        self.salvage = to_cents(column(register, "salvage", 0).fillna(0))
+        self.proceeds = to_cents(column(register, "proceeds", 0).fillna(0))
+        self.life = pd.to_numeric(register["life_months"]).to_numpy(dtype=np.float64)
+        self.rate = pd.to_numeric(column(register, "rate", DEFAULT_RATE)).fillna(DEFAULT_RATE).to_numpy(np.float64)
+        self.total_units = pd.to_numeric(column(register, "total_units", 0)).fillna(0).to_numpy(np.float64)
+        self.monthly_units = pd.to_numeric(column(register, "monthly_units", 0)).fillna(0).to_numpy(np.float64)
+        methods = column(register, "method", METHODS[0]).fillna(METHODS[0]).astype(str).str.strip().str.lower()
+        self.method = methods.map(METHOD_NAMES)
+        if self.method.isna().any():
+            raise ValueError(f"Unknown depreciation method: {methods[self.method.isna()].iloc[0]!r}")
+        self.method = self.method.to_numpy(dtype=np.int8)
+        if ((self.life <= 0) & (self.method != 2)).any():
+            raise ValueError("Life (months) must be positive.")
+        if ((self.total_units <= 0) & (self.method == 2)).any():
+            raise ValueError("Units of production needs total_units.")
+        if (self.salvage > self.cost).any():
+            raise ValueError(f"Salvage exceeds cost for asset {self.assets[np.argmax(self.salvage > self.cost)]}.")
+
+        self.in_service = day_numbers(register["in_service"], missing=-1)
+        if (self.in_service < 0).any():
+            raise ValueError("Every asset needs an in-service date.")
+        self.disposal = day_numbers(column(register, "disposal", None))
+        self.classes, (self.asset_class,) = encode_labels(
+            column(register, "asset_class", DEFAULT_CLASS).fillna(DEFAULT_CLASS).to_numpy())
+        self.usage = self.encode_usage(usage) if usage is not None else {}
+
+    def encode_usage(self, usage):
+        """Actual units per (asset, month), replacing ``monthly_units`` where given."""
+        usage = usage.rename(columns=lambda name: str(name).strip().lower())
+        months = pd.to_datetime(usage["month"]).to_numpy().astype("datetime64[M]")
+        assets = self.assets.get_indexer(usage["asset"].astype(str))
+        if (assets < 0).any():
+            raise ValueError(f"Usage for an asset not in the register: {usage['asset'][assets < 0].iloc[0]}")
+        units = pd.to_numeric(usage["units"]).to_numpy(dtype=np.float64)
+        order = np.argsort(months, kind="stable")
+        months, assets, units = months[order], assets[order], units[order]
+        bounds = np.flatnonzero(np.diff(months.astype(np.int64))) + 1
+        return {month[0]: (rows, values) for month, rows, values in
+                zip(np.split(months, bounds), np.split(assets, bounds), np.split(units, bounds)) if len(month)}
+
+    def __len__(self):
+        return len(self.assets)
+
+    def first_month(self):
+        return np.datetime64(int(self.in_service.min()), "D").astype("datetime64[M]")
+
+    # --- Schedule -----------------------------------------------------------
+
+    def periods(self, start=None, months=None):
+        """Yield ``(month, depreciation, accumulated, disposed)`` one month at a time.
+
+        ``depreciation`` is this month's charge per asset in cents,
+        ``accumulated`` the running total (updated in place on the next
+        iteration) and ``disposed`` the assets disposed of this month. Months
+        before ``start`` are computed, so accumulated totals are right, but
+        not yielded.
+        """
+        month = self.first_month()
+        start = month if start is None else max(np.datetime64(start, "M"), month)
+        stop = None if months is None else start + months
+        depreciable = (self.cost - self.salvage).astype(np.float64)
+        accumulated = np.zeros(len(self), dtype=np.int64)
+        elapsed = np.zeros(len(self), dtype=np.float64)  # months of life used
+        units_used = np.zeros(len(self), dtype=np.float64)
+        straight, declining, units = (np.flatnonzero(self.method == code) for code in range(len(METHODS)))
+        last_in_service = self.in_service.max()
+
+        count = MAX_MONTHS if stop is None else int((stop - month).astype(np.int64))
+        for i in range(count):
+            report(i / count, f"Depreciating {month}")
+            first_day = month.astype("datetime64[D]").astype(np.int64)
+            next_first = (month + 1).astype("datetime64[D]").astype(np.int64)
+            days = np.minimum(self.disposal, next_first - 1) - np.maximum(self.in_service, first_day) + 1
+            fraction = np.clip(days, 0, None) / (next_first - first_day)
+            depreciation = np.zeros(len(self), dtype=np.int64)
+
+            # Straight-line: exact cumulative target, so rounding never drifts.
+            elapsed_before = elapsed.copy()
+            elapsed += fraction
+            rows = straight
+            target = np.round(depreciable[rows] * np.minimum(elapsed[rows] / self.life[rows], 1))
+            depreciation[rows] = target.astype(np.int64) - accumulated[rows]
+
+            # Declining balance, switching to straight-line over the remaining life.
+            rows = declining
+            remaining = depreciable[rows] - accumulated[rows]
+            book = self.cost[rows] - accumulated[rows]
+            by_balance = book * self.rate[rows] / self.life[rows] * fraction[rows]
+            remaining_life = np.maximum(self.life[rows] - elapsed_before[rows], fraction[rows])
+            by_line = remaining * np.divide(fraction[rows], remaining_life,
+                                            out=np.zeros(len(rows)), where=remaining_life > 0)
+            charge = np.round(np.maximum(by_balance, by_line)).astype(np.int64)
+            depreciation[rows] = np.minimum(charge, remaining.astype(np.int64))
+
+            # Units of production: cumulative units used against total units.
+            rows = units
+            used = self.monthly_units[rows] * fraction[rows]
+            if month in self.usage:
+                actual = np.zeros(len(self))
+                has_actual = np.zeros(len(self), dtype=bool)
+                actual_rows, actual_units = self.usage[month]
+                np.add.at(actual, actual_rows, actual_units)
+                has_actual[actual_rows] = True
+                used = np.where(has_actual[rows] & (fraction[rows] > 0), actual[rows], used)
+            units_used[rows] += used
+            target = np.round(depreciable[rows] * np.minimum(units_used[rows] / self.total_units[rows], 1))
+            depreciation[rows] = target.astype(np.int64) - accumulated[rows]
+
+            accumulated += depreciation
+            if month >= start:
+                disposed = (self.disposal >= first_day) & (self.disposal < next_first)
+                yield month, depreciation, accumulated, disposed
+
+            month = month + 1
+            if stop is None and first_day >= last_in_service:
+                # Every asset is in service: stop once all are done.
+                if not ((accumulated < depreciable) & (self.disposal >= next_first)).any():
+                    return
+
+    # --- Journal entries ----------------------------------------------------
+
+    def journal_entries(self, start=None, months=None):
+        """Yield ``(month, Journal)``: one entry per month per asset class.
+
+        Depreciation debits Depreciation Expense and credits Accumulated
+        Depreciation; an asset disposed of that month also removes its cost
+        and accumulated depreciation, records proceeds to Cash and the
+        difference as a Gain or Loss on Disposal.
+        """
+        classes = len(self.classes)
+        for month, depreciation, accumulated, disposed in self.periods(start, months):
+            by_class = np.zeros(classes, dtype=np.int64)
+            np.add.at(by_class, self.asset_class, depreciation)
+            lines = []  # (entry, account, entry type, cents)
+            for code in np.flatnonzero(by_class):
+                lines.append((code, EXPENSE_ACCOUNT, 0, by_class[code]))
+                lines.append((code, ACCUMULATED_ACCOUNT, 1, by_class[code]))
+            if disposed.any():
+                totals = np.zeros((4, classes), dtype=np.int64)
+                rows = np.flatnonzero(disposed)
+                for i, values in enumerate((accumulated, self.proceeds, self.cost)):
+                    np.add.at(totals[i], self.asset_class[rows], values[rows])
+                totals[3] = totals[2] - totals[0] - totals[1]  # loss (+) or gain (-)
+                for code in np.flatnonzero(totals[2]):
+                    entry = classes + code  # disposals follow the depreciation entries
+                    removed, proceeds, cost, loss = totals[:, code]
+                    lines.append((entry, ACCUMULATED_ACCOUNT, 0, removed))
+                    if proceeds:
+                        lines.append((entry, "Cash", 0, proceeds))
+                    lines.append((entry, self.classes[code], 1, cost))
+                    if loss:
+                        lines.append((entry, "Loss on Disposal" if loss > 0 else "Gain on Disposal",
+                                      0 if loss > 0 else 1, abs(loss)))
+            yield month, self.to_journal(month, lines)
+
+    def to_journal(self, month, lines):
+        entry, account, entry_type, cents = (list(values) for values in zip(*lines)) if lines else ([], [], [], [])
+        accounts, (account_code,) = encode_labels(np.array(account, dtype=object))
+        category = [ENTRY_CATEGORIES.get(name, "Asset") for name in account]
+        categories, (category_code,) = encode_labels(np.array(category, dtype=object))
+        last_day = (month + 1).astype("datetime64[D]") - 1
+        return Journal(
+            entry=np.asarray(entry, dtype=np.int32),
+            date=np.zeros(len(lines), dtype=np.int32),
+            account=account_code,
+            category=category_code,
+            entry_type=np.asarray(entry_type, dtype=np.int8),
+            cents=np.asarray(cents, dtype=np.int64),
+            accounts=accounts,
+            categories=categories,
+            dates=np.array([last_day]),
+        )
+
+    # --- Display ------------------------------------------------------------
+
+    def journal_frame(self, start=None, months=None):
+        """Every monthly entry from ``journal_entries`` in one DataFrame (empty if there are none)."""
+        frames = [journal.to_frame() for _, journal in self.journal_entries(start, months)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def asset_schedule(self, asset, start=None, months=None):
+        """Month-by-month schedule of one asset."""
+        row = self.assets.get_loc(asset)
+        records = []
+        for month, depreciation, accumulated, _ in self.periods(start, months):
+            if depreciation[row] or records:
+                records.append((str(month), depreciation[row], accumulated[row]))
+            if records and (accumulated[row] >= self.cost[row] - self.salvage[row] or self.disposal[row] < NO_DATE
+                            and month >= np.datetime64(int(self.disposal[row]), "D").astype("datetime64[M]")):
+                break
+        frame = pd.DataFrame(records, columns=["Month", "Depreciation", "Accumulated"])
+        return pd.DataFrame({
+            "Month": frame["Month"],
+            "Depreciation ($)": frame["Depreciation"] / 100,
+            "Accumulated Depreciation ($)": frame["Accumulated"] / 100,
+            "Book Value ($)": (self.cost[row] - frame["Accumulated"]) / 100,
+        })
+
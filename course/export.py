@@ -0,0 +1,218 @@
+import io
+import re
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# --- Streaming Export ---
+# Writes schedules, forecasts and quiz results to CSV, Parquet or Excel one
+# chunk of rows at a time, so an export never builds the whole table as one
+# DataFrame. A source is any of:
+#
+#   a DataFrame                        sliced into chunks
+#   an object with ``__len__`` and     e.g. a recurring Schedule or Journal;
+#   ``to_frame(start, stop, ...)``     only one chunk is decoded at a time
+#   an iterable of DataFrames          e.g. a generator of monthly entries
+#
+# Excel files are written without a spreadsheet library: the sheet XML is
+# streamed into the .xlsx zip, using inline strings so there is no shared
+# string table to hold in memory. A sheet holds at most EXCEL_MAX_ROWS rows;
+# longer exports continue on Sheet2, Sheet3, ... with the header repeated.
+
+CHUNK_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_576
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+SPOOL_BYTES = 32 * 2**20  # exports larger than this spill to a temporary file
+ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def chunks(source, chunk_rows=CHUNK_ROWS, **kwargs):
+    """Yield ``source`` as DataFrames of at most ``chunk_rows`` rows.
+
+    ``kwargs`` are passed to ``to_frame``. A labelled index (anything but the
+    default RangeIndex) is written as a leading column.
+    """
+    if isinstance(source, pd.DataFrame):
+        parts = (source.iloc[start:start + chunk_rows] for start in range(0, len(source), chunk_rows))
+    elif hasattr(source, "to_frame") and hasattr(source, "__len__"):
+        parts = (source.to_frame(start, min(start + chunk_rows, len(source)), **kwargs)
+                 for start in range(0, len(source), chunk_rows))
+    else:
+        parts = iter(source)
+    for frame in parts:
+        if not isinstance(frame.index, pd.RangeIndex):
+            frame = frame.reset_index()
+        yield frame
+
+
+def write_csv(frames, target):
+    text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+    header = True
+    for frame in frames:
+        frame.to_csv(text, header=header, index=False)
+        header = False
+    text.flush()
+    text.detach()
+
+
+def write_parquet(frames, target):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                writer = pq.ParquetWriter(target, table.schema)
+            else:
+                table = pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# --- Excel ------------------------------------------------------------------------
+
+WORKSHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                   '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+WORKSHEET_END = "</sheetData></worksheet>"
+
+
+def text_cells(values):
+    values = pd.Series(values, dtype=object).fillna("").astype(str)
+    values = (values.str.replace("&", "&amp;", regex=False).str.replace("<", "&lt;", regex=False)
+              .str.replace(">", "&gt;", regex=False).str.replace(ILLEGAL_XML, "", regex=True))
+    return '<c t="inlineStr"><is><t xml:space="preserve">' + values + "</t></is></c>"
+
+
+def column_cells(column):
+    """One ``<c>`` per row of a column; missing values become empty cells."""
+    values = column.to_numpy()
+    missing = np.array(pd.isna(column), dtype=bool)
+    if column.dtype == bool:
+        cells = pd.Series(np.where(values, '<c t="b"><v>1</v></c>', '<c t="b"><v>0</v></c>'), dtype=object)
+    elif pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_complex_dtype(column.dtype):
+        numbers = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        missing |= ~np.isfinite(numbers)
+        text = column.astype(str) if pd.api.types.is_integer_dtype(column.dtype) else pd.Series(numbers.astype(str))
+        cells = "<c><v>" + pd.Series(text.to_numpy(), dtype=object) + "</v></c>"
+    elif pd.api.types.is_datetime64_any_dtype(column.dtype):
+        cells = text_cells(column.dt.strftime("%Y-%m-%d").to_numpy())
+    else:
+        cells = text_cells(values)
+    cells = np.array(cells, dtype=object)
+    cells[missing] = ""
+    return cells
+
+
+def sheet_rows(frame):
+    rows = pd.Series("<row>", index=range(len(frame)), dtype=object)
+    for name in frame.columns:
+        rows = rows + column_cells(frame[name])
+    return "".join(rows + "</row>")
+
+
+def header_row(columns):
+    return "<row>" + "".join(text_cells([str(name) for name in columns])) + "</row>"
+
+
+def open_sheet(archive, number, header):
+    sheet = archive.open(f"xl/worksheets/sheet{number}.xml", "w", force_zip64=True)
+    sheet.write((WORKSHEET_START + header).encode())
+    return sheet
+
+
+def close_sheet(sheet):
+    sheet.write(WORKSHEET_END.encode())
+    sheet.close()
+
+
+def write_xlsx(frames, target):
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+        sheets, sheet, rows_left, header = 0, None, 0, ""
+        try:
+            for frame in frames:
+                header = header or header_row(frame.columns)
+                for start in range(0, len(frame), CHUNK_ROWS):
+                    part = frame.iloc[start:start + CHUNK_ROWS]
+                    while len(part):
+                        if rows_left == 0:
+                            if sheet is not None:
+                                close_sheet(sheet)
+                            sheets += 1
+                            sheet, rows_left = open_sheet(archive, sheets, header), EXCEL_MAX_ROWS - 1
+                        sheet.write(sheet_rows(part.iloc[:rows_left]).encode())
+                        written = min(len(part), rows_left)
+                        rows_left -= written
+                        part = part.iloc[written:]
+        except BaseException:
+            if sheet is not None:
+                sheet.close()  # let the archive close so the original error surfaces
+            raise
+        if sheet is None:  # no rows: one sheet with just the header
+            sheets, sheet = 1, open_sheet(archive, 1, header)
+        close_sheet(sheet)
+        write_workbook(archive, sheets)
+
+
+def write_workbook(archive, sheets):
+    numbers = range(1, sheets + 1)
+    archive.writestr("[Content_Types].xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        + "".join(f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                  'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                  for n in numbers)
+        + "</Types>"))
+    archive.writestr("_rels/.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        "</Relationships>"))
+    archive.writestr("xl/workbook.xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+        + "".join(f'<sheet name="Sheet{n}" sheetId="{n}" r:id="rId{n}"/>' for n in numbers)
+        + "</sheets></workbook>"))
+    archive.writestr("xl/_rels/workbook.xml.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + "".join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                  'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+                  for n in numbers)
+        + "</Relationships>"))
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def export(source, target, file_format, chunk_rows=CHUNK_ROWS, **kwargs):
+    """Write ``source`` to ``target`` (a path or binary file) as csv, parquet or xlsx."""
+    writer = WRITERS[file_format]
+    if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+        with open(target, "wb") as output:
+            writer(chunks(source, chunk_rows, **kwargs), output)
+    else:
+        writer(chunks(source, chunk_rows, **kwargs), target)
+
+
+def export_bytes(source, file_format, chunk_rows=CHUNK_ROWS, **kwargs):
+    """The exported file's bytes, built through a temporary file that spills to disk."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+        export(source, spool, file_format, chunk_rows, **kwargs)
+        spool.seek(0)
+        return spool.read()
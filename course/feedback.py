@@ -0,0 +1,138 @@
+import uuid
+
+import streamlit as st
+import pandas as pd
+
+from course.catalog import course_catalog
+from course.grading import cohort_report, grade
+from course.grid import paginated_dataframe
+from course.instrumentation import is_admin, show
+from course.progress import ProgressStore
+from course.reference import reference_frame
+
+# --- Journal Entry Feedback ---
+# Page-side wrappers around course.grading: line-by-line results for one
+# learner's submitted entry, and an upload form that grades a whole cohort.
+# Answer keys live in each module's content file under ``answer_key``.
+#
+# Quiz submissions (the quiz blocks of course.catalog) are saved through
+# course.progress. A learner is identified by the ``learner`` query parameter,
+# which is added to the URL on first visit so bookmarking the page keeps the
+# same history.
+#
+# The cohort panels show every learner's results (and free-text answers), so
+# they render only for instructors: the admin query parameter must match
+# COURSE_ADMIN_TOKEN (see instrumentation.is_admin).
+
+GRADED_SECTIONS = ("module1", "module2")
+
+
+def answer_key(section=None):
+    if section is not None:
+        return reference_frame(section, "answer_key")
+    return pd.concat([reference_frame(name, "answer_key") for name in GRADED_SECTIONS], ignore_index=True)
+
+
+def entry_feedback(edited_df, section, exercise):
+    """Grade one submitted journal entry and show the result of each line."""
+    key = answer_key(section)
+    try:
+        grades = grade(edited_df.assign(Exercise=exercise), key[key["Exercise"] == exercise])
+    except ValueError as error:
+        st.error(f"Could not grade this entry: {error}")
+        return
+    result = grades.result()
+    show("dataframe", grades.feedback, hide_index=True, width="stretch")
+    if result["passed"]:
+        st.success("Correct! Every line matches and debits equal credits.")
+        return
+    problems = [f"{result['correct']} of {result['key_lines']} lines correct."]
+    if not result["balanced"]:
+        problems.append(f"Debits (${result['debit_cents'] / 100:,.2f}) do not equal "
+                        f"credits (${result['credit_cents'] / 100:,.2f}).")
+    if result["missing"]:
+        problems.append(f"{result['missing']} expected line(s) are missing.")
+    st.warning(" ".join(problems))
+
+
+@st.fragment
+def cohort_grading():
+    if not is_admin():
+        return
+    st.markdown("#### Instructor: Grade a Cohort")
+    st.markdown("""
+    Upload every learner's journal entries as one CSV with columns `Submission` (learner id), `Exercise`,
+    `Account`, `Entry Type` and `Amount ($)`. Exercises: `pipe_invoice`, `pipe_payment`, `tax_accrual`,
+    `tax_payment` and `depreciation`.
+    """)
+    upload = st.file_uploader("Cohort Submissions (CSV)", type="csv", key="cohort_submissions_file")
+    if upload is None:
+        return
+    # Graded once per upload; paging through the report reuses the result.
+    cached = st.session_state.get("cohort_grades")
+    if cached is None or cached[0] != upload.file_id:
+        try:
+            grades = grade(pd.read_csv(upload, dtype=str, keep_default_na=False), answer_key())
+        except (KeyError, ValueError) as error:
+            st.error(f"Could not grade the uploaded submissions: {error}")
+            return
+        report = cohort_report(grades)
+        st.session_state["cohort_grades"] = (upload.file_id, grades, report)
+    else:
+        _, grades, report = cached
+
+    passed = int(grades.summary["passed"].sum())
+    st.write(f"**{report.shape[0]:,} learners, {len(grades.summary):,} entries graded, {passed:,} passed.**")
+    paginated_dataframe(report, key="cohort_report")
+    st.download_button("Download Report (CSV)", report.to_csv(index=False), file_name="cohort_report.csv",
+                       mime="text/csv", key="cohort_report_download")
+
+
+# One store (and one writer thread) per process, shared by every session.
+@st.cache_resource(show_spinner=False)
+def progress_store():
+    return ProgressStore()
+
+
+def learner_id():
+    learner = st.query_params.get("learner")
+    if not learner:
+        learner = st.session_state.setdefault("learner_id", uuid.uuid4().hex[:12])
+        st.query_params["learner"] = learner
+    return learner
+
+
+def record_progress(section, answers):
+    """Queue a submission for saving; returns immediately.
+
+    A write of an earlier submission that failed is reported here as a warning.
+    """
+    try:
+        return progress_store().submit(learner_id(), section, answers)
+    except Exception as error:
+        st.warning(f"Some submissions could not be saved: {error}")
+
+
+@st.fragment
+def cohort_progress():
+    if not is_admin():
+        return
+    st.markdown("#### Instructor: Cohort Quiz Results")
+    store = progress_store()
+    # Every catalog quiz saves its results, labelled with the quiz title.
+    sections = course_catalog().sections()
+    section = st.selectbox("Quiz", options=list(sections), format_func=sections.get, key="cohort_progress_section")
+    scores = store.score_distribution(section)
+    if scores.empty:
+        responses = store.responses(section)
+        if responses.empty:
+            st.info("No submissions saved yet.")
+        else:
+            show("dataframe", lambda: responses, hide_index=True)
+        return
+    st.write(f"**{int(scores['Attempts'].sum()):,} attempts saved.**")
+    st.bar_chart(scores.assign(Score=scores["Score"].astype(str) + "/" + scores["Out Of"].astype(str)),
+                 x="Score", y="Attempts")
+    show("dataframe", lambda: store.question_error_rates(section), hide_index=True)
+    if store.error is not None:
+        st.warning(f"Some submissions could not be saved: {store.error}")
@@ -0,0 +1,219 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from course.jobs import report
+
+# --- Budget Forecasting ---
+# Monte Carlo forecast of rental income, expenses and net income for one or
+# many properties. Each property has a monthly rent and expense budget, an
+# annual rent growth rate, an annual expense inflation rate and a base vacancy
+# rate. Each scenario adds market-wide randomness: a random walk in market
+# rents, in vacancy and in expense inflation, plus a one-off level shock per
+# property.
+#
+# Income is computed in batches of properties as float32 arrays shaped
+# (properties x scenarios x months) and summed into portfolio totals as each
+# batch completes, so memory stays at one batch no matter how large the
+# portfolio is. Expenses do not depend on property-level randomness, so they
+# reduce to (scenarios x months) matrix products.
+#
+# The stages are memoized by a hash of their inputs: the random draws, the
+# income totals and the expense totals are cached separately. Changing an
+# expense input only recomputes expenses, and changing the percentiles
+# recomputes nothing.
+#
+# Progress is reported after each batch of properties, so a large forecast can
+# run as a background job (see course.jobs) and be cancelled between batches.
+
+MONTHS_PER_YEAR = 12
+DEFAULT_PERCENTILES = (5, 50, 95)
+BATCH_ELEMENTS = 2 ** 24  # float32 elements per (batch x scenarios x months) block
+
+# Monthly multipliers applied to rental income, January first. Each averages 1.
+SEASONALITY = {
+    "None": (1.0,) * 12,
+    "Summer Peak": (0.90, 0.90, 0.95, 1.00, 1.05, 1.10, 1.15, 1.15, 1.05, 0.95, 0.90, 0.90),
+    "Winter Peak": (1.10, 1.10, 1.05, 1.00, 0.95, 0.90, 0.85, 0.85, 0.95, 1.05, 1.10, 1.10),
+}
+
+
+def input_hash(*values):
+    digest = hashlib.sha256()
+    for value in values:
+        if isinstance(value, (str, bytes)) or value is None:
+            digest.update(repr(value).encode())
+            continue
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def memoized(max_entries=8):
+    """Cache a function's results by a hash of its arguments (arrays included)."""
+    def decorator(fn):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        def wrapper(*args):
+            key = input_hash(*args)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            result = fn(*args)
+            with lock:
+                cache[key] = result
+                while len(cache) > max_entries:
+                    cache.popitem(last=False)
+            return result
+
+        wrapper.cache = cache
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorator
+
+
+class Forecast:
+    """Percentile bands per month for rental income, expenses and net income.
+
+    Each band array is shaped (len(percentiles), months); ``mean`` holds the
+    scenario means in the same layout without the leading axis.
+    """
+
+    def __init__(self, percentiles, income, expenses, net, mean):
+        self.percentiles = tuple(percentiles)
+        self.income = income
+        self.expenses = expenses
+        self.net = net
+        self.mean = mean
+
+    def band(self, series, percentile):
+        return getattr(self, series)[self.percentiles.index(percentile)]
+
+    def to_frame(self):
+        import pandas as pd
+
+        months = [f"Month {i}" for i in range(1, self.net.shape[1] + 1)]
+        columns = {}
+        for label, series in (("Rental Income", "income"), ("Total Expenses", "expenses"), ("Net Income", "net")):
+            for i, percentile in enumerate(self.percentiles):
+                columns[f"{label} (P{percentile:g})"] = getattr(self, series)[i]
+        return pd.DataFrame(columns, index=months)
+
+
+@memoized()
+def market_draws(properties, scenarios, months, seed, rent_volatility, vacancy_volatility,
+                 inflation_volatility, property_volatility):
+    """Random paths shared by every stage, as float32.
+
+    Returns market rent index (S, M), vacancy shift (S, M), expense inflation
+    index (S, M) and per-property level shock (P, S).
+    """
+    rng = np.random.default_rng(seed)
+    monthly = 1 / np.sqrt(MONTHS_PER_YEAR)
+    rent_steps = rng.standard_normal((scenarios, months), dtype=np.float32) * np.float32(rent_volatility * monthly)
+    vacancy_steps = rng.standard_normal((scenarios, months), dtype=np.float32) * np.float32(vacancy_volatility * monthly)
+    inflation_steps = rng.standard_normal((scenarios, months), dtype=np.float32) * np.float32(inflation_volatility * monthly)
+    level = rng.standard_normal((properties, scenarios), dtype=np.float32) * np.float32(property_volatility)
+    return (
+        np.exp(np.cumsum(rent_steps, axis=1)),
+        np.cumsum(vacancy_steps, axis=1),
+        np.exp(np.cumsum(inflation_steps, axis=1)),
+        np.exp(level),
+    )
+
+
+def trend(rate, months):
+    """(P, M) compounding of annual ``rate`` month by month, starting at 1."""
+    t = np.arange(months, dtype=np.float64) / MONTHS_PER_YEAR
+    return np.power(1 + np.asarray(rate, dtype=np.float64)[:, None], t[None, :])
+
+
+@memoized()
+def income_totals(rent, rent_growth, vacancy, seasonality, draw_args):
+    """Portfolio rental income after vacancy, (S, M), batched over properties."""
+    market, vacancy_shift, _, level = market_draws(*draw_args)
+    properties = len(rent)
+    scenarios, months = market.shape
+    base = (rent[:, None] * trend(rent_growth, months) * seasonality[None, :]).astype(np.float32)  # (P, M)
+    vacancy = vacancy.astype(np.float32)
+    batch = min(properties, max(1, BATCH_ELEMENTS // (scenarios * months)))
+    block = np.empty((batch, scenarios, months), dtype=np.float32)
+    total = np.zeros((scenarios, months), dtype=np.float64)
+    for start in range(0, properties, batch):
+        report(0.1 + 0.8 * start / properties, "Forecasting rental income")
+        stop = min(start + batch, properties)
+        occupied = block[:stop - start]
+        # occupied = (1 - clip(vacancy + shift, 0, 1)) * base, in place in one buffer
+        np.add(vacancy[start:stop, None, None], vacancy_shift[None], out=occupied)
+        np.maximum(occupied, 0, out=occupied)
+        np.minimum(occupied, 1, out=occupied)
+        np.subtract(1, occupied, out=occupied)
+        np.multiply(occupied, base[start:stop, None, :], out=occupied)
+        # Sum over the batch weighted by each property's level shock: one
+        # (1 x batch) @ (batch x M) product per scenario.
+        weights = np.ascontiguousarray(level[start:stop].T)[:, None, :]  # (S, 1, batch)
+        total += np.matmul(weights, occupied.transpose(1, 0, 2))[:, 0, :]
+    return total * market
+
+
+@memoized()
+def expense_totals(expenses, expense_inflation, months, draw_args):
+    """Portfolio expenses, (S, M): inflation randomness is market-wide only."""
+    inflation_index = market_draws(*draw_args)[2]
+    budget = expenses @ trend(expense_inflation, months)  # (M,)
+    return inflation_index * budget[None, :]
+
+
+def per_property(value, properties, name):
+    array = np.broadcast_to(np.asarray(value, dtype=np.float64), (properties,))
+    if not np.isfinite(array).all():
+        raise ValueError(f"{name} must be a finite number.")
+    return np.ascontiguousarray(array)
+
+
+def forecast(rent, expenses, rent_growth=0.0, expense_inflation=0.0, vacancy=0.0,
+             seasonality="None", start_month=1, months=12, scenarios=1000, seed=0,
+             rent_volatility=0.0, vacancy_volatility=0.0, inflation_volatility=0.0,
+             property_volatility=0.0, percentiles=DEFAULT_PERCENTILES):
+    """Forecast a portfolio; per-property arguments may be scalars or arrays.
+
+    Rates and volatilities are annual fractions (0.03 = 3%). ``seasonality`` is
+    a SEASONALITY name or 12 monthly factors; ``start_month`` is the calendar
+    month (1-12) of the first forecast month.
+    """
+    rent = np.atleast_1d(np.asarray(rent, dtype=np.float64))
+    properties = len(rent)
+    expenses = per_property(expenses, properties, "Expenses")
+    rent_growth = per_property(rent_growth, properties, "Rent growth")
+    expense_inflation = per_property(expense_inflation, properties, "Expense inflation")
+    vacancy = per_property(vacancy, properties, "Vacancy")
+    if months < 1 or scenarios < 1:
+        raise ValueError("Months and scenarios must be at least 1.")
+    factors = np.asarray(SEASONALITY[seasonality] if isinstance(seasonality, str) else seasonality, dtype=np.float64)
+    if factors.shape != (MONTHS_PER_YEAR,):
+        raise ValueError("Seasonality needs one factor per calendar month.")
+    calendar = (np.arange(months) + start_month - 1) % MONTHS_PER_YEAR
+
+    draw_args = (properties, scenarios, months, seed, rent_volatility, vacancy_volatility,
+                 inflation_volatility, property_volatility)
+    # Stages take the draw parameters rather than the drawn arrays, so their
+    # cache keys stay cheap to hash.
+    report(0.0, "Drawing market scenarios")
+    income = income_totals(rent, rent_growth, vacancy, factors[calendar], draw_args)
+    report(0.9, "Forecasting expenses")
+    expense = expense_totals(expenses, expense_inflation, months, draw_args)
+    net = income - expense
+
+    q = list(percentiles)
+    return Forecast(
+        percentiles,
+        income=np.percentile(income, q, axis=0),
+        expenses=np.percentile(expense, q, axis=0),
+        net=np.percentile(net, q, axis=0),
+        mean={"income": income.mean(axis=0), "expenses": expense.mean(axis=0), "net": net.mean(axis=0)},
+    )
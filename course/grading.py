@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+from course.journal import ENTRY_TYPES, to_cents
+
+# --- Journal Entry Grading ---
+# Grades journal-entry exercises against an answer key: one learner's
+# submission from the page editor, or a whole cohort from one file, in the
+# same vectorized pass. A submission is the lines a learner entered for an
+# exercise (Account, Entry Type, Amount); the answer key lists the expected
+# lines per exercise.
+#
+# Lines are matched to the key by account and entry type, not by position, so
+# entering the credit first is fine. Every line gets a status:
+#
+#   Correct                   account, entry type and amount (within tolerance)
+#   Amount outside tolerance  right account and entry type, wrong amount
+#   Wrong entry type          the account is in the key on the other side
+#   Account not in answer     the account is not part of this entry at all
+#   Duplicate line            a second line for an already-matched key line
+#   Blank line                no account chosen
+#
+# and every (submission, exercise) gets a summary: debit and credit totals,
+# whether they balance, correct and missing key lines, score, and pass/fail.
+
+DEFAULT_TOLERANCE_CENTS = 1
+STATUSES = (
+    "Correct",
+    "Amount outside tolerance",
+    "Wrong entry type",
+    "Account not in answer",
+    "Duplicate line",
+    "Blank line",
+)
+# Accepted spellings of each column in uploaded files.
+COLUMNS = {
+    "submission": "submission",
+    "learner": "submission",
+    "exercise": "exercise",
+    "account": "account",
+    "entry type": "entry_type",
+    "entry_type": "entry_type",
+    "amount ($)": "amount",
+    "amount": "amount",
+}
+
+
+def normalize(frame):
+    """Lines as ``submission``, ``exercise``, ``line``, ``account``, ``entry_type``
+    (index into ENTRY_TYPES, -1 if blank) and ``cents``."""
+    frame = frame.rename(columns=lambda column: COLUMNS.get(str(column).strip().lower(), column))
+    missing = {"exercise", "account", "entry_type", "amount"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"Submissions are missing column(s): {', '.join(sorted(missing))}.")
+    submission = frame["submission"].astype(str) if "submission" in frame else pd.Series("", index=frame.index)
+    entry_type = frame["entry_type"].fillna("").astype(str).str.strip().str.title()
+    codes = entry_type.map({name: code for code, name in enumerate(ENTRY_TYPES)})
+    bad = entry_type[codes.isna() & (entry_type != "")]
+    if len(bad):
+        raise ValueError(f"Entry Type must be one of {', '.join(ENTRY_TYPES)}, not {bad.iloc[0]!r}.")
+    # Blank amounts are unfinished editor rows and grade as zero; anything else
+    # that is not a number is reported rather than graded as $0.
+    amount = pd.to_numeric(frame["amount"], errors="coerce")
+    blank = frame["amount"].isna() | (frame["amount"].astype(str).str.strip() == "")
+    bad = frame["amount"][amount.isna() & ~blank]
+    if len(bad):
+        raise ValueError(f"Could not read amount {bad.iloc[0]!r}.")
+    amount = amount.fillna(0)
+    lines = pd.DataFrame({
+        "submission": submission.to_numpy(),
+        "exercise": frame["exercise"].astype(str).to_numpy(),
+        "account": frame["account"].fillna("").astype(str).str.strip().to_numpy(),
+        "entry_type": codes.fillna(-1).to_numpy(dtype=np.int8),
+        "cents": to_cents(amount),
+    })
+    lines.insert(2, "line", lines.groupby(["submission", "exercise"]).cumcount().to_numpy() + 1)
+    return lines
+
+
+class Grades:
+    """Per-line diagnostics (``lines``) and per-submission results (``summary``)."""
+
+    def __init__(self, lines, summary):
+        self.lines = lines
+        self.summary = summary
+
+    def feedback(self, submission="", exercise=None):
+        """Line diagnostics for one submission, ready for display."""
+        lines = self.lines[self.lines["submission"] == submission]
+        if exercise is not None:
+            lines = lines[lines["exercise"] == exercise]
+        return pd.DataFrame({
+            "Line": lines["line"].to_numpy(),
+            "Account": lines["account"].to_numpy(),
+            "Entry Type": [ENTRY_TYPES[code] if code >= 0 else "" for code in lines["entry_type"]],
+            "Amount ($)": lines["cents"].to_numpy() / 100,
+            "Result": lines["status"].to_numpy(),
+            "Detail": lines["detail"].to_numpy(),
+        })
+
+    def result(self, submission="", exercise=None):
+        summary = self.summary[self.summary["submission"] == submission]
+        if exercise is not None:
+            summary = summary[summary["exercise"] == exercise]
+        return summary.iloc[0]
+
+
+def grade(submissions, answer_key, tolerance_cents=DEFAULT_TOLERANCE_CENTS):
+    """Grade every submission in one pass.
+
+    ``submissions`` has Exercise, Account, Entry Type and Amount ($) columns
+    and, for a cohort, a Submission (or Learner) column; ``answer_key`` has
+    the same columns without the submission.
+    """
+    lines = normalize(submissions)
+    key = normalize(answer_key)[["exercise", "account", "entry_type", "cents"]]
+    key = key.rename(columns={"cents": "expected"}).assign(key_line=np.arange(len(key)))
+    if key.duplicated(["exercise", "account", "entry_type"]).any():
+        raise ValueError("The answer key lists the same account and entry type twice in one exercise.")
+    unknown = np.setdiff1d(lines["exercise"].unique(), key["exercise"].unique())
+    if len(unknown):
+        raise ValueError(f"No answer key for exercise {unknown[0]!r}.")
+
+    lines = lines.merge(key, on=["exercise", "account", "entry_type"], how="left")
+    matched = lines["key_line"].notna()
+    repeat = lines[matched].groupby(["submission", "key_line"]).cumcount().reindex(lines.index, fill_value=0) > 0
+    # The side each key account belongs on, for lines that used the wrong one.
+    key_side = key.drop_duplicates(["exercise", "account"])[["exercise", "account", "entry_type"]]
+    key_side = lines[["exercise", "account"]].merge(key_side, how="left")["entry_type"]
+    account_in_key = key_side.notna().to_numpy()
+    difference = (lines["cents"] - lines["expected"].fillna(0)).abs()
+
+    blank = lines["account"] == ""
+    status = np.select(
+        [blank, ~matched & account_in_key, ~matched, repeat, difference > tolerance_cents],
+        [5, 2, 3, 4, 1],
+        default=0,
+    )
+    lines["status"] = pd.Categorical.from_codes(status, STATUSES)
+    detail = np.full(len(lines), "", dtype=object)
+    off = status == 1
+    detail[off] = [f"Expected ${expected / 100:,.2f}" for expected in lines["expected"][off]]
+    other_side = status == 2
+    detail[other_side] = [f"Should be a {ENTRY_TYPES[int(code)]}" for code in key_side[other_side]]
+    lines["detail"] = detail
+    lines = lines.drop(columns=["key_line", "expected"])
+
+    return Grades(lines, summarize(lines, key))
+
+
+def summarize(lines, key):
+    by = ["submission", "exercise"]
+    debit = np.where(lines["entry_type"] == 0, lines["cents"], 0)
+    credit = np.where(lines["entry_type"] == 1, lines["cents"], 0)
+    status = lines["status"].cat.codes
+    summary = lines.assign(
+        debit=debit,
+        credit=credit,
+        correct=status == 0,
+        wrong=(status > 0) & (status < 5),
+    ).groupby(by, as_index=False, sort=False).agg(
+        debit_cents=("debit", "sum"),
+        credit_cents=("credit", "sum"),
+        correct=("correct", "sum"),
+        wrong=("wrong", "sum"),
+    )
+    # A key line is found when some line has its account and entry type,
+    # whatever the amount; the rest are missing.
+    found = lines[status.isin([0, 1]).to_numpy()].groupby(by).size().rename("found").reset_index()
+    summary = summary.merge(found, on=by, how="left")
+    summary["key_lines"] = summary["exercise"].map(key.groupby("exercise").size()).to_numpy()
+    summary["missing"] = summary["key_lines"] - summary.pop("found").fillna(0).astype(int)
+    summary["balanced"] = summary["debit_cents"] == summary["credit_cents"]
+    summary["score"] = summary["correct"] / summary["key_lines"]
+    summary["passed"] = summary["balanced"] & (summary["correct"] == summary["key_lines"]) & (summary["wrong"] == 0)
+    return summary
+
+
+def cohort_report(grades):
+    """Per-submission results with exercise scores side by side."""
+    summary = grades.summary
+    scores = summary.pivot(index="submission", columns="exercise", values="score")
+    report = pd.DataFrame({
+        "Exercises Passed": summary.groupby("submission")["passed"].sum(),
+        "Unbalanced Entries": (~summary["balanced"]).groupby(summary["submission"]).sum(),
+    }).join((scores * 100).round(1).add_suffix(" (%)"))
+    return report.rename_axis("Submission").reset_index()
@@ -0,0 +1,48 @@
+import functools
+
+import streamlit as st
+
+from course.instrumentation import show
+
+
+# --- Paginated Grid ---
+# st.table renders every row as static HTML, which does not scale past a few
+# hundred lines. This shows one page at a time in st.dataframe (a virtualized
+# grid), and only the visible page is ever decoded and sent to the browser.
+
+def paginated_dataframe(data, key, page_size=50, **kwargs):
+    """Show ``data`` one page at a time.
+
+    ``data`` is a DataFrame, or any object with ``__len__`` and a
+    ``to_frame(start, stop, **kwargs)`` method such as a recurring Schedule.
+    """
+    total = len(data)
+    pages = max(1, -(-total // page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    show("dataframe", lambda: data.iloc[start:stop] if hasattr(data, "iloc") else data.to_frame(start, stop, **kwargs),
+         hide_index=True, width="stretch")
+    st.caption(f"Rows {start + 1 if total else 0}–{stop} of {total:,}")
+
+
+def download_buttons(data, key, file_name, **kwargs):
+    """CSV, Parquet and Excel downloads of ``data`` (anything paginated_dataframe takes).
+
+    Nothing is written until a button is clicked; the file is then built
+    chunk by chunk by course.export rather than from one full DataFrame.
+    """
+    from course.export import FORMATS, export_bytes
+
+    columns = st.columns(len(FORMATS))
+    for column, (label, (extension, mime)) in zip(columns, FORMATS.items()):
+        column.download_button(
+            f"Download {label}",
+            data=functools.partial(export_bytes, data, extension, **kwargs),
+            file_name=f"{file_name}.{extension}",
+            mime=mime,
+            on_click="ignore",
+            key=f"{key}_{extension}",
+        )
@@ -0,0 +1,346 @@
+import contextlib
+import functools
+import hmac
+import http.server
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- Render Profiling ---
+# Opt-in instrumentation for finding slow pages and rerun storms in a running
+# deployment. Nothing here runs unless one of these is set:
+#
+#   COURSE_METRICS=1            collect metrics in memory (debug panel only)
+#   COURSE_METRICS_FILE=path    also rewrite a Prometheus text file after reruns
+#   COURSE_METRICS_PORT=9464    also serve /metrics on 127.0.0.1:<port>
+#
+# Collected per process. Labels are the page, the exercise (fragment), the
+# element and the widget key, all fixed by the compiled catalog; no label
+# names a learner or session:
+#
+#   course_page_render_seconds        each page render (full reruns only)
+#   course_fragment_render_seconds    each exercise render, in full reruns and
+#                                     in the exercise's own fragment reruns
+#   course_dataframe_seconds          building each DataFrame shown with ``show``
+#   course_element_render_seconds     each st.table / st.dataframe call made by ``show``
+#   course_reruns_total               full reruns per page
+#   course_widget_reruns_total        full reruns in which a widget's value changed, per widget key
+#   course_session_state_bytes        size of session_state, measured only while
+#                                     the memory report (?report=memory) is open
+#
+# Timings and sizes are summaries (count, sum and max). Nothing is patched:
+# main.py renders the page through ``profiled_render``, the catalog's exercise
+# blocks go through ``profiled_fragment`` and tables are shown with ``show``.
+#
+# Reruns and widget changes per session are kept in process memory (the last
+# MAX_SESSIONS sessions) for the debug panel only, so a rerun storm can be
+# traced to a learner without a label per learner.
+#
+# The sidebar debug panel is shown when COURSE_ADMIN_TOKEN is set and the app
+# is opened with ?admin=<token>.
+
+FILE_INTERVAL = 1.0  # seconds between metric file rewrites
+MAX_SESSIONS = 1000  # sessions whose rerun counts the debug panel keeps
+
+
+def enabled():
+    return any(os.environ.get(name) for name in ("COURSE_METRICS", "COURSE_METRICS_FILE", "COURSE_METRICS_PORT"))
+
+
+class Metrics:
+    """Thread-safe counters, gauges and timing summaries keyed by labels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> count
+        self.gauges = {}  # (name, labels) -> value
+        self.summaries = {}  # (name, labels) -> [count, sum, max]
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[name, tuple(sorted(labels.items()))] = value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            summary = self.summaries.setdefault(key, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += seconds
+            summary[2] = max(summary[2], seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def rows(self, kind):
+        """Snapshot of one kind ("counters", "gauges" or "summaries") as (name, labels, value)."""
+        with self.lock:
+            items = list(getattr(self, kind).items())
+        return [(name, dict(labels), value) for (name, labels), value in items]
+
+    def to_prometheus(self):
+        lines = []
+        typed = set()
+
+        def sample(name, labels, value, kind, family=None):
+            family = family or name
+            if family not in typed:
+                typed.add(family)
+                lines.append(f"# TYPE {family} {kind}")
+            text = ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+            lines.append(f"{name}{{{text}}} {value}" if text else f"{name} {value}")
+
+        for name, labels, value in sorted(self.rows("counters"), key=sort_key):
+            sample(name, labels, value, "counter")
+        for name, labels, value in sorted(self.rows("gauges"), key=sort_key):
+            sample(name, labels, value, "gauge")
+        for name, labels, (count, total, peak) in sorted(self.rows("summaries"), key=sort_key):
+            sample(f"{name}_count", labels, count, "summary", name)
+            sample(f"{name}_sum", labels, f"{total:.6f}", "summary", name)
+        for name, labels, (_, _, peak) in sorted(self.rows("summaries"), key=sort_key):
+            sample(f"{name}_max", labels, f"{peak:.6f}", "gauge")
+        return "\n".join(lines) + "\n"
+
+
+def sort_key(row):
+    return row[0], sorted(row[1].items())
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Sessions:
+    """Reruns and changed widgets per session, for the debug panel; the least recently seen are dropped."""
+
+    def __init__(self, limit=MAX_SESSIONS):
+        self.lock = threading.Lock()
+        self.limit = limit
+        self.sessions = OrderedDict()  # session id -> {"learner", "reruns", "widgets", "bytes"}
+
+    def entry(self, session, learner):
+        entry = self.sessions.get(session)
+        if entry is None:
+            entry = self.sessions[session] = {"learner": learner, "reruns": 0, "widgets": Counter(), "bytes": None}
+            while len(self.sessions) > self.limit:
+                self.sessions.popitem(last=False)
+        self.sessions.move_to_end(session)
+        entry["learner"] = learner or entry["learner"]
+        return entry
+
+    def rerun(self, session, learner, widgets):
+        with self.lock:
+            entry = self.entry(session, learner)
+            entry["reruns"] += 1
+            entry["widgets"].update(widgets)
+
+    def sized(self, session, learner, size):
+        with self.lock:
+            self.entry(session, learner)["bytes"] = size
+
+    def busiest(self, count=10):
+        """(session, learner, reruns, busiest widget or None, its reruns, bytes), most reruns first."""
+        with self.lock:
+            rows = [(session, entry["learner"], entry["reruns"], *(entry["widgets"].most_common(1) or [(None, 0)])[0],
+                     entry["bytes"]) for session, entry in self.sessions.items()]
+        return sorted(rows, key=lambda row: -row[2])[:count]
+
+
+def serve(metrics, port):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
+
+
+class FileSink:
+    """Rewrites a Prometheus text file at most every FILE_INTERVAL seconds."""
+
+    def __init__(self, metrics, path):
+        self.metrics = metrics
+        self.path = path
+        self.lock = threading.Lock()
+        self.written = 0.0
+
+    def maybe_write(self):
+        now = time.monotonic()
+        if now - self.written < FILE_INTERVAL or not self.lock.acquire(blocking=False):
+            return
+        try:
+            self.written = now
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as output:
+                output.write(self.metrics.to_prometheus())
+            os.replace(temporary, self.path)
+        finally:
+            self.lock.release()
+
+
+@st.cache_resource(show_spinner=False)
+def collector():
+    """The process-wide metrics and session counts, with endpoint and file sink set up once."""
+    metrics = Metrics()
+    port = os.environ.get("COURSE_METRICS_PORT")
+    if port:
+        serve(metrics, int(port))
+    path = os.environ.get("COURSE_METRICS_FILE")
+    return metrics, Sessions(), FileSink(metrics, path) if path else None
+
+
+# --- Per rerun ------------------------------------------------------------------
+# The page being rendered is tracked per script thread, for the labels of the
+# tables shown while it renders.
+
+current = threading.local()
+
+
+def page_label():
+    return getattr(current, "page", None) or "unknown"
+
+
+@contextlib.contextmanager
+def rendering(page):
+    previous, current.page = getattr(current, "page", None), page
+    try:
+        yield
+    finally:
+        current.page = previous
+
+
+def session():
+    """(session id, learner query parameter) of this rerun."""
+    context = get_script_run_ctx()
+    return context.session_id if context is not None else "unknown", st.query_params.get("learner", "")
+
+
+def widget_snapshot():
+    """Scalar session_state values (widget values; large objects are skipped)."""
+    snapshot = {}
+    for key, value in st.session_state.items():
+        if not isinstance(key, str) or key.startswith("_") or key == "metrics_widget_values":
+            continue
+        if isinstance(value, (bool, int, float, str, type(None))):
+            snapshot[key] = value
+    return snapshot
+
+
+def changed_widgets():
+    """Keys of the widgets whose value changed since the last rerun (button presses included)."""
+    snapshot = widget_snapshot()
+    previous = st.session_state.get("metrics_widget_values")
+    st.session_state["metrics_widget_values"] = snapshot
+    if previous is None:
+        return []
+    return [key for key, value in snapshot.items() if key in previous and previous[key] != value and value is not False]
+
+
+def profiled_render(page):
+    """Render a page, recording its timing and this rerun's counts."""
+    metrics, sessions, sink = collector()
+    metrics.increment("course_reruns_total", page=page.label)
+    with metrics.timer("course_page_render_seconds", page=page.label), rendering(page.label):
+        page.render()
+    widgets = changed_widgets()
+    for widget in widgets:
+        metrics.increment("course_widget_reruns_total", page=page.label, widget=widget)
+    sessions.rerun(*session(), widgets)
+    if sink is not None:
+        sink.maybe_write()
+
+
+@functools.lru_cache(maxsize=None)
+def profiled_fragment(render, page, fragment):
+    """``render`` timed on every call.
+
+    An st.fragment is rebuilt around its timed function, so the fragment's own reruns are timed too.
+    """
+    metrics, _, _ = collector()
+    function = getattr(render, "__wrapped__", render)
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        with metrics.timer("course_fragment_render_seconds", page=page, fragment=fragment), rendering(page):
+            return function(*args, **kwargs)
+    return st.fragment(timed) if function is not render else timed
+
+
+def show(element, build, **kwargs):
+    """Render ``build()`` with ``st.<element>`` ("table" or "dataframe").
+
+    When profiling, building the frame and rendering it are timed separately.
+    """
+    if not enabled():
+        return getattr(st, element)(build(), **kwargs)
+    metrics, _, _ = collector()
+    with metrics.timer("course_dataframe_seconds", page=page_label()):
+        data = build()
+    with metrics.timer("course_element_render_seconds", page=page_label(), element=element):
+        return getattr(st, element)(data, **kwargs)
+
+
+def record_session_size(page, size):
+    """Record this session's session_state size (measured by the memory report)."""
+    metrics, sessions, _ = collector()
+    metrics.observe("course_session_state_bytes", size, page=page)
+    sessions.sized(*session(), size)
+
+
+def is_admin():
+    token = os.environ.get("COURSE_ADMIN_TOKEN")
+    return bool(token) and hmac.compare_digest(st.query_params.get("admin", ""), token)
+
+
+def show_debug_panel():
+    metrics, sessions, _ = collector()
+    with st.sidebar.expander("Debug: Render Metrics"):
+        for name, title in (("course_page_render_seconds", "Page renders"),
+                            ("course_fragment_render_seconds", "Exercise renders"),
+                            ("course_dataframe_seconds", "DataFrame construction"),
+                            ("course_element_render_seconds", "Table / dataframe renders")):
+            rows = [(labels, summary) for metric, labels, summary in metrics.rows("summaries") if metric == name]
+            if not rows:
+                continue
+            rows.sort(key=lambda row: -row[1][1])
+            st.markdown(f"**{title}**\n\n| Labels | Count | Total ms | Max ms |\n|---|---:|---:|---:|\n" + "\n".join(
+                f"| {', '.join(map(str, labels.values()))} | {count:,} | {total * 1000:,.1f} | {peak * 1000:,.1f} |"
+                for labels, (count, total, peak) in rows[:10]))
+        storms = sorted((value, labels) for name, labels, value in metrics.rows("counters")
+                        if name == "course_widget_reruns_total")[::-1][:10]
+        if storms:
+            st.markdown("**Busiest widgets**\n\n| Page | Widget | Reruns |\n|---|---|---:|\n" + "\n".join(
+                f"| {labels['page']} | `{labels['widget']}` | {value:,} |" for value, labels in storms))
+        busiest = sessions.busiest()
+        if busiest:
+            st.markdown(
+                "**Busiest sessions**\n\n| Learner | Reruns | Top widget | Its reruns | session_state bytes |\n"
+                "|---|---:|---|---:|---:|\n" + "\n".join(
+                    f"| `{learner or session[:8]}` | {reruns:,} | `{widget or '-'}` | {count:,} | "
+                    f"{'-' if size is None else f'{size:,}'} |"
+                    for session, learner, reruns, widget, count, size in busiest))
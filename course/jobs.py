@@ -0,0 +1,224 @@
+import hashlib
+import importlib
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# --- Background Jobs ---
+# Runs heavy computations (statement matching, large forecasts, portfolio
+# schedules) in a pool of worker processes, so a long job neither blocks the
+# script thread nor holds the GIL the Streamlit server needs.
+#
+# A job is a function defined at the top level of an importable module (not
+# the app script) and its arguments. The function travels to the worker by
+# its module-qualified name and is imported there. Workers are forked from a
+# forkserver that preloads only this module, so they never import ``__main__``
+# (under ``streamlit run``, the whole app); where there is no forkserver they
+# are spawned.
+#
+# Jobs are keyed by a hash of the function name and the job's identity: by
+# default the pickled arguments, or a small value the caller passes as
+# ``identity`` (e.g. upload file ids) when the arguments are large. Submitting
+# a job whose key is already queued, running or finished returns the same Job,
+# so a rerun, a second tab or a second learner never starts the work twice.
+# Failed and cancelled jobs are started again on the next submit. The last
+# KEEP_FINISHED finished jobs are kept for reruns to pick up.
+#
+# Inside a job, ``report(fraction, message, partial)`` publishes progress on a
+# queue the parent reads on a listener thread; ``partial`` is any picklable
+# value (e.g. counts so far) for the page to show while the job runs. Calling
+# ``report`` outside a worker does nothing, so job functions also run inline.
+#
+# Cancelling a queued job removes it from the pool. A running job is asked to
+# stop through a shared flag that ``report`` checks, so cancellation takes
+# effect at the job's next progress report.
+
+KEEP_FINISHED = 16
+SLOTS = 1024  # cancel flags shared with the workers; reused round robin
+
+
+class Cancelled(Exception):
+    """Raised by ``report`` inside a job that was cancelled, and by Job.result."""
+
+
+def job_target(fn):
+    """``module:qualname`` of a job function; raises ValueError if workers could not import it."""
+    if fn.__module__ == "__main__" or "<locals>" in fn.__qualname__:
+        raise ValueError(f"{fn.__qualname__} must be defined at the top level of an importable module")
+    return f"{fn.__module__}:{fn.__qualname__}"
+
+
+def job_key(fn, identity):
+    digest = hashlib.sha256(job_target(fn).encode())
+    digest.update(pickle.dumps(identity, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+# --- Worker side ----------------------------------------------------------------
+
+class Worker:
+    updates = None  # queue of (key, fraction, message, partial) to the parent
+    cancelled = None  # shared array of cancel flags, one per slot
+    job = None  # (slot, key) of the job running in this process
+
+
+def start_worker(updates, cancelled):
+    Worker.updates = updates
+    Worker.cancelled = cancelled
+
+
+def run_job(slot, key, target, args, kwargs):
+    module, _, qualname = target.partition(":")
+    fn = importlib.import_module(module)
+    for name in qualname.split("."):
+        fn = getattr(fn, name)
+    Worker.job = (slot, key)
+    try:
+        report(0.0, "Started")
+        return fn(*args, **kwargs)
+    finally:
+        Worker.job = None
+
+
+def report(fraction, message="", partial=None):
+    """Publish a running job's progress (0 to 1); raises Cancelled if it was cancelled."""
+    if Worker.job is None:
+        return
+    slot, key = Worker.job
+    if Worker.cancelled[slot]:
+        raise Cancelled(key)
+    Worker.updates.put((key, min(max(float(fraction), 0.0), 1.0), message, partial))
+
+
+# --- Parent side ----------------------------------------------------------------
+
+class Job:
+    """One submitted computation: its progress, latest partial result and outcome."""
+
+    def __init__(self, key, label, future, slot, runner):
+        self.key = key
+        self.label = label
+        self.future = future
+        self.slot = slot
+        self.runner = runner
+        self.submitted = time.time()
+        self.progress = 0.0
+        self.message = "Queued"
+        self.partial = None
+        self.cancel_requested = False
+
+    def done(self):
+        return self.future.done()
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "cancelling" if self.cancel_requested else "running" if self.future.running() else "queued"
+        if self.future.cancelled():
+            return "cancelled"
+        error = self.future.exception()
+        if error is None:
+            return "finished"
+        return "cancelled" if isinstance(error, Cancelled) else "failed"
+
+    def result(self, timeout=None):
+        """The job's return value; re-raises its error, or Cancelled."""
+        try:
+            return self.future.result(timeout)
+        except CancelledError:
+            raise Cancelled(self.key) from None
+
+    def cancel(self):
+        self.cancel_requested = True
+        if not self.future.cancel():
+            self.runner.cancelled[self.slot] = 1
+
+
+class JobRunner:
+    """A process pool with deduplicated submissions and progress reporting."""
+
+    def __init__(self, workers=None):
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload([__name__])
+        else:
+            self.context = multiprocessing.get_context("spawn")
+        self.workers = workers or os.cpu_count() or 1
+        self.updates = self.context.SimpleQueue()
+        self.cancelled = self.context.Array("b", SLOTS, lock=False)
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()  # key -> Job, oldest first
+        self.submissions = 0
+        self.pool = self.new_pool()
+        self.listener = threading.Thread(target=self.listen, name="job-progress", daemon=True)
+        self.listener.start()
+
+    def new_pool(self):
+        return ProcessPoolExecutor(self.workers, mp_context=self.context, initializer=start_worker,
+                                   initargs=(self.updates, self.cancelled))
+
+    def submit(self, fn, *args, label=None, identity=None, **kwargs):
+        """Start ``fn(*args, **kwargs)`` in a worker, or return the identical job already known.
+
+        ``identity`` stands in for the arguments in the job's key; pass it when they are large.
+        """
+        target = job_target(fn)
+        key = job_key(fn, (args, sorted(kwargs.items())) if identity is None else identity)
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and job.status not in ("failed", "cancelled"):
+                self.jobs.move_to_end(key)
+                return job
+            slot = self.submissions % SLOTS
+            self.submissions += 1
+            self.cancelled[slot] = 0
+            try:
+                future = self.pool.submit(run_job, slot, key, target, args, kwargs)
+            except BrokenProcessPool:  # a worker died (e.g. out of memory); start over
+                self.pool = self.new_pool()
+                future = self.pool.submit(run_job, slot, key, target, args, kwargs)
+            job = Job(key, label or fn.__name__, future, slot, self)
+            self.jobs[key] = job
+            self.jobs.move_to_end(key)
+            self.evict()
+        future.add_done_callback(lambda _: self.finished(job))
+        return job
+
+    def get(self, key):
+        with self.lock:
+            return self.jobs.get(key)
+
+    def finished(self, job):
+        if job.status == "finished":
+            job.progress, job.message = 1.0, "Finished"
+        else:
+            job.message = job.status.capitalize()
+
+    def evict(self):
+        finished = [key for key, job in self.jobs.items() if job.done()]
+        for key in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self.jobs[key]
+
+    def listen(self):
+        while True:
+            key, fraction, message, partial = self.updates.get()
+            job = self.get(key)
+            if job is None or job.done():
+                continue
+            job.progress, job.message = fraction, message or job.message
+            if partial is not None:
+                job.partial = partial
+
+    def active(self):
+        with self.lock:
+            return [job for job in self.jobs.values() if not job.done()]
+
+    def shutdown(self):
+        for job in self.active():
+            job.cancel()
+        self.pool.shutdown(wait=True, cancel_futures=True)
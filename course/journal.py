@@ -0,0 +1,215 @@
+import numpy as np
+
+# --- Columnar Journal Store ---
+# Journal lines kept as parallel NumPy columns instead of a DataFrame of
+# Python objects:
+#
+#   entry       int32   journal entry the line belongs to
+#   date        int32   index into ``dates`` (datetime64[D]), or no dates at all
+#   account     int32   index into ``accounts``
+#   category    int32   index into ``categories``
+#   entry_type  int8    index into ENTRY_TYPES
+#   cents       int64   amount in whole cents, so totals are exact
+#
+# Account, category and date are dictionary-encoded: a ledger with millions of
+# lines stores each distinct label once. Journals persist to Arrow IPC files
+# (or Parquet) with the same dictionary columns. Opening an Arrow file memory
+# maps it, so the columns are views of the file and nothing is copied or
+# parsed until a page of rows is decoded for display.
+
+ENTRY_TYPES = ("Debit", "Credit")
+# Dictionary-encoded column -> attribute holding its labels.
+DICTIONARIES = {"date": "dates", "account": "accounts", "category": "categories"}
+
+
+def to_cents(amounts):
+    """Dollar amounts (numbers or numeric strings) as int64 cents."""
+    import pandas as pd
+
+    return np.round(pd.to_numeric(amounts).to_numpy(dtype=np.float64) * 100).astype(np.int64)
+
+
+def spread_cents(total, parts):
+    """Split ``total`` cents into ``parts`` whole-cent shares that sum exactly.
+
+    Both may be arrays (one split per element); returns (base share, number of
+    leading shares that get one extra cent).
+    """
+    total = np.asarray(total, dtype=np.int64)
+    parts = np.asarray(parts, dtype=np.int64)
+    base = total // np.maximum(parts, 1)
+    return base, total - base * parts
+
+
+def encode_labels(*columns):
+    labels, codes = np.unique(np.concatenate(columns).astype(str), return_inverse=True)
+    return labels.tolist(), np.split(codes.astype(np.int32), len(columns))
+
+
+def encode_dates(dates):
+    """Dictionary-encode datetime64[D] values as offsets into a dense day range.
+
+    No sort is needed: the dictionary is every day from the first to the last.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    if not len(dates):
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype="datetime64[D]")
+    first, last = dates.min(), dates.max()
+    return (dates - first).astype(np.int32), np.arange(first, last + 1)
+
+
+class Journal:
+    """Columnar journal lines; see the module comment for the layout."""
+
+    def __init__(self, entry, date, account, category, entry_type, cents, accounts, categories, dates=None):
+        self.entry = entry
+        self.date = date
+        self.account = account
+        self.category = category
+        self.entry_type = entry_type
+        self.cents = cents
+        self.accounts = accounts
+        self.categories = categories
+        self.dates = dates
+
+    @classmethod
+    def from_frame(cls, frame, entry_column="Entry"):
+        """Encode a DataFrame with Account, Category, Entry Type and Amount ($)
+        columns (and optionally Date and ``entry_column``)."""
+        accounts, (account,) = encode_labels(frame["Account"].fillna("").to_numpy())
+        categories, (category,) = encode_labels(frame["Category"].fillna("").to_numpy())
+        entry_type = frame["Entry Type"].map({name: code for code, name in enumerate(ENTRY_TYPES)})
+        if entry_type.isna().any():
+            raise ValueError(f"Entry Type must be one of {', '.join(ENTRY_TYPES)}.")
+        date, dates = None, None
+        if "Date" in frame:
+            import pandas as pd
+
+            date, dates = encode_dates(pd.to_datetime(frame["Date"]).to_numpy())
+        entry = (frame[entry_column].to_numpy(dtype=np.int32) if entry_column in frame
+                 else np.zeros(len(frame), dtype=np.int32))
+        return cls(
+            entry=entry,
+            date=date,
+            account=account,
+            category=category,
+            entry_type=entry_type.to_numpy(dtype=np.int8),
+            cents=to_cents(frame["Amount ($)"]),
+            accounts=accounts,
+            categories=categories,
+            dates=dates,
+        )
+
+    def __len__(self):
+        return len(self.cents)
+
+    def columns(self):
+        """Column name -> array, in storage order."""
+        columns = {"entry": self.entry}
+        if self.date is not None:
+            columns["date"] = self.date
+        columns.update(account=self.account, category=self.category, entry_type=self.entry_type, cents=self.cents)
+        return columns
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.columns().values())
+
+    def totals_cents(self):
+        debit = self.entry_type == 0
+        return int(self.cents[debit].sum()), int(self.cents[~debit].sum())
+
+    def totals(self):
+        debit, credit = self.totals_cents()
+        return debit / 100, credit / 100
+
+    def is_balanced(self):
+        debit, credit = self.totals_cents()
+        return debit == credit
+
+    def replace(self, **changes):
+        """A journal sharing this one's arrays and dictionaries except ``changes``."""
+        return type(self)(**{**vars(self), **changes})
+
+    def take(self, rows):
+        """The lines at ``rows`` (a slice gives views, a mask or index array copies)."""
+        return self.replace(**{name: values[rows] for name, values in self.columns().items()})
+
+    # --- Display ------------------------------------------------------------
+
+    def leading_columns(self, rows):
+        return {"Entry": self.entry[rows]}
+
+    def to_frame(self, start=0, stop=None, **kwargs):
+        """Decode rows ``start:stop`` into a DataFrame for display."""
+        import pandas as pd
+
+        rows = slice(start, stop)
+        columns = self.leading_columns(rows, **kwargs)
+        if self.date is not None:
+            columns["Date"] = self.dates[self.date[rows]]
+        columns.update({
+            "Category": pd.Categorical.from_codes(self.category[rows], self.categories),
+            "Account": pd.Categorical.from_codes(self.account[rows], self.accounts),
+            "Entry Type": pd.Categorical.from_codes(self.entry_type[rows], ENTRY_TYPES),
+            "Amount ($)": self.cents[rows] / 100,
+        })
+        return pd.DataFrame(columns)
+
+    # --- Persistence --------------------------------------------------------
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        arrays = {}
+        for name, values in self.columns().items():
+            if name in DICTIONARIES:
+                labels = getattr(self, DICTIONARIES[name])
+                arrays[name] = pa.DictionaryArray.from_arrays(pa.array(values), pa.array(labels))
+            else:
+                arrays[name] = pa.array(values)
+        return pa.table(arrays)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Journal over an Arrow table's buffers (no copy for single-chunk columns)."""
+        import pyarrow as pa
+
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            if name in DICTIONARIES and not isinstance(column, pa.DictionaryArray):
+                column = column.dictionary_encode()  # Parquet keeps dates as plain values
+            if isinstance(column, pa.DictionaryArray):
+                columns[name] = column.indices.to_numpy(zero_copy_only=False)
+                dictionary = column.dictionary
+                columns[DICTIONARIES[name]] = (dictionary.to_numpy(zero_copy_only=False).astype("datetime64[D]")
+                                               if name == "date" else dictionary.to_pylist())
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+        return cls(**columns)
+
+    def save(self, path):
+        """Write an Arrow IPC file, or Parquet if ``path`` ends in .parquet."""
+        table = self.to_arrow()
+        if str(path).endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path)
+            return
+        import pyarrow as pa
+
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    @classmethod
+    def open(cls, path):
+        """Open a saved journal; Arrow files are memory-mapped, not read."""
+        if str(path).endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            return cls.from_arrow(pq.read_table(path, memory_map=True, read_dictionary=["account", "category"]))
+        import pyarrow as pa
+
+        return cls.from_arrow(pa.ipc.open_file(pa.memory_map(str(path))).read_all())
@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+from course.depreciation import column
+from course.journal import to_cents
+from course.revenue import lease_months
+
+# --- Occupancy and NOI KPI Cube ---
+# Operational KPIs for a property portfolio, pre-aggregated so the dashboard
+# never re-scans raw rows. Inputs:
+#
+#   properties  ``property``, ``units`` and optionally ``region`` and
+#               ``portfolio``
+#   rent roll   ``lease``, ``property``, ``start``, ``end`` (inclusive) and
+#               optionally ``units`` leased (default 1)
+#   GL          ``property``, ``date`` (or ``month``), ``category``
+#               (Revenue / Expense), ``amount`` and optionally ``account``;
+#               NON_OPERATING accounts are left out of NOI
+#
+# The cube stores four additive measures per property and month: occupied
+# unit-days, available unit-days, revenue and operating expenses (cents).
+# Ratios (occupancy, NOI margin) are only computed after summing, so any
+# rollup of them is exact.
+#
+# Two sets of partial aggregates are built once, each with running totals
+# over months so any month or year range is a difference of two rows:
+#
+#   property   (properties x months)
+#   segment    (region x portfolio pairs x months), a few dozen rows
+#
+# A filter by region and portfolio selects segments; totals, monthly or
+# yearly series and region / portfolio breakdowns then sum at most the
+# segment rows. Only a property breakdown reads the property aggregates,
+# one difference per property.
+
+MEASURES = ("occupied", "available", "revenue", "expenses")
+NON_OPERATING = ("Depreciation Expense", "Interest Expense", "Income Tax Expense", "Capital Expenditures")
+LEVELS = ("Region", "Portfolio", "Property")
+
+
+def metrics(totals):
+    """KPI columns from summed measures (last axis in MEASURES order)."""
+    occupied, available, revenue, expenses = (totals[..., i] for i in range(len(MEASURES)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "Occupancy (%)": np.round(np.where(available > 0, occupied / available * 100, np.nan), 2),
+            "Revenue ($)": revenue / 100,
+            "Operating Expenses ($)": expenses / 100,
+            "NOI ($)": (revenue - expenses) / 100,
+            "NOI Margin (%)": np.round(np.where(revenue != 0, (revenue - expenses) / revenue * 100, np.nan), 2),
+        }
+
+
+class KpiCube:
+    """Property x month x measure totals with prefix sums; see the module comment."""
+
+    def __init__(self, properties, rent_roll, gl):
+        properties = properties.rename(columns=lambda name: str(name).strip().lower()).reset_index(drop=True)
+        missing = {"property", "units"} - set(properties.columns)
+        if missing:
+            raise ValueError(f"Properties are missing column(s): {', '.join(sorted(missing))}.")
+        self.properties = pd.Index(properties["property"].astype(str), name="property")
+        if not self.properties.is_unique:
+            raise ValueError("Each property may appear only once.")
+        self.units = pd.to_numeric(properties["units"]).to_numpy(dtype=np.int64)
+        self.regions, region = np.unique(column(properties, "region", "").fillna("").astype(str),
+                                         return_inverse=True)
+        self.portfolios, portfolio = np.unique(column(properties, "portfolio", "").fillna("").astype(str),
+                                               return_inverse=True)
+        self.region, self.portfolio = region.astype(np.int32), portfolio.astype(np.int32)
+
+        leases = self.read_rent_roll(rent_roll)
+        ledger = self.read_gl(gl)
+        months = np.concatenate([leases[2], ledger[1]])
+        if not len(months):
+            raise ValueError("The rent roll and GL are both empty.")
+        self.first_month = int(months.min())
+        self.months = int(months.max()) - self.first_month + 1
+
+        values = np.zeros((len(self.properties), self.months, len(MEASURES)), dtype=np.int64)
+        flat = values.reshape(-1, len(MEASURES))
+        size = len(flat)
+        lease_property, lease_units, lease_month, lease_days = leases
+        cell = lease_property * self.months + (lease_month - self.first_month)
+        flat[:, 0] = np.bincount(cell, lease_units * lease_days, minlength=size).astype(np.int64)
+        month = np.arange(self.first_month, self.first_month + self.months)
+        month_days = ((month + 1).astype("datetime64[M]").astype("datetime64[D]")
+                      - month.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+        values[:, :, 1] = self.units[:, None] * month_days[None, :]
+        gl_property, gl_month, gl_revenue, gl_cents = ledger
+        cell = gl_property * self.months + (gl_month - self.first_month)
+        flat[:, 2] = np.bincount(cell[gl_revenue], gl_cents[gl_revenue], minlength=size).round().astype(np.int64)
+        flat[:, 3] = np.bincount(cell[~gl_revenue], gl_cents[~gl_revenue], minlength=size).round().astype(np.int64)
+
+        # Segments: one per (region, portfolio) pair present.
+        pairs = self.region.astype(np.int64) * len(self.portfolios) + self.portfolio
+        segment_pairs, self.segment = np.unique(pairs, return_inverse=True)
+        self.segment_region = (segment_pairs // len(self.portfolios)).astype(np.int32)
+        self.segment_portfolio = (segment_pairs % len(self.portfolios)).astype(np.int32)
+        segment_values = np.zeros((len(segment_pairs), self.months, len(MEASURES)), dtype=np.int64)
+        np.add.at(segment_values, self.segment, values)
+        self.property_running = running_totals(values)
+        self.segment_running = running_totals(segment_values)
+
+    def read_rent_roll(self, rent_roll):
+        roll = rent_roll.rename(columns=lambda name: str(name).strip().lower().replace(" ", "_"))
+        missing = {"property", "start", "end"} - set(roll.columns)
+        if missing:
+            raise ValueError(f"Rent roll is missing column(s): {', '.join(sorted(missing))}.")
+        property_code = self.property_codes(roll["property"], "Rent roll")
+        start = pd.to_datetime(roll["start"], errors="coerce").to_numpy().astype("datetime64[D]")
+        end = pd.to_datetime(roll["end"], errors="coerce").to_numpy().astype("datetime64[D]")
+        if np.isnat(start).any() or np.isnat(end).any() or (end < start).any():
+            raise ValueError("Every lease needs a start date and an end date on or after it.")
+        units = pd.to_numeric(column(roll, "units", 1)).fillna(1).to_numpy(dtype=np.int64)
+        calendar, _ = lease_months(start.astype(np.int64), end.astype(np.int64))
+        lease = calendar["lease"]
+        days = calendar["last_day"] - calendar["first_day"] + 1
+        return property_code[lease], units[lease], calendar["month"], days
+
+    def read_gl(self, gl):
+        gl = gl.rename(columns=lambda name: str(name).strip().lower().replace(" ", "_")).reset_index(drop=True)
+        date_column = "date" if "date" in gl else "month"
+        missing = {"property", date_column, "category", "amount"} - set(gl.columns)
+        if missing:
+            raise ValueError(f"GL is missing column(s): {', '.join(sorted(missing))}.")
+        if "account" in gl:
+            gl = gl[~gl["account"].isin(NON_OPERATING)]
+        category = gl["category"].astype(str).str.strip().str.title()
+        gl = gl[category.isin(["Revenue", "Expense"])]
+        month = pd.to_datetime(gl[date_column], errors="coerce").to_numpy().astype("datetime64[M]")
+        if np.isnat(month).any():
+            raise ValueError("Every GL line needs a date.")
+        return (self.property_codes(gl["property"], "GL"), month.astype(np.int64),
+                (category[gl.index] == "Revenue").to_numpy(), to_cents(gl["amount"]).astype(np.float64))
+
+    def property_codes(self, values, source):
+        codes = self.properties.get_indexer(values.astype(str))
+        if (codes < 0).any():
+            raise ValueError(f"{source} names a property that is not in the property list: "
+                             f"{values[codes < 0].iloc[0]}")
+        return codes
+
+    # --- Slicing ------------------------------------------------------------
+
+    def month_labels(self):
+        return np.arange(self.first_month, self.first_month + self.months).astype("datetime64[M]").astype(str)
+
+    def years(self):
+        return sorted({int(label[:4]) for label in self.month_labels()})
+
+    def month_range(self, first_year=None, last_year=None):
+        """Cube month positions [start, stop) covering the given years."""
+        start = 0 if first_year is None else np.datetime64(f"{first_year}-01", "M").astype(np.int64) - self.first_month
+        stop = (self.months if last_year is None
+                else np.datetime64(f"{last_year + 1}-01", "M").astype(np.int64) - self.first_month)
+        return int(np.clip(start, 0, self.months)), int(np.clip(stop, 0, self.months))
+
+    def segment_mask(self, regions=None, portfolios=None):
+        mask = np.ones(len(self.segment_region), dtype=bool)
+        if regions:
+            mask &= np.isin(self.regions[self.segment_region], list(regions))
+        if portfolios:
+            mask &= np.isin(self.portfolios[self.segment_portfolio], list(portfolios))
+        return mask
+
+    def summary(self, regions=None, portfolios=None, first_year=None, last_year=None):
+        """KPIs of the filtered portfolio over the year range, as a dict."""
+        start, stop = self.month_range(first_year, last_year)
+        running = self.segment_running[self.segment_mask(regions, portfolios)]
+        totals = (running[:, stop] - running[:, start]).sum(axis=0)
+        return {name: value.item() for name, value in metrics(totals).items()}
+
+    def series(self, regions=None, portfolios=None, first_year=None, last_year=None, grain="Month"):
+        """KPIs of the filtered portfolio per month or per year."""
+        start, stop = self.month_range(first_year, last_year)
+        running = self.segment_running[self.segment_mask(regions, portfolios)].sum(axis=0)
+        labels = self.month_labels()[start:stop]
+        if grain == "Year":
+            # Year boundaries inside the range, as running-total positions.
+            bounds = [start] + [start + i for i, label in enumerate(labels) if label.endswith("-01") and i] + [stop]
+            totals = running[bounds[1:]] - running[bounds[:-1]]
+            labels = [label[:4] for label in labels[[bound - start for bound in bounds[:-1]]]]
+        else:
+            totals = running[start + 1:stop + 1] - running[start:stop]
+        return pd.DataFrame(metrics(totals), index=pd.Index(labels, name=grain))
+
+    def breakdown(self, level, regions=None, portfolios=None, first_year=None, last_year=None):
+        """KPIs over the year range for each region, portfolio or property in the filter."""
+        start, stop = self.month_range(first_year, last_year)
+        mask = self.segment_mask(regions, portfolios)
+        if level == "Property":
+            rows = np.flatnonzero(mask[self.segment])
+            totals = self.property_running[rows, stop] - self.property_running[rows, start]
+            labels = {"Property": self.properties[rows], "Region": self.regions[self.region[rows]],
+                      "Portfolio": self.portfolios[self.portfolio[rows]]}
+        else:
+            segments = np.flatnonzero(mask)
+            codes, names = ((self.segment_region, self.regions) if level == "Region"
+                            else (self.segment_portfolio, self.portfolios))
+            groups, group = np.unique(codes[segments], return_inverse=True)
+            totals = np.zeros((len(groups), len(MEASURES)), dtype=np.int64)
+            np.add.at(totals, group, self.segment_running[segments, stop] - self.segment_running[segments, start])
+            labels = {level: names[groups]}
+        return pd.DataFrame({**labels, **metrics(totals)})
+
+
+def running_totals(values):
+    """Prefix sums over the month axis with a leading zero month."""
+    running = np.zeros((values.shape[0], values.shape[1] + 1, values.shape[2]), dtype=np.int64)
+    np.cumsum(values, axis=1, out=running[:, 1:])
+    return running
+
+
+def sample_portfolio(properties=5_000, years=10, start="2016-01", seed=0):
+    """A generated portfolio (properties, rent roll, GL) for the dashboard and benchmarks."""
+    rng = np.random.default_rng(seed)
+    regions = np.array(["Midwest", "Northeast", "Southeast", "Southwest", "West"])
+    portfolios = np.array(["Core", "Core Plus", "Value Add", "Opportunistic"])
+    names = np.array([f"Property {i:04d}" for i in range(1, properties + 1)])
+    units = rng.integers(20, 400, properties)
+    property_frame = pd.DataFrame({
+        "property": names,
+        "region": regions[rng.integers(0, len(regions), properties)],
+        "portfolio": portfolios[rng.integers(0, len(portfolios), properties)],
+        "units": units,
+    })
+
+    # Leases of blocks of units, renewed back to back with a vacancy gap.
+    first_day = np.datetime64(start, "M").astype("datetime64[D]")
+    last_day = (np.datetime64(start, "M") + 12 * years).astype("datetime64[D]") - 1
+    blocks = 4
+    lease_property = np.repeat(np.arange(properties), blocks * years)
+    term = rng.integers(300, 400, len(lease_property))
+    gap = rng.integers(0, 90, len(lease_property))
+    offset = (term + gap).reshape(-1, years).cumsum(axis=1).ravel() - (term + gap)
+    lease_start = first_day + rng.integers(0, 60, len(lease_property) // years).repeat(years) + offset
+    lease_end = np.minimum(lease_start + term, last_day)
+    keep = lease_start <= last_day
+    block_units = np.maximum(units // blocks, 1)[lease_property]
+    rent_roll = pd.DataFrame({
+        "lease": np.arange(len(lease_property))[keep],
+        "property": names[lease_property][keep],
+        "start": lease_start[keep],
+        "end": lease_end[keep],
+        "units": block_units[keep],
+    })
+
+    # Monthly revenue and operating expense per property, plus depreciation
+    # (excluded from NOI).
+    months = np.arange(np.datetime64(start, "M"), np.datetime64(start, "M") + 12 * years)
+    rent_per_unit = rng.uniform(900, 2_500, properties)
+    grid_property = np.repeat(np.arange(properties), len(months))
+    grid_month = np.tile(months, properties)
+    revenue = units[grid_property] * rent_per_unit[grid_property] * rng.uniform(0.8, 0.97, len(grid_property))
+    expenses = revenue * rng.uniform(0.3, 0.55, len(grid_property))
+    gl = pd.DataFrame({
+        "property": names[np.tile(grid_property, 3)],
+        "month": np.tile(grid_month, 3),
+        "category": np.repeat(["Revenue", "Expense", "Expense"], len(grid_property)),
+        "account": np.repeat(["Rental Income", "Operating Expenses", "Depreciation Expense"], len(grid_property)),
+        "amount": np.concatenate([revenue, expenses, revenue * 0.2]).round(2),
+    })
+    return property_frame, rent_roll, gl
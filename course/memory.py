@@ -0,0 +1,56 @@
+import sys
+
+import streamlit as st
+
+from course.reference import content_digest, load_reference_data
+
+
+# --- Per-Session Memory Report ---
+# Shows what the current session holds in st.session_state next to the size of
+# the shared reference store, which every session reuses rather than copying.
+# Enabled by opening the app with ?report=memory.
+
+def deep_sizeof(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):  # pandas objects
+        usage = memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(obj, "nbytes"):  # numpy / arrow buffers
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict) or hasattr(obj, "items") and hasattr(obj, "keys"):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):  # course objects (Ledger, Journal, ...)
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def session_memory_report():
+    rows = sorted(
+        ((str(key), deep_sizeof(value)) for key, value in st.session_state.items()),
+        key=lambda row: -row[1],
+    )
+    return {
+        "session_bytes": sum(size for _, size in rows),
+        "shared_bytes": deep_sizeof(load_reference_data(content_digest())),
+        "keys": rows,
+    }
+
+
+def show_memory_report():
+    """Show the report in the sidebar and return it."""
+    report = session_memory_report()
+    with st.sidebar.expander("Memory report"):
+        st.markdown(f"**This session:** {report['session_bytes']:,} bytes in {len(report['keys'])} keys")
+        st.markdown(f"**Shared reference data (per process):** {report['shared_bytes']:,} bytes")
+        if report["keys"]:
+            st.markdown("| Key | Bytes |\n|---|---:|\n" + "\n".join(
+                f"| `{key}` | {size:,} |" for key, size in report["keys"]
+            ))
+    return report
@@ -0,0 +1,57 @@
+import streamlit as st
+
+from course.feedback import entry_feedback
+from course.reference import reference_data, reference_frame
+
+# Each exercise runs as a fragment around a form: editing a cell doesn't rerun
+# anything, and submitting only reruns this exercise rather than the whole page.
+@st.fragment
+def pipe_replacement_exercise():
+    content = reference_data("module1")
+    invoice_account_options = content["invoice_account_options"]
+    payment_account_options = content["payment_account_options"]
+    entry_type_options = reference_data("common")["entry_type_options"]
+    
+    with st.form("pipe_replacement_form", border=False):
+        st.markdown("#### Invoice Receipt (March 18th)")
+        invoice_df = reference_frame("common", "journal_entry_template")
+        edited_invoice_df = st.data_editor(
+            invoice_df,
+            num_rows="fixed",
+            key="invoice_editor",
+            column_config={
+                "Account": st.column_config.SelectboxColumn("Account", options=invoice_account_options),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=entry_type_options),
+            }
+        )
+        
+        st.markdown("#### Payment (April 1st)")
+        payment_df = reference_frame("common", "journal_entry_template")
+        edited_payment_df = st.data_editor(
+            payment_df,
+            num_rows="fixed",
+            key="payment_editor",
+            column_config={
+                "Account": st.column_config.SelectboxColumn("Account", options=payment_account_options),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=entry_type_options),
+            }
+        )
+        
+        submitted = st.form_submit_button("Submit Answers for Quiz", key="submit_quiz_mod1_table")
+    
+    if submitted:
+        st.markdown("**Your Invoice Receipt:**")
+        entry_feedback(edited_invoice_df, "module1", "pipe_invoice")
+        st.markdown("**Your Payment:**")
+        entry_feedback(edited_payment_df, "module1", "pipe_payment")
+        st.markdown("**Expected Answer:**")
+        st.markdown("""
+        **Invoice Receipt (March 18th):**  
+        - **Line 1:** Debit: Maintenance Expense (Expense) $500  
+        - **Line 2:** Credit: Accounts Payable (Liability) $500  
+        
+        **Payment (April 1st):**  
+        - **Line 1:** Debit: Accounts Payable (Liability) $500  
+        - **Line 2:** Credit: Cash (Asset) $500  
+        """)
+        st.success("Review your submitted answers against the expected answers above.")
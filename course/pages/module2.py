@@ -0,0 +1,180 @@
+import datetime
+
+import streamlit as st
+import pandas as pd
+
+from course.accruals import AccrualEngine
+from course.background import background_result
+from course.depreciation import AssetRegister
+from course.feedback import entry_feedback
+from course.grid import paginated_dataframe
+from course.reference import content_digest, reference_data, reference_frame
+
+# Each exercise runs as a fragment around a form: editing a cell doesn't rerun
+# anything, and submitting only reruns this exercise rather than the whole page.
+@st.fragment
+def accrual_exercise():
+    accrual_account_options = reference_data("module2")["accrual_account_options"]
+    entry_type_options = reference_data("common")["entry_type_options"]
+
+    with st.form("accrual_form", border=False):
+        accrual_df = reference_frame("common", "journal_entry_template")
+        edited_accrual_df = st.data_editor(
+            accrual_df,
+            num_rows="fixed",
+            key="accrual_editor",
+            column_config={
+                "Account": st.column_config.SelectboxColumn("Account", options=accrual_account_options),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=entry_type_options)
+            }
+        )
+        submitted = st.form_submit_button("Submit Accrual Entry", key="submit_accrual")
+
+    if submitted:
+        entry_feedback(edited_accrual_df, "module2", "tax_accrual")
+        st.markdown("**Expected Accrual Entry:**")
+        st.markdown("""
+        - **Line 1:** Debit: Property Tax Expense \$1,200  
+        - **Line 2:** Credit: Accrued Property Taxes \$1,200
+        """)
+        st.success("Review the expected accrual entry.")
+
+@st.fragment
+def payment_exercise():
+    payment_account_options = reference_data("module2")["payment_account_options"]
+    entry_type_options = reference_data("common")["entry_type_options"]
+
+    with st.form("payment_form", border=False):
+        payment_df = reference_frame("common", "journal_entry_template")
+        edited_payment_df = st.data_editor(
+            payment_df,
+            num_rows="fixed",
+            key="payment_editor",
+            column_config={
+                "Account": st.column_config.SelectboxColumn("Account", options=payment_account_options),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=entry_type_options)
+            }
+        )
+        submitted = st.form_submit_button("Submit Payment Entry", key="submit_payment")
+
+    if submitted:
+        entry_feedback(edited_payment_df, "module2", "tax_payment")
+        st.markdown("**Expected Payment Entry:**")
+        st.markdown("""
+        - **Line 1:** Debit: Accrued Property Taxes \$1,200  
+        - **Line 2:** Credit: Cash \$1,200
+        """)
+        st.success("Review the expected payment entry.")
+
+@st.fragment
+def depreciation_exercise():
+    depreciation_account_options = reference_data("module2")["depreciation_account_options"]
+    entry_type_options = reference_data("common")["entry_type_options"]
+
+    with st.form("depreciation_form", border=False):
+        depreciation_df = reference_frame("common", "journal_entry_template")
+        edited_depreciation_df = st.data_editor(
+            depreciation_df,
+            num_rows="fixed",
+            key="depreciation_editor",
+            column_config={
+                "Account": st.column_config.SelectboxColumn("Account", options=depreciation_account_options),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=entry_type_options)
+            }
+        )
+        submitted = st.form_submit_button("Submit Depreciation Entry", key="submit_depreciation")
+
+    if submitted:
+        entry_feedback(edited_depreciation_df, "module2", "depreciation")
+        st.markdown("**Expected Depreciation Entry:**")
+        st.markdown("""
+        - **Line 1:** Debit: Depreciation Expense \$1,666.67  
+        - **Line 2:** Credit: Accumulated Depreciation \$1,666.67
+        """)
+        st.success("Review the expected depreciation entry.")
+
+# The sample register never changes, so every session shares one.
+@st.cache_resource(max_entries=1, show_spinner=False)
+def sample_register(digest):
+    return AssetRegister(reference_frame("module2", "asset_register"))
+
+@st.fragment
+def register_explorer():
+    st.markdown("""
+    Real portfolios depreciate hundreds of assets at once, each with its own method, in-service date and salvage value.
+    Upload an asset register (CSV: `asset`, `cost`, `salvage`, `life_months`, `method`, `in_service`, and optionally
+    `disposal`, `proceeds`, `asset_class`, `rate`, `total_units`, `monthly_units`) or explore the sample below.
+    Methods: Straight-Line, Declining Balance or Units of Production.
+    """)
+    register_file = st.file_uploader("Asset Register (CSV)", type="csv", key="asset_register_file")
+    if register_file is None:
+        register_id = content_digest()
+        register = sample_register(register_id)
+    else:
+        register_id = register_file.file_id
+        cached = st.session_state.get("asset_register")
+        if cached is None or cached[0] != register_file.file_id:
+            try:
+                register = AssetRegister(pd.read_csv(register_file))
+            except (KeyError, ValueError) as error:
+                st.error(f"Could not read the asset register: {error}")
+                return
+            st.session_state["asset_register"] = (register_file.file_id, register)
+        else:
+            register = cached[1]
+
+    first = register.first_month().astype(datetime.date)
+    start = st.date_input("First Month", value=first, key="depreciation_start")
+    months = st.number_input("Months", min_value=1, max_value=600, value=12, step=1, key="depreciation_months")
+    # Schedules run as background jobs. Entries are generated month by month;
+    # only the summarized lines are kept, in session_state until the register,
+    # first month or horizon change, so paging through them doesn't run the
+    # schedule again.
+    st.markdown(f"#### Monthly Depreciation Entries ({len(register):,} assets)")
+    entries = background_result("depreciation_journal", AssetRegister.journal_frame, register, start, int(months),
+                                label="Depreciation entries", identity=(register_id, start, int(months)))
+    if entries is not None and len(entries):
+        paginated_dataframe(entries, key="depreciation_entries")
+
+    asset = st.text_input("Asset Schedule", value=register.assets[0], key="depreciation_asset")
+    if asset not in register.assets:
+        st.write("No asset with that name in the register.")
+        return
+    schedule = background_result("depreciation_asset_schedule", AssetRegister.asset_schedule, register, asset,
+                                 label="Asset schedule", identity=(register_id, asset))
+    if schedule is not None:
+        paginated_dataframe(schedule, key="depreciation_schedule")
+
+@st.fragment
+def month_end_close():
+    st.markdown("""
+    At each month-end, expenses incurred but not yet invoiced or posted are accrued, and the accrual is reversed
+    on the first day of the next month so the real invoice can be recorded normally. Edit the open invoices or
+    accrual rules (add a late invoice, fill in a posted date) and run the close again: only the changed items
+    are regenerated.
+    """)
+    with st.form("month_end_close_form", border=False):
+        invoices = st.data_editor(reference_frame("module2", "open_invoices"), num_rows="dynamic",
+                                  key="close_invoices_editor", hide_index=True)
+        rules = st.data_editor(reference_frame("module2", "accrual_rules"), num_rows="dynamic",
+                               key="close_rules_editor", hide_index=True)
+        month = st.selectbox("Close Month", options=["2025-02", "2025-03", "2025-04"], index=1, key="close_month")
+        submitted = st.form_submit_button("Run Close", key="run_month_end_close")
+
+    # The engine is kept for the session so reruns of a month are incremental.
+    engine = st.session_state.setdefault("accrual_engine", AccrualEngine())
+    if submitted:
+        try:
+            st.session_state["month_end_close"] = engine.close(month, invoices, rules)
+        except (KeyError, ValueError) as error:
+            st.error(f"Could not run the close: {error}")
+            return
+    close = st.session_state.get("month_end_close")
+    if close is None:
+        return
+    changes = close.changes
+    st.caption(f"Close {close.month}: {changes['added']} new, {changes['changed']} changed, "
+               f"{changes['removed']} removed, {changes['reused']} reused.")
+    paginated_dataframe(close, key="month_end_lines")
+    debit, credit = close.journal().totals()
+    st.write(f"**Total debits:** ${debit:,.2f} | **Total credits:** ${credit:,.2f}")
@@ -0,0 +1,47 @@
+import streamlit as st
+import pandas as pd
+
+from course.chart_of_accounts import ChartOfAccounts
+from course.instrumentation import show
+from course.reference import content_digest, reference_frame
+
+# The sample chart never changes, so every session shares one index.
+@st.cache_resource(max_entries=1, show_spinner=False)
+def sample_chart(digest):
+    return ChartOfAccounts(reference_frame("module3", "chart_of_accounts"))
+
+@st.fragment
+def chart_explorer():
+    st.markdown("### Explore: Searching a Chart of Accounts")
+    st.markdown("""
+    Real charts are numbered by category (1000s Assets, 2000s Liabilities, 3000s Equity, 4000s Revenue,
+    5000s and up Expenses) and grouped under header accounts. Search the sample chart below by account
+    number or name, or upload your own (CSV: `number`, `name`, `parent`, optionally `normal_balance`).
+    """)
+    chart_file = st.file_uploader("Chart of Accounts (CSV)", type="csv", key="coa_file")
+    if chart_file is None:
+        chart = sample_chart(content_digest())
+    else:
+        cached = st.session_state.get("coa_chart")
+        if cached is None or cached[0] != chart_file.file_id:
+            try:
+                chart = ChartOfAccounts(pd.read_csv(chart_file, dtype=str))
+            except (KeyError, ValueError) as error:
+                st.error(f"Could not read the chart of accounts: {error}")
+                return
+            st.session_state["coa_chart"] = (chart_file.file_id, chart)
+        else:
+            chart = cached[1]
+
+    query = st.text_input(f"Search {len(chart):,} accounts", placeholder="e.g. 41 or rent", key="coa_search")
+    if not query.strip():
+        return
+    matches = chart.search(query)
+    if matches:
+        show("dataframe", lambda: chart.to_frame(matches), hide_index=True, width="stretch")
+    else:
+        st.write("No accounts match.")
+    if query.strip().isdigit():
+        category, normal_balance = chart.classify(query.strip())
+        if category:
+            st.info(f"Account numbers starting {query.strip()} are **{category}** with a normal **{normal_balance}** balance.")
@@ -0,0 +1,125 @@
+import streamlit as st
+import pandas as pd
+
+from course.background import background_result
+from course.consolidation import Consolidation
+from course.forecasting import SEASONALITY, forecast
+from course.grid import download_buttons, paginated_dataframe
+from course.instrumentation import show
+from course.reference import reference_frame
+
+# The builder runs as a fragment so adjusting an input only reruns the forecast.
+@st.fragment
+def budget_builder():
+    st.markdown("### Interactive Exercise: Budget Builder")
+    st.markdown("Imagine a property with the following monthly details:")
+    st.write("- **Rental Income:** $5,000")
+    st.write("- **Expenses:** Maintenance $800, Utilities $300, Marketing $400")
+    rental_income = st.number_input("Monthly Rental Income ($)", value=5000, step=100, key="mod4_rental")
+    maintenance = st.number_input("Maintenance Expense ($)", value=800, step=50, key="mod4_maintenance")
+    utilities = st.number_input("Utilities Expense ($)", value=300, step=50, key="mod4_utilities")
+    marketing = st.number_input("Marketing Expense ($)", value=400, step=50, key="mod4_marketing")
+    total_expenses = maintenance + utilities + marketing
+    net_income = rental_income - total_expenses
+    st.write("**Calculated Monthly Net Income:** $", net_income)
+    
+    st.markdown("#### Forecast Assumptions")
+    horizon = st.number_input("Forecast Horizon (months)", min_value=1, max_value=120, value=6, step=1, key="mod4_horizon")
+    rent_growth = st.number_input("Annual Rent Growth (%)", value=0.0, step=0.5, key="mod4_rent_growth")
+    expense_inflation = st.number_input("Annual Expense Inflation (%)", value=0.0, step=0.5, key="mod4_expense_inflation")
+    vacancy = st.number_input("Vacancy Rate (%)", min_value=0.0, max_value=100.0, value=0.0, step=1.0, key="mod4_vacancy")
+    seasonality = st.selectbox("Seasonality", options=list(SEASONALITY), key="mod4_seasonality")
+    volatility = st.number_input("Market Volatility (% per year)", min_value=0.0, value=0.0, step=1.0, key="mod4_volatility")
+    
+    # With volatility the forecast runs 1,000 Monte Carlo scenarios and shows the
+    # median with a 5th-95th percentile band for net income. It runs as a
+    # background job; the result is kept until an input changes.
+    result = background_result(
+        "budget_forecast",
+        forecast,
+        rental_income,
+        total_expenses,
+        rent_growth=rent_growth / 100,
+        expense_inflation=expense_inflation / 100,
+        vacancy=vacancy / 100,
+        seasonality=seasonality,
+        months=horizon,
+        scenarios=1000 if volatility else 1,
+        rent_volatility=volatility / 100,
+        vacancy_volatility=volatility / 400,
+        inflation_volatility=volatility / 400,
+        label="Forecast",
+    )
+    if result is None:
+        return
+    months = [f"Month {i}" for i in range(1, horizon + 1)]
+    forecast_df = pd.DataFrame({
+        "Rental Income": result.band("income", 50),
+        "Total Expenses": result.band("expenses", 50),
+        "Net Income": result.band("net", 50)
+    }, index=months)
+    if volatility:
+        forecast_df["Net Income (P5)"] = result.band("net", 5)
+        forecast_df["Net Income (P95)"] = result.band("net", 95)
+    show("dataframe", lambda: forecast_df)
+    st.line_chart(forecast_df)
+    download_buttons(forecast_df.rename_axis("Month"), key="forecast_export", file_name="budget_forecast")
+
+@st.fragment
+def consolidation_exercise():
+    st.markdown("### Interactive Exercise: Consolidation")
+    st.markdown("""
+    Upload trial balances for every entity and the ownership hierarchy, or explore the sample group below.  
+    - **Hierarchy CSV:** `entity`, `parent` (blank for the top entity)
+    - **Trial Balances CSV:** `entity`, `account`, `amount` (debits positive, credits negative),
+      `counterparty` (the other entity, for intercompany balances) and optionally `category`
+    
+    Intercompany balances are eliminated at the lowest entity that owns both sides.
+    """)
+    hierarchy_file = st.file_uploader("Ownership Hierarchy (CSV)", type="csv", key="consolidation_hierarchy_file")
+    balances_file = st.file_uploader("Trial Balances (CSV)", type="csv", key="consolidation_balances_file")
+    
+    # The group is built once per upload and kept for the session, so revisions
+    # below only recompute the revised entity's ancestors.
+    if hierarchy_file is not None and balances_file is not None:
+        group_key = (hierarchy_file.file_id, balances_file.file_id)
+    else:
+        group_key = "sample"
+    cached = st.session_state.get("consolidation_group")
+    if cached is None or cached[0] != group_key:
+        try:
+            if group_key == "sample":
+                group = Consolidation(reference_frame("module4", "consolidation_hierarchy"),
+                                      reference_frame("module4", "consolidation_trial_balances"))
+            else:
+                group = Consolidation(pd.read_csv(hierarchy_file), pd.read_csv(balances_file))
+        except (KeyError, ValueError) as error:
+            st.error(f"Could not consolidate the uploaded files: {error}")
+            return
+        st.session_state["consolidation_group"] = (group_key, group)
+    else:
+        group = cached[1]
+    
+    entity = st.selectbox("Consolidate At", options=list(group.entities), key="consolidation_entity")
+    revised_file = st.file_uploader(f"Revised Trial Balance for {entity} (CSV: account, amount, counterparty)",
+                                    type="csv", key="consolidation_revision_file")
+    if revised_file is not None and st.session_state.get("consolidation_revision") != (revised_file.file_id, entity):
+        try:
+            changed = group.update_entity(entity, pd.read_csv(revised_file))
+        except (KeyError, ValueError) as error:
+            st.error(f"Could not apply the revised trial balance: {error}")
+        else:
+            st.session_state["consolidation_revision"] = (revised_file.file_id, entity)
+            st.caption(f"Recomputed: {', '.join(changed)}")
+    
+    consolidated = group.consolidated(entity)
+    st.markdown(f"#### Consolidated Trial Balance: {entity}")
+    paginated_dataframe(consolidated, key="consolidated_balances")
+    if abs(consolidated["Balance ($)"].sum()) < 0.005:
+        st.success("Debits equal credits after eliminations.")
+    else:
+        st.warning(f"The consolidated trial balance is out by ${consolidated['Balance ($)'].sum():,.2f}.")
+    eliminations = group.eliminations(entity)
+    if len(eliminations):
+        st.markdown("#### Intercompany Eliminations")
+        paginated_dataframe(eliminations, key="consolidation_eliminations")
@@ -0,0 +1,162 @@
+import streamlit as st
+import pandas as pd
+
+from course.grid import download_buttons, paginated_dataframe
+from course.instrumentation import show
+from course.kpis import LEVELS, KpiCube, sample_portfolio
+from course.recurring import recurring_schedule
+from course.reference import reference_data, reference_frame
+from course.revenue import RecognitionEngine
+
+# The simulator runs as a fragment so changing the term or incentive only reruns
+# this exercise, and the entry editor sits in a form so grading runs on submit.
+@st.fragment
+def lease_incentive_simulator():
+    st.markdown("### Interactive Exercise: Lease Incentive Simulator")
+    content = reference_data("module5")
+    lease_term_options = content["lease_term_options"]
+    lease_term = st.selectbox("Lease Term (months)", options=lease_term_options, key="lease_term")
+    
+    total_incentive = st.number_input("Total Incentive Discount ($)", value=0, step=100, key="lease_incentive")
+    
+    if lease_term != "Please select" and total_incentive > 0:
+        monthly_adjustment = total_incentive / lease_term
+        st.write("Monthly incentive adjustment: $", monthly_adjustment)
+    else:
+        monthly_adjustment = None
+        st.write("Please select a lease term and enter a total incentive discount.")
+    
+    st.markdown("### Challenge: Configure the Recurring Journal Entry for the Lease Incentive")
+    st.markdown("""
+    To record the lease incentive discount over the life of the lease, a recurring journal entry is established.
+    This configuration will apply the monthly entry repeatedly so that the total over the lease term equals the total incentive discount.
+    
+    For each recurring entry, your configuration should include a Debit and Credit line!
+    """)
+    
+    if monthly_adjustment is not None:
+        lease_entry_df = reference_frame("module5", "lease_entry_template")
+        category_options = content["category_options"]
+        lease_account_options = content["lease_account_options"]
+        lease_entry_type_options = reference_data("common")["entry_type_options"]
+        cadence_options = content["cadence_options"]
+        
+        with st.form("lease_entry_form", border=False):
+            edited_lease_entry_df = st.data_editor(
+                lease_entry_df,
+                num_rows="fixed",
+                key="lease_entry_editor",
+                column_config={
+                    "Category": st.column_config.SelectboxColumn("Category", options=category_options),
+                    "Account": st.column_config.SelectboxColumn("Account", options=lease_account_options),
+                    "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=lease_entry_type_options),
+                    "Cadence": st.column_config.SelectboxColumn("Cadence", options=cadence_options)
+                }
+            )
+            st.markdown("When finished, click the button to submit your recurring journal entry configuration.")
+            submitted = st.form_submit_button("Submit Recurring Journal Entry", key="submit_lease_entry")
+        
+        # Remember the submission so paging through the schedule (which reruns this
+        # fragment) keeps it on screen until the term or incentive changes.
+        if submitted:
+            st.session_state["lease_entry_submitted"] = (lease_term, total_incentive)
+        if st.session_state.get("lease_entry_submitted") == (lease_term, total_incentive):
+            expected_config = pd.DataFrame({
+                "Category": ["Expense", "Revenue"],
+                "Account": ["Concessions", "Rental Income"],
+                "Entry Type": ["Debit", "Credit"],
+                "Amount ($)": [monthly_adjustment, monthly_adjustment],
+                "Cadence": ["Monthly", "Monthly"],
+                "Duration": [lease_term, lease_term]
+            }, index=["Line 1", "Line 2"])
+            st.markdown("### Correct Recurring Journal Entry Configuration")
+            show("table", lambda: expected_config)
+            
+            # Spread the total in whole cents so the schedule sums to it exactly.
+            expected_schedule = recurring_schedule(total_incentive, "Monthly", lease_term, spread=True)
+            st.markdown("### Recurring Journal Entry Schedule")
+            paginated_dataframe(expected_schedule, key="lease_schedule", period_label="Month", include_lease=False)
+            download_buttons(expected_schedule, key="lease_schedule_export", file_name="lease_incentive_schedule",
+                             period_label="Month", include_lease=False)
+            st.markdown(f"Over {lease_term} months, the total lease incentive will be ${expected_schedule.totals()[0]:,.2f}.")
+            st.success("Review the recurring schedule to understand how the entry is applied over the lease term.")
+
+@st.fragment
+def straight_line_rent():
+    st.markdown("""
+    Real leases rarely bill the same rent every month: rents escalate, the first months may be free, the tenant may
+    receive an incentive, and leases start and end mid-month. Rental income is still recognized evenly over the lease
+    term, and the difference to the rent billed builds up as straight-line rent receivable (or deferred rent).
+    Edit the rent roll (or upload one as a CSV with the same columns) and recognize it again: only the leases you
+    changed are recomputed.
+    """)
+    roll_file = st.file_uploader("Rent Roll (CSV)", type="csv", key="rent_roll_file")
+    if roll_file is None:
+        with st.form("rent_roll_form", border=False):
+            roll = st.data_editor(reference_frame("module5", "rent_roll"), num_rows="dynamic",
+                                  key="rent_roll_editor", hide_index=True)
+            submitted = st.form_submit_button("Recognize Rent", key="run_rent_recognition")
+        source = "sample"
+    else:
+        roll = pd.read_csv(roll_file)
+        submitted, source = False, roll_file.file_id
+
+    # The engine is kept for the session so amendments only recompute changed leases.
+    engine = st.session_state.setdefault("rent_recognition_engine", RecognitionEngine())
+    cached = st.session_state.get("rent_recognition")
+    if submitted or cached is None or cached[0] != source:
+        try:
+            st.session_state["rent_recognition"] = (source, engine.recognize(roll))
+        except (KeyError, ValueError) as error:
+            st.error(f"Could not recognize the rent roll: {error}")
+            return
+    recognition = st.session_state["rent_recognition"][1]
+    changes = recognition.changes
+    st.caption(f"{len(recognition.leases):,} leases: {changes['added']} new, {changes['changed']} amended, "
+               f"{changes['removed']} removed, {changes['reused']} reused.")
+
+    totals = recognition.monthly_totals()
+    st.line_chart(totals[["Cash Rent ($)", "Rental Income ($)"]])
+    paginated_dataframe(totals.reset_index(), key="rent_recognition_totals")
+
+    lease = st.text_input("Lease Schedule", value=recognition.leases[0], key="rent_recognition_lease")
+    if lease not in recognition.leases:
+        st.write("No lease with that id in the rent roll.")
+        return
+    paginated_dataframe(recognition.lease_schedule(lease), key="rent_recognition_schedule")
+    journal = recognition.journal(lease=lease)
+    st.markdown(f"#### Journal Entries for {lease}")
+    paginated_dataframe(journal, key="rent_recognition_journal", include_lease=False)
+    download_buttons(recognition, key="rent_recognition_export", file_name="straight_line_rent")
+
+# The sample portfolio never changes, so every session shares one cube.
+@st.cache_resource(max_entries=1, show_spinner=False)
+def sample_kpi_cube():
+    return KpiCube(*sample_portfolio())
+
+@st.fragment
+def kpi_dashboard():
+    st.markdown("""
+    Occupancy is occupied unit-days over available unit-days, and net operating income (NOI) is operating revenue
+    less operating expenses; depreciation, interest and capital expenditures are left out. The sample portfolio has
+    5,000 properties with ten years of leases and GL activity, pre-aggregated by property, region and portfolio so
+    every filter below is a lookup.
+    """)
+    cube = sample_kpi_cube()
+    years = cube.years()
+    columns = st.columns(3)
+    regions = columns[0].multiselect("Regions", options=list(cube.regions), key="kpi_regions")
+    portfolios = columns[1].multiselect("Portfolios", options=list(cube.portfolios), key="kpi_portfolios")
+    first_year, last_year = columns[2].select_slider("Years", options=years, value=(years[0], years[-1]),
+                                                     key="kpi_years")
+    summary = cube.summary(regions, portfolios, first_year, last_year)
+    for column, name in zip(st.columns(4), ("Occupancy (%)", "Revenue ($)", "NOI ($)", "NOI Margin (%)")):
+        value = summary[name]
+        column.metric(name, "n/a" if value != value else f"{value:,.1f}%" if "%" in name else f"${value:,.0f}")
+
+    grain = st.radio("Trend by", options=["Month", "Year"], horizontal=True, key="kpi_grain")
+    series = cube.series(regions, portfolios, first_year, last_year, grain)
+    st.line_chart(series[["Occupancy (%)"]])
+    st.bar_chart(series[["NOI ($)"]])
+    level = st.radio("Break Down by", options=LEVELS, horizontal=True, key="kpi_level")
+    paginated_dataframe(cube.breakdown(level, regions, portfolios, first_year, last_year), key="kpi_breakdown")
@@ -0,0 +1,131 @@
+import datetime
+
+import streamlit as st
+import pandas as pd
+
+from course.journal import Journal
+from course.instrumentation import show
+from course.reference import content_digest, reference_data, reference_frame
+from course.snapshots import Diff, Snapshot, merge
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def sample_snapshot(digest):
+    return Snapshot.from_journal(Journal.from_frame(reference_frame("module6", "sample_ledger")))
+
+@st.fragment
+def financial_statements():
+    st.markdown("""
+    The four statements below are read from a ledger that is updated as each entry is posted, so they never
+    re-scan the journal. Post your own entry and watch every statement change, and check that the accounting
+    equation (Assets = Liabilities + Equity) still holds. Branch a what-if scenario to try an entry, void one or
+    pay it late, and compare the scenario with the ledger it came from.
+    """)
+    # Every session's scenarios are snapshots branched from one shared copy of
+    # the sample ledger; each holds only the changes made in it.
+    scenarios = st.session_state.setdefault("statement_scenarios", {"Actual": sample_snapshot(content_digest())})
+    if "statement_scenario_next" in st.session_state:
+        st.session_state["statement_scenario"] = st.session_state.pop("statement_scenario_next")
+    name = st.selectbox("Scenario", options=list(scenarios), key="statement_scenario")
+
+    with st.form("post_entry_form", border=False):
+        entry_df = st.data_editor(
+            pd.DataFrame({
+                "Account": ["", ""],
+                "Category": ["", ""],
+                "Entry Type": ["Debit", "Credit"],
+                "Amount ($)": [0.0, 0.0],
+            }),
+            column_config={
+                "Account": st.column_config.SelectboxColumn(
+                    "Account", options=reference_data("module6")["statement_account_options"]),
+                "Category": st.column_config.SelectboxColumn(
+                    "Category", options=["Asset", "Liability", "Equity", "Revenue", "Expense"]),
+                "Entry Type": st.column_config.SelectboxColumn("Entry Type", options=["Debit", "Credit"]),
+                "Amount ($)": st.column_config.NumberColumn("Amount ($)", min_value=0.0, format="%.2f"),
+            },
+            num_rows="dynamic",
+            hide_index=True,
+            key="post_entry_editor",
+        )
+        entry_date = st.date_input("Entry Date", value=datetime.date(2025, 3, 31), key="post_entry_date")
+        submitted = st.form_submit_button("Post Entry", key="post_entry")
+
+    if submitted:
+        lines = entry_df[(entry_df["Account"].fillna("") != "") & (entry_df["Amount ($)"].fillna(0) > 0)]
+        if lines.empty:
+            st.warning("Fill in at least one account and amount to post.")
+        else:
+            try:
+                scenarios[name] = scenarios[name].post(Journal.from_frame(lines.assign(Date=pd.Timestamp(entry_date))))
+            except ValueError as error:
+                st.error(f"Not posted: {error}")
+            else:
+                if scenarios[name].ledger().in_balance:
+                    st.success(f"Posted {len(lines)} lines. Assets = Liabilities + Equity still holds.")
+                else:
+                    st.error("Posted, but Assets no longer equal Liabilities + Equity. Check the categories.")
+
+    what_if_scenarios(scenarios, name)
+
+    ledger = scenarios[name].ledger()
+    months = [str(month) for month in ledger.months]
+    month = st.selectbox("Statement Month", options=months, index=len(months) - 1, key="statement_month")
+    st.caption(f"{scenarios[name].lines:,} lines posted across {len(ledger.accounts)} accounts.")
+    trial_tab, income_tab, balance_tab, cash_tab = st.tabs(
+        ["Trial Balance", "Income Statement", "Balance Sheet", "Cash Flow"])
+    with trial_tab:
+        show("dataframe", lambda: ledger.trial_balance(month), hide_index=True)
+    with income_tab:
+        show("dataframe", lambda: ledger.income_statement(month, month), hide_index=True)
+    with balance_tab:
+        show("dataframe", lambda: ledger.balance_sheet(month), hide_index=True)
+    with cash_tab:
+        show("dataframe", lambda: ledger.cash_flow(month, month), hide_index=True)
+
+def what_if_scenarios(scenarios, name):
+    snapshot = scenarios[name]
+    with st.expander("What-if Scenarios"):
+        new_name = st.text_input("New scenario name", key="scenario_name").strip()
+        if st.button(f"Branch from {name}", key="branch_scenario"):
+            if not new_name or new_name in scenarios:
+                st.warning("Give the scenario a name that is not already used.")
+            else:
+                scenarios[new_name] = snapshot
+                st.session_state["statement_scenario_next"] = new_name
+                st.rerun()
+
+        entries = snapshot.entries()
+        entry = st.selectbox(
+            "Entry", options=entries.index.tolist(), key="scenario_entry",
+            format_func=lambda number: f"{number}: {entries.at[number, 'Date']:%Y-%m-%d} "
+                                       f"{entries.at[number, 'Accounts']}",
+        )
+        move_to = st.date_input("Move to", value=datetime.date(2025, 4, 30), key="scenario_date")
+        move_col, void_col = st.columns(2)
+        try:
+            if move_col.button("Move Entry", key="move_entry"):
+                snapshot = scenarios[name] = snapshot.reschedule([entry], move_to)
+                st.success(f"Entry {entry} moved to {move_to:%Y-%m-%d} in {name}.")
+            if void_col.button("Void Entry", key="void_entry"):
+                snapshot = scenarios[name] = snapshot.void([entry])
+                st.success(f"Entry {entry} voided in {name}.")
+        except ValueError as error:
+            st.error(str(error))
+
+        others = [other for other in scenarios if other != name]
+        if not others:
+            return
+        other = st.selectbox("Compare with", options=others, key="scenario_compare")
+        diff = Diff(scenarios[other], snapshot)
+        if not diff:
+            st.info(f"{name} and {other} are the same.")
+            return
+        show("dataframe", diff.balances, hide_index=True)
+        show("dataframe", diff.lines, hide_index=True)
+        if st.button(f"Merge {name} into {other}", key="merge_scenario"):
+            try:
+                scenarios[other] = merge(snapshot, scenarios[other])
+            except ValueError as error:
+                st.error(f"Not merged: {error}")
+            else:
+                st.success(f"{other} now includes every change made in {name}.")
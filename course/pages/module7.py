@@ -0,0 +1,159 @@
+import hashlib
+
+import streamlit as st
+import pandas as pd
+
+from course.background import job_outcome, run_in_background
+from course.bankfeeds import FeedStore
+from course.grid import paginated_dataframe
+from course.instrumentation import show
+from course.reconciliation import reconcile_statements, reconciled_balance
+
+# The calculator's inputs also seed the statement matching below, so both sit
+# in one exercise.
+def reconciliation_exercise():
+    # A ledger balance picked under Bank Feeds is applied before the input exists.
+    if "feed_bank_balance" in st.session_state:
+        st.session_state["bank_balance"] = st.session_state.pop("feed_bank_balance")
+    st.session_state.setdefault("bank_balance", 10000.0)
+    bank_balance = st.number_input("Bank Statement Ending Balance ($)", step=100.0, key="bank_balance")
+    ledger_balance = st.number_input("Company Ledger Cash Balance ($)", value=9500, step=100, key="ledger_balance")
+    outstanding_checks = st.number_input("Outstanding Checks ($)", value=0, step=50, key="outstanding_checks")
+    deposits_in_transit = st.number_input("Deposits in Transit ($)", value=0, step=50, key="deposits_in_transit")
+    bank_fees = st.number_input("Bank Service Fees ($)", value=0, step=10, key="bank_fees")
+    
+    if st.button("Calculate Reconciled Balance", key="calc_reconcile"):
+        reconciled = reconciled_balance(bank_balance, outstanding_checks, deposits_in_transit, bank_fees)
+        st.markdown(f"**Reconciled Cash Balance (Bank Method):** ${reconciled:.2f}")
+        st.info("Ideally, the reconciled balance should match the company's adjusted ledger balance.")
+    
+    statement_matching(bank_balance, ledger_balance)
+
+@st.fragment
+def statement_matching(bank_balance, ledger_balance):
+    st.markdown("### Interactive Exercise: Match Your Statements")
+    st.markdown("""
+    Upload a bank statement and a cash book export to derive the adjustments automatically.  
+    Both files are CSVs with a `date` column, a signed `amount` column (positive = money in, negative = money out)
+    and an optional `reference` column (check or deposit slip number). Lines are matched on reference and amount,
+    then on amount within the date tolerance, then as groups (e.g. several deposits banked as one).
+    Without a bank statement upload, the account picked under Bank Feeds is matched instead.
+    """)
+    bank_file = st.file_uploader("Bank Statement (CSV)", type="csv", key="bank_statement_file")
+    book_file = st.file_uploader("Cash Book (CSV)", type="csv", key="cash_book_file")
+    tolerance = st.number_input("Date Tolerance (days)", min_value=0, max_value=31, value=3, step=1, key="match_tolerance")
+    if bank_file is not None:
+        bank_id, bank_csv = (bank_file.file_id, bank_file.size), bank_file.getvalue
+    else:
+        bank_id, bank_csv = feed_statement()
+    if bank_id is None or book_file is None:
+        return
+    
+    # Matching runs in a background worker once per pair of files. The job is
+    # keyed on digests of their contents (each hashed once per upload), so
+    # reruns and other sessions matching the same files reuse the same job.
+    match_key = (bank_id, book_file.file_id, book_file.size, tolerance)
+    cached = st.session_state.get("statement_match")
+    if cached is not None and cached[0] == match_key:
+        result, unmatched = cached[1], cached[2]
+    else:
+        bank_bytes, book_bytes = bank_csv(), book_file.getvalue()
+        identity = (upload_digest(bank_id, bank_bytes), upload_digest(book_file.file_id, book_bytes), tolerance)
+        job = run_in_background("statement_match_job", reconcile_statements, bank_bytes, book_bytes, tolerance,
+                                label="Matching statement lines", identity=identity,
+                                restart=st.session_state.get("restart_statement_match", False))
+        outcome = job_outcome(job, show_partial=pass_table)
+        if outcome is None:
+            return
+        status, value = outcome
+        if status == "cancelled":
+            st.info("Matching was cancelled.")
+            st.button("Restart Matching", key="restart_statement_match")
+            return
+        if status == "failed":
+            if not isinstance(value, ValueError):
+                raise value
+            st.error(f"Could not read the statements: {value}")
+            return
+        result, unmatched = value
+        st.session_state["statement_match"] = (match_key, result, unmatched)
+    
+    pass_table(result.pass_counts())
+    st.markdown(f"""
+    - **Outstanding Checks:** ${result.outstanding_checks:,.2f}
+    - **Deposits in Transit:** ${result.deposits_in_transit:,.2f}
+    - **Bank Service Fees:** ${result.bank_fees:,.2f}
+    """)
+    if result.unrecorded_bank_credits:
+        st.warning(f"${result.unrecorded_bank_credits:,.2f} of bank credits (e.g. interest) are not in the cash book.")
+    reconciled = reconciled_balance(bank_balance, result.outstanding_checks, result.deposits_in_transit, result.bank_fees)
+    st.markdown(f"**Reconciled Cash Balance (Bank Method):** ${reconciled:,.2f}")
+    if abs(reconciled - ledger_balance) < 0.005:
+        st.success("The reconciled balance matches the company's ledger balance.")
+    else:
+        st.info(f"Difference from the ledger balance: ${reconciled - ledger_balance:,.2f}")
+    
+    for i, (label, lines) in enumerate(unmatched.items()):
+        if len(lines):
+            with st.expander(f"{label} ({len(lines):,} lines)"):
+                paginated_dataframe(lines, key=f"unmatched_lines_{i}")
+
+def upload_digest(upload_id, data):
+    """SHA-256 of an upload's bytes, computed once per upload and kept for the session."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    if upload_id not in digests:
+        digests[upload_id] = hashlib.sha256(data).hexdigest()
+    return digests[upload_id]
+
+def pass_table(pass_counts):
+    show("table", lambda: [
+        {"Pass": name, "Bank Lines Matched": bank_lines, "Book Lines Matched": book_lines}
+        for name, (bank_lines, book_lines) in pass_counts.items()
+    ])
+
+# Each upload is ingested once and kept for the session: adding a download
+# only parses that file, and removing one rebuilds the store from the rest.
+@st.fragment
+def bank_feed_import():
+    st.markdown("### Import: Bank Feeds")
+    st.markdown("""
+    Upload OFX/QFX downloads or bank CSV exports (a date column, an `amount` column or `debit` and `credit`
+    columns, and optionally `reference`, `description` and `account`). Downloads may overlap: transactions
+    that were already imported are recognized and skipped.
+    """)
+    uploads = st.file_uploader("Bank Feeds (OFX, QFX or CSV)", type=["ofx", "qfx", "csv"],
+                               accept_multiple_files=True, key="bank_feed_files")
+    if not uploads:
+        st.session_state.pop("bank_feeds", None)
+        return
+    loaded, store = st.session_state.get("bank_feeds", ([], None))
+    if store is None or [upload.file_id for upload in uploads[:len(loaded)]] != loaded:
+        loaded, store = [], FeedStore()
+    for upload in uploads[len(loaded):]:
+        try:
+            store.ingest(upload, upload.name)
+        except ValueError as error:
+            st.error(f"Could not read {upload.name}: {error}")
+        loaded.append(upload.file_id)
+    st.session_state["bank_feeds"] = (loaded, store)
+    if not len(store):
+        return
+
+    show("dataframe", lambda: pd.DataFrame(store.files), hide_index=True)
+    accounts = store.accounts()
+    show("dataframe", lambda: accounts, hide_index=True)
+    account = st.selectbox("Account", options=list(accounts["Account"]), key="bank_feed_account")
+    paginated_dataframe(store.transactions(account), key="bank_feed_transactions")
+    balance = store.ledger_balance(account)
+    if balance is not None and st.button(f"Use the ${balance:,.2f} Ledger Balance as the Bank Statement Balance",
+                                         key="use_feed_balance"):
+        st.session_state["feed_bank_balance"] = balance
+        st.rerun()
+
+def feed_statement():
+    """(id, CSV getter) for the account picked under Bank Feeds, or (None, None)."""
+    loaded, store = st.session_state.get("bank_feeds", ([], None))
+    account = st.session_state.get("bank_feed_account")
+    if store is None or account is None:
+        return None, None
+    return ("feed", tuple(loaded), account), lambda: store.statement_csv(account)
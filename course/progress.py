@@ -0,0 +1,247 @@
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+
+import pandas as pd
+
+# --- Learner Progress Store ---
+# Quiz and exercise submissions saved to SQLite so they outlive the session.
+# The database runs in WAL mode: readers never wait for the writer, and the
+# writer appends to the log instead of rewriting pages in place.
+#
+# Submitting never touches the disk on the script thread. ``submit`` puts the
+# attempt on a queue; one background writer takes everything queued (up to
+# BATCH_SIZE attempts, waiting at most BATCH_WAIT seconds for more) and
+# inserts the batch in a single transaction.
+#
+# The same transaction keeps two summary tables up to date, so cohort
+# queries read a few indexed rows instead of scanning every answer:
+#
+#   score_summary      (section, score, total) -> attempts
+#   question_summary   (section, question) -> attempts, errors
+#
+# Free-text answers are stored with ``correct`` NULL and are not scored.
+#
+# A batch that fails to write (a database error, or a malformed submission)
+# is dropped, and the writer carries on with the next one. The error is kept
+# in ``error`` and raised once from the next ``submit`` or ``flush``, so the
+# page can report it.
+
+DEFAULT_PATH = os.environ.get("COURSE_PROGRESS_DB", "course_progress.db")
+POOL_SIZE = 4
+BATCH_SIZE = 500
+BATCH_WAIT = 0.05  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    attempt TEXT PRIMARY KEY,
+    learner TEXT NOT NULL,
+    section TEXT NOT NULL,
+    submitted REAL NOT NULL,
+    score INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_learner ON attempts (learner, section, submitted);
+CREATE INDEX IF NOT EXISTS attempts_section ON attempts (section, submitted);
+CREATE TABLE IF NOT EXISTS answers (
+    attempt TEXT NOT NULL REFERENCES attempts (attempt),
+    question TEXT NOT NULL,
+    answer TEXT,
+    correct INTEGER
+);
+CREATE INDEX IF NOT EXISTS answers_attempt ON answers (attempt);
+CREATE TABLE IF NOT EXISTS score_summary (
+    section TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    PRIMARY KEY (section, score, total)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS question_summary (
+    section TEXT NOT NULL,
+    question TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    PRIMARY KEY (section, question)
+) WITHOUT ROWID;
+"""
+
+
+class ConnectionPool:
+    """A fixed number of SQLite connections shared by every thread."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.size = size
+        self.opened = 0
+
+    def open(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.lock:
+            new = self.idle.empty() and self.opened < self.size
+            if new:
+                self.opened += 1
+        connection = self.open() if new else self.idle.get()
+        try:
+            yield connection
+        finally:
+            self.idle.put(connection)
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get().close()
+
+
+class ProgressStore:
+    """Learner attempts in SQLite, written behind the caller on a worker thread."""
+
+    def __init__(self, path=DEFAULT_PATH, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+        self.pending = queue.Queue()
+        self.error = None  # last write failure, if any
+        self.unreported = None  # a write failure not yet raised to a caller
+        self.writer = threading.Thread(target=self.write_behind, name="progress-writer", daemon=True)
+        self.writer.start()
+
+    # --- Writing --------------------------------------------------------------
+
+    def submit(self, learner, section, answers):
+        """Queue one attempt; ``answers`` is an iterable of (question, answer, correct).
+
+        ``correct`` is True/False for scored questions and None for free text.
+        Returns the attempt id without waiting for the write.
+        """
+        answers = [(str(question), None if answer is None else str(answer), None if correct is None else bool(correct))
+                   for question, answer, correct in answers]
+        scored = [correct for _, _, correct in answers if correct is not None]
+        attempt = uuid.uuid4().hex
+        self.pending.put({
+            "attempt": attempt,
+            "learner": str(learner),
+            "section": section,
+            "submitted": time.time(),
+            "score": sum(scored),
+            "total": len(scored),
+            "answers": answers,
+        })
+        self.raise_failure()
+        return attempt
+
+    def flush(self):
+        """Block until every queued attempt has been written (or has failed)."""
+        self.pending.join()
+        self.raise_failure()
+
+    def raise_failure(self):
+        """Raise the error of a write that failed since the last call, once."""
+        error, self.unreported = self.unreported, None
+        if error is not None:
+            raise error
+
+    def write_behind(self):
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.pending.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as error:  # keep writing later batches
+                self.error = self.unreported = error
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def write(self, batch):
+        scores = Counter((item["section"], item["score"], item["total"]) for item in batch if item["total"])
+        questions = Counter()
+        errors = Counter()
+        for item in batch:
+            for question, _, correct in item["answers"]:
+                if correct is not None:
+                    questions[item["section"], question] += 1
+                    errors[item["section"], question] += not correct
+        with self.pool.connection() as connection, connection:
+            connection.executemany(
+                "INSERT INTO attempts VALUES (:attempt, :learner, :section, :submitted, :score, :total)", batch)
+            connection.executemany(
+                "INSERT INTO answers VALUES (?, ?, ?, ?)",
+                [(item["attempt"], question, answer, correct)
+                 for item in batch for question, answer, correct in item["answers"]])
+            connection.executemany(
+                "INSERT INTO score_summary VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (section, score, total) DO UPDATE SET attempts = attempts + excluded.attempts",
+                [(*key, count) for key, count in scores.items()])
+            connection.executemany(
+                "INSERT INTO question_summary VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (section, question) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, errors = errors + excluded.errors",
+                [(*key, count, errors[key]) for key, count in questions.items()])
+
+    # --- Reading --------------------------------------------------------------
+
+    def query(self, sql, parameters=(), columns=None):
+        with self.pool.connection() as connection:
+            cursor = connection.execute(sql, parameters)
+            rows = cursor.fetchall()
+            names = columns or [description[0] for description in cursor.description]
+        return pd.DataFrame(rows, columns=names)
+
+    def score_distribution(self, section):
+        """Attempts per score for a section, from the summary table."""
+        return self.query(
+            "SELECT score, total, attempts FROM score_summary WHERE section = ? ORDER BY total, score",
+            (section,), ["Score", "Out Of", "Attempts"])
+
+    def question_error_rates(self, section):
+        frame = self.query(
+            "SELECT question, attempts, errors FROM question_summary WHERE section = ? ORDER BY question",
+            (section,), ["Question", "Attempts", "Errors"])
+        frame["Error Rate"] = (frame["Errors"] / frame["Attempts"]).round(3)
+        return frame
+
+    def responses(self, section, limit=50):
+        """The latest free-text answers for a section."""
+        return self.query(
+            "SELECT attempts.submitted, answers.question, answers.answer FROM attempts "
+            "JOIN answers ON answers.attempt = attempts.attempt "
+            "WHERE attempts.section = ? AND answers.correct IS NULL ORDER BY attempts.submitted DESC LIMIT ?",
+            (section, limit), ["Submitted", "Question", "Answer"]).assign(
+                Submitted=lambda frame: pd.to_datetime(frame["Submitted"], unit="s"))
+
+    def learner_answers(self, learner, section):
+        """Every scored answer a learner gave in a section, oldest first."""
+        return self.query(
+            "SELECT answers.question, answers.correct FROM attempts "
+            "JOIN answers ON answers.attempt = attempts.attempt "
+            "WHERE attempts.learner = ? AND attempts.section = ? AND answers.correct IS NOT NULL "
+            "ORDER BY attempts.submitted, answers.rowid",
+            (learner, section), ["Question", "Correct"])
+
+    def learner_attempts(self, learner, section=None):
+        sql = "SELECT section, submitted, score, total FROM attempts WHERE learner = ?"
+        parameters = [learner]
+        if section is not None:
+            sql += " AND section = ?"
+            parameters.append(section)
+        frame = self.query(sql + " ORDER BY submitted", parameters, ["Section", "Submitted", "Score", "Out Of"])
+        frame["Submitted"] = pd.to_datetime(frame["Submitted"], unit="s")
+        return frame
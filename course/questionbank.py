@@ -0,0 +1,293 @@
+import hashlib
+
+import numpy as np
+import streamlit as st
+
+# --- Adaptive Question Bank ---
+# Thousands of parameterized questions (accruals, depreciation, revenue
+# recognition) generated once per process. Each Template draws its amounts for
+# every variant at once with NumPy and computes the answer next to three
+# distractors built from common mistakes (a full year of interest instead of
+# the months elapsed, cost instead of cost less salvage, ...). Amounts are
+# whole cents; variants whose options are not all distinct are dropped.
+#
+# The bank keeps, per template, a parameter matrix, the four options in
+# display order and the index of the correct one. Questions are numbered
+# across templates, and the numbers of each (topic, level) cell are shuffled
+# once into ``cells``. Only the question shown is formatted into text.
+#
+# Picking the next question never scans or regenerates the bank. A Learner
+# holds a level per topic (up after two correct answers in a row, down after a
+# wrong one) and how many questions it has drawn from each cell. The bank
+# takes the weakest topic at its level and walks that cell with an offset and a
+# stride coprime to the cell size, both derived from the learner's seed: a
+# permutation of the cell, different for every learner, reached in O(1) with
+# no per-learner state beyond a counter. Starting an exam for a whole cohort
+# therefore costs a hash per learner, and a learner who comes back continues
+# where their saved answers left off (see Learner.replay).
+
+VARIANTS = 1000  # per template
+LEVELS = (1, 2, 3)
+TOPICS = {"accruals": "Accruals", "depreciation": "Depreciation", "revenue": "Revenue Recognition"}
+FORMATS = {
+    "money": lambda cents: f"${cents / 100:,.2f}",
+    "percent": lambda basis_points: f"{basis_points / 100:g}%",
+    "count": str,
+}
+
+
+class Template:
+    """A question with parameters: ``generate(rng, n)`` returns the parameter
+    arrays and the answer followed by three distractors, in cents."""
+
+    def __init__(self, key, topic, level, prompt, fields, generate):
+        self.key = key
+        self.topic = topic
+        self.level = level
+        self.prompt = prompt
+        self.fields = fields
+        self.generate = generate
+
+
+def whole_dollars(rng, low, high, n, step=1):
+    return rng.integers(low // step, high // step + 1, n) * step * 100
+
+
+def accrued_wages(rng, n):
+    payroll = whole_dollars(rng, 2_000, 20_000, n, step=50)
+    days = rng.integers(1, 5, n)
+    return {"payroll": payroll, "days": days}, [payroll * days / 5, payroll, payroll * (5 - days) / 5,
+                                                payroll * days / 7]
+
+
+def accrued_interest(rng, n):
+    principal = whole_dollars(rng, 5_000, 500_000, n, step=1_000)
+    rate = rng.integers(4, 25, n) * 50
+    months = rng.integers(1, 12, n)
+    yearly = principal * rate / 10_000
+    return {"principal": principal, "rate": rate, "months": months}, [yearly * months / 12, yearly,
+                                                                      yearly / 12, yearly * months]
+
+
+def prepaid_insurance(rng, n):
+    term = rng.choice([6, 12, 24], n)
+    cost = whole_dollars(rng, 600, 24_000, n, step=24)
+    elapsed = rng.integers(1, term)
+    return {"term": term, "cost": cost, "elapsed": elapsed}, [cost * (term - elapsed) / term,
+                                                              cost * elapsed / term, cost, cost / term]
+
+
+def straight_line(rng, n):
+    cost = whole_dollars(rng, 5_000, 500_000, n, step=1_000)
+    salvage = (cost * rng.integers(1, 21, n) // 100) // 50_000 * 50_000 + 50_000
+    life = rng.integers(3, 41, n)
+    return {"cost": cost, "salvage": salvage, "life": life}, [(cost - salvage) / life, cost / life,
+                                                              (cost + salvage) / life, (cost - salvage) / (life - 1)]
+
+
+def book_value(rng, n):
+    values, _ = straight_line(rng, n)
+    cost, salvage, life = values["cost"], values["salvage"], values["life"]
+    years = rng.integers(1, life)
+    yearly = (cost - salvage) / life
+    values["years"] = years
+    return values, [cost - years * yearly, years * yearly, cost - years * cost / life,
+                    cost - salvage - years * yearly]
+
+
+def double_declining(rng, n):
+    cost = whole_dollars(rng, 5_000, 500_000, n, step=1_000)
+    salvage = cost // 10
+    life = rng.integers(3, 11, n)
+    first = cost * 2 / life
+    return {"cost": cost, "salvage": salvage, "life": life}, [(cost - first) * 2 / life, first,
+                                                              (cost - salvage) / life, (cost - salvage) * 2 / life]
+
+
+def rent_in_advance(rng, n):
+    rent = whole_dollars(rng, 500, 5_000, n, step=25)
+    term = rng.choice([3, 6, 12], n)
+    elapsed = rng.integers(1, term)
+    return {"total": rent * term, "term": term, "elapsed": elapsed}, rent, term, elapsed
+
+
+def rent_earned(rng, n):
+    values, rent, term, elapsed = rent_in_advance(rng, n)
+    return values, [rent * elapsed, rent * term, rent * (term - elapsed), rent]
+
+
+def unearned_rent(rng, n):
+    values, rent, term, elapsed = rent_in_advance(rng, n)
+    return values, [rent * (term - elapsed), rent * elapsed, rent * term, rent]
+
+
+def straight_line_rent(rng, n):
+    rent = whole_dollars(rng, 1_000, 10_000, n, step=50)
+    term = rng.choice([12, 24, 36, 48, 60], n)
+    free = rng.integers(1, 7, n)
+    return {"term": term, "free": free, "rent": rent}, [rent * (term - free) / term, rent,
+                                                        rent * term / (term - free), rent * (12 - free) / 12]
+
+
+TEMPLATES = (
+    Template("accrued-wages", "accruals", 1,
+             "Weekly payroll of {payroll} for a five-day week is paid every Friday. The month ends after "
+             "day {days} of the week. How much wages expense should be accrued at month end?",
+             {"payroll": "money", "days": "count"}, accrued_wages),
+    Template("accrued-interest", "accruals", 2,
+             "A {principal} note payable carries {rate} annual interest. It was signed {months} months before "
+             "year end and no interest has been paid. How much interest should be accrued at year end?",
+             {"principal": "money", "rate": "percent", "months": "count"}, accrued_interest),
+    Template("prepaid-insurance", "accruals", 3,
+             "A {term}-month insurance policy costing {cost} was paid in advance and recorded as Prepaid "
+             "Insurance. After the adjusting entries for {elapsed} months, what is the Prepaid Insurance balance?",
+             {"term": "count", "cost": "money", "elapsed": "count"}, prepaid_insurance),
+    Template("straight-line-depreciation", "depreciation", 1,
+             "Equipment costs {cost}, has a salvage value of {salvage} and a useful life of {life} years. "
+             "What is the annual straight-line depreciation?",
+             {"cost": "money", "salvage": "money", "life": "count"}, straight_line),
+    Template("book-value", "depreciation", 2,
+             "A building costs {cost}, has a salvage value of {salvage} and a useful life of {life} years. "
+             "What is its book value after {years} years of straight-line depreciation?",
+             {"cost": "money", "salvage": "money", "life": "count", "years": "count"}, book_value),
+    Template("double-declining-balance", "depreciation", 3,
+             "A vehicle costs {cost}, has a salvage value of {salvage} and a useful life of {life} years. "
+             "What is the depreciation expense in year 2 under the double-declining balance method?",
+             {"cost": "money", "salvage": "money", "life": "count"}, double_declining),
+    Template("rent-earned", "revenue", 1,
+             "A tenant pays {total} on the first of the month for {term} months of rent in advance. How much "
+             "rental revenue has been earned after {elapsed} months?",
+             {"total": "money", "term": "count", "elapsed": "count"}, rent_earned),
+    Template("unearned-rent", "revenue", 2,
+             "A tenant pays {total} on the first of the month for {term} months of rent in advance, recorded as "
+             "Unearned Rent. What is the Unearned Rent balance after {elapsed} months?",
+             {"total": "money", "term": "count", "elapsed": "count"}, unearned_rent),
+    Template("straight-line-rent", "revenue", 3,
+             "A {term}-month lease gives the tenant {free} months free, then charges {rent} per month. How much "
+             "rental revenue is recognized each month on a straight-line basis?",
+             {"term": "count", "free": "count", "rent": "money"}, straight_line_rent),
+)
+
+
+class BankQuestion:
+    def __init__(self, number, template, prompt, options, answer):
+        self.number = number
+        self.template = template
+        self.prompt = prompt
+        self.options = options
+        self.answer = answer
+
+
+class QuestionBank:
+    """Every template's variants, generated and indexed once; see the module comment."""
+
+    def __init__(self, variants=VARIANTS, seed=0, templates=TEMPLATES):
+        rng = np.random.default_rng(seed)
+        self.templates = templates
+        self.params, self.options, self.answers, self.starts = [], [], [], []
+        self.template_of = np.zeros(0, dtype=np.int16)
+        self.cell_of_template = {template.key: (template.topic, template.level) for template in templates}
+        members = {}
+        for code, template in enumerate(templates):
+            values, choices = template.generate(rng, variants * 4)
+            choices = np.round(np.column_stack(choices)).astype(np.int64)
+            ordered = np.sort(choices, axis=1)
+            usable = np.flatnonzero((ordered[:, 1:] != ordered[:, :-1]).all(axis=1) & (ordered[:, 0] > 0))[:variants]
+            # Show the options in a random order; the answer was column 0.
+            order = rng.permuted(np.tile(np.arange(choices.shape[1]), (len(usable), 1)), axis=1)
+            self.starts.append(len(self.template_of))
+            self.params.append(np.column_stack([values[name] for name in template.fields])[usable])
+            self.options.append(np.take_along_axis(choices[usable], order, axis=1))
+            self.answers.append((order == 0).argmax(axis=1).astype(np.int8))
+            numbers = np.arange(len(self.template_of), len(self.template_of) + len(usable))
+            members.setdefault((template.topic, template.level), []).append(numbers)
+            self.template_of = np.concatenate([self.template_of, np.full(len(usable), code, dtype=np.int16)])
+        self.cells = {cell: rng.permutation(np.concatenate(numbers)) for cell, numbers in members.items()}
+        self.cell_numbers = {cell: number for number, cell in enumerate(self.cells)}
+        self.strides = {cell: np.flatnonzero(np.gcd(np.arange(len(ids)), len(ids)) == 1)
+                        for cell, ids in self.cells.items()}
+        self.topics = tuple(dict.fromkeys(topic for topic, _ in self.cells))
+
+    def __len__(self):
+        return len(self.template_of)
+
+    def question(self, number):
+        """Question ``number`` formatted for display."""
+        code = int(self.template_of[number])
+        template, row = self.templates[code], number - self.starts[code]
+        params = dict(zip(template.fields, self.params[code][row].tolist()))
+        prompt = template.prompt.format(**{name: FORMATS[kind](params[name]) for name, kind in template.fields.items()})
+        options = tuple(FORMATS["money"](cents) for cents in self.options[code][row].tolist())
+        return BankQuestion(number, template, prompt, options, int(self.answers[code][row]))
+
+    def cell(self, number):
+        template = self.templates[int(self.template_of[number])]
+        return template.topic, template.level
+
+    def levels(self, topic):
+        return [level for level in LEVELS if (topic, level) in self.cells]
+
+    def pick(self, learner):
+        """The learner's next question, in constant time."""
+        topic = min(learner.topics, key=lambda name: (learner.level[name], learner.seen(name)))
+        levels = self.levels(topic)
+        cell = (topic, min(max(learner.level[topic], levels[0]), levels[-1]))
+        ids, strides = self.cells[cell], self.strides[cell]
+        mix = learner.mix(self.cell_numbers[cell])
+        stride = int(strides[mix % len(strides)])
+        return int(ids[(mix + learner.drawn.get(cell, 0) * stride) % len(ids)])
+
+
+def learner_seed(learner_id):
+    """A stable seed for a learner id, the same in every process."""
+    return int.from_bytes(hashlib.blake2b(str(learner_id).encode(), digest_size=8).digest(), "little")
+
+
+class Learner:
+    """One learner's place in the bank: a level per topic and questions drawn per cell."""
+
+    def __init__(self, seed, topics):
+        self.seed = seed
+        self.topics = tuple(topics)
+        self.level = {topic: LEVELS[0] for topic in self.topics}
+        self.streak = {topic: 0 for topic in self.topics}
+        self.drawn = {}
+        self.answered = {topic: 0 for topic in self.topics}
+
+    def mix(self, cell_number):
+        # Odd multiplier: a different offset (and stride) per cell from one seed.
+        return (self.seed ^ (cell_number * 0x9E3779B97F4A7C15)) % (1 << 61)
+
+    def seen(self, topic):
+        return self.answered.get(topic, 0)
+
+    def record(self, cell, correct):
+        topic, level = cell
+        self.drawn[cell] = self.drawn.get(cell, 0) + 1
+        if topic not in self.level:
+            return
+        self.answered[topic] += 1
+        if not correct:
+            self.level[topic] = max(LEVELS[0], level - 1)
+            self.streak[topic] = 0
+            return
+        self.streak[topic] += 1
+        if self.streak[topic] >= 2:
+            self.level[topic] = min(LEVELS[-1], level + 1)
+            self.streak[topic] = 0
+        else:
+            self.level[topic] = level
+
+    def replay(self, bank, history):
+        """Catch up on saved answers: (template key, correct) pairs, oldest first."""
+        for key, correct in history:
+            cell = bank.cell_of_template.get(key)
+            if cell is not None:
+                self.record(cell, bool(correct))
+        return self
+
+
+# Generated and indexed once per process; every session picks from the same bank.
+@st.cache_resource(show_spinner=False)
+def question_bank():
+    return QuestionBank()
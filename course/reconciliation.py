@@ -0,0 +1,302 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from course.jobs import report
+
+# --- Bank Reconciliation Matching ---
+# Matches a bank statement against the company's cash book and derives the
+# adjustments the Bank Reconciliation module asks for. Both files are CSVs with
+# a ``date`` and a signed ``amount`` column (positive = money in, negative =
+# money out) and an optional ``reference`` (check number, deposit slip, ...).
+#
+# Files are read in chunks and each chunk is reduced to three compact numeric
+# columns (day number, amount in cents, hashed reference), so memory is about
+# 20 bytes per line no matter how wide the CSV is. Matching never compares
+# every bank line with every book line; each pass is a sort or hash join:
+#
+#   1. reference + amount, ranked so duplicates pair off in date order
+#   2. amount within the date tolerance, nearest date first (merge_asof)
+#   3. one-to-many / many-to-one: lines grouped by reference or by day are
+#      summed and joined to single lines on the other side by amount
+#
+# Whatever is left over is classified: unmatched book payments are outstanding
+# checks, unmatched book receipts are deposits in transit, and unmatched bank
+# debits are bank service fees.
+#
+# ``reconcile_statements`` does the whole job from the two uploaded files and
+# reports progress after each pass, so the page can run it through
+# course.jobs while the learner keeps working.
+
+CHUNK_ROWS = 250_000
+NO_REFERENCE = np.uint64(0)
+UNMATCHED = -1
+MATCH_PASSES = ("Reference", "Amount & date", "Grouped")
+
+
+def reconciled_balance(bank_balance, outstanding_checks, deposits_in_transit, bank_fees):
+    return bank_balance - outstanding_checks + deposits_in_transit - bank_fees
+
+
+def parse_cents(values):
+    amounts = pd.to_numeric(values, errors="coerce")
+    if amounts.isna().any():
+        # Only pay for cleanup ("$1,500.00", "(15.00)") when plain parsing fails.
+        text = values.str.strip().str.replace(r"[,$\s]", "", regex=True)
+        text = text.str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+        amounts = pd.to_numeric(text, errors="coerce")
+    if amounts.isna().any():
+        bad = values[amounts.isna()].iloc[0]
+        raise ValueError(f"Could not read amount {bad!r}.")
+    return np.round(amounts.to_numpy(dtype=np.float64) * 100).astype(np.int64)
+
+
+def reference_hash(values):
+    normalized = values.str.strip().str.upper()
+    hashed = pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+    return np.where(normalized.to_numpy() == "", NO_REFERENCE, hashed)
+
+
+def read_transactions(source, chunksize=CHUNK_ROWS):
+    """Read a statement CSV into compact ``day``, ``cents`` and ``ref`` columns.
+
+    Row positions in the result are line positions in the file, so matched or
+    unmatched lines can be looked up again with ``read_rows``.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+    parts = []
+    reader = pd.read_csv(
+        source,
+        chunksize=chunksize,
+        dtype=str,
+        keep_default_na=False,
+        usecols=lambda column: column.strip().lower() in ("date", "amount", "reference"),
+    )
+    for chunk in reader:
+        chunk.columns = [column.strip().lower() for column in chunk.columns]
+        missing = {"date", "amount"} - set(chunk.columns)
+        if missing:
+            raise ValueError(f"Statement is missing column(s): {', '.join(sorted(missing))}.")
+        dates = pd.to_datetime(chunk["date"], format="mixed")
+        parts.append(pd.DataFrame({
+            "day": dates.to_numpy().astype("datetime64[D]").astype(np.int32),
+            "cents": parse_cents(chunk["amount"]),
+            "ref": reference_hash(chunk["reference"]) if "reference" in chunk else NO_REFERENCE,
+        }))
+    if not parts:
+        return pd.DataFrame({"day": np.array([], np.int32), "cents": np.array([], np.int64),
+                             "ref": np.array([], np.uint64)})
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_rows(source, rows, chunksize=CHUNK_ROWS):
+    """Re-read only the given line positions of a statement, chunk by chunk."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    rows = np.sort(np.asarray(rows, dtype=np.int64))
+    parts = []
+    for chunk in pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False):
+        lo, hi = np.searchsorted(rows, [chunk.index[0], chunk.index[-1] + 1]) if len(chunk) else (0, 0)
+        if hi > lo:
+            parts.append(chunk.loc[rows[lo:hi]])
+    return pd.concat(parts) if parts else pd.DataFrame()
+
+
+class Reconciliation:
+    """Match results for one bank statement / cash book pair.
+
+    ``bank_match`` and ``book_match`` hold a match id per line (UNMATCHED if
+    none); lines sharing an id were matched together. ``bank_pass`` and
+    ``book_pass`` index into MATCH_PASSES.
+    """
+
+    def __init__(self, bank, book, tolerance_days):
+        self.bank = bank
+        self.book = book
+        self.tolerance_days = tolerance_days
+        self.bank_match = np.full(len(bank), UNMATCHED, dtype=np.int64)
+        self.book_match = np.full(len(book), UNMATCHED, dtype=np.int64)
+        self.bank_pass = np.full(len(bank), UNMATCHED, dtype=np.int8)
+        self.book_pass = np.full(len(book), UNMATCHED, dtype=np.int8)
+        self.matches = 0
+
+    def record(self, bank_rows, book_rows, bank_ids, book_ids, match_pass):
+        """Mark rows as matched; ``*_ids`` are 0-based ids local to this call."""
+        self.bank_match[bank_rows] = self.matches + bank_ids
+        self.book_match[book_rows] = self.matches + book_ids
+        self.bank_pass[bank_rows] = match_pass
+        self.book_pass[book_rows] = match_pass
+        if len(bank_ids) or len(book_ids):
+            self.matches += int(max(np.max(bank_ids, initial=-1), np.max(book_ids, initial=-1))) + 1
+
+    def unmatched(self, side):
+        frame, match = (self.bank, self.bank_match) if side == "bank" else (self.book, self.book_match)
+        return frame[match == UNMATCHED]
+
+    def unmatched_rows(self, side, outflows):
+        frame = self.unmatched(side)
+        return frame.index[(frame["cents"] < 0) == outflows].to_numpy()
+
+    def unmatched_cents(self, side, outflows):
+        frame = self.unmatched(side)
+        selected = frame["cents"][(frame["cents"] < 0) == outflows]
+        return int(abs(selected.sum()))
+
+    @property
+    def outstanding_checks(self):
+        return self.unmatched_cents("book", outflows=True) / 100
+
+    @property
+    def deposits_in_transit(self):
+        return self.unmatched_cents("book", outflows=False) / 100
+
+    @property
+    def bank_fees(self):
+        return self.unmatched_cents("bank", outflows=True) / 100
+
+    @property
+    def unrecorded_bank_credits(self):
+        return self.unmatched_cents("bank", outflows=False) / 100
+
+    def pass_counts(self):
+        return {
+            name: (int((self.bank_pass == i).sum()), int((self.book_pass == i).sum()))
+            for i, name in enumerate(MATCH_PASSES)
+        }
+
+
+def match_by_reference(result):
+    """Pass 1: equal reference and amount; duplicates pair off by date rank."""
+    keys = ["ref", "cents"]
+    bank = result.unmatched("bank")
+    book = result.unmatched("book")
+    bank = bank[bank["ref"] != NO_REFERENCE].sort_values(keys + ["day"], kind="stable")
+    book = book[book["ref"] != NO_REFERENCE].sort_values(keys + ["day"], kind="stable")
+    bank = bank.assign(rank=bank.groupby(keys).cumcount(), bank_row=bank.index)
+    book = book.assign(rank=book.groupby(keys).cumcount(), book_row=book.index)
+    pairs = bank.merge(book, on=keys + ["rank"], suffixes=("_bank", "_book"))
+    pairs = pairs[(pairs["day_bank"] - pairs["day_book"]).abs() <= result.tolerance_days]
+    ids = np.arange(len(pairs))
+    result.record(pairs["bank_row"].to_numpy(), pairs["book_row"].to_numpy(), ids, ids, 0)
+
+
+def nearest_by_amount(left, right, tolerance_days):
+    """For each left line, the closest-dated unused right line of equal amount.
+
+    Returns (left_rows, right_rows) with every right row used at most once;
+    when several left lines want the same right line the closest one wins.
+    """
+    left = left.sort_values("day").assign(left_row=lambda frame: frame.index)
+    right = right.sort_values("day").assign(right_row=lambda frame: frame.index, right_day=lambda frame: frame["day"])
+    joined = pd.merge_asof(
+        left[["day", "cents", "left_row"]],
+        right[["day", "cents", "right_row", "right_day"]],
+        on="day",
+        by="cents",
+        tolerance=tolerance_days,
+        direction="nearest",
+    ).dropna(subset=["right_row"])
+    joined = joined.assign(gap=(joined["day"] - joined["right_day"]).abs())
+    joined = joined.sort_values("gap", kind="stable").drop_duplicates("right_row")
+    return joined["left_row"].to_numpy(), joined["right_row"].to_numpy().astype(np.int64)
+
+
+def match_by_amount(result, max_rounds=10):
+    """Pass 2: equal amount within the date tolerance, closest date first.
+
+    Each round is one merge_asof; lines that lost a tie retry against the
+    remaining lines in the next round.
+    """
+    for _ in range(max_rounds):
+        bank = result.unmatched("bank")
+        book = result.unmatched("book")
+        if bank.empty or book.empty:
+            return
+        bank_rows, book_rows = nearest_by_amount(bank, book, result.tolerance_days)
+        if not len(bank_rows):
+            return
+        ids = np.arange(len(bank_rows))
+        result.record(bank_rows, book_rows, ids, ids, 1)
+
+
+def grouped_lines(frame):
+    """Candidate groups of two or more lines: same reference, or same day and direction."""
+    by_reference = frame[frame["ref"] != NO_REFERENCE].groupby("ref").ngroup()
+    by_day = frame.groupby([frame["day"], frame["cents"] < 0]).ngroup()
+    for labels in (by_reference, by_day):
+        sizes = labels.map(labels.value_counts())
+        labels = labels[sizes >= 2]
+        if labels.empty:
+            continue
+        members = frame.loc[labels.index]
+        groups = members.groupby(labels.to_numpy()).agg(day=("day", "max"), cents=("cents", "sum"))
+        yield groups, labels
+
+
+def match_groups(result, many_side):
+    """Pass 3: several lines on ``many_side`` that sum to one line on the other."""
+    one_side = "bank" if many_side == "book" else "book"
+    for groups, labels in grouped_lines(result.unmatched(many_side)):
+        # Groups may overlap with lines already taken by an earlier grouping.
+        still_open = (result.bank_match if many_side == "bank" else result.book_match)[labels.index] == UNMATCHED
+        open_groups = pd.Series(still_open).groupby(labels.to_numpy()).all()
+        groups = groups[open_groups.reindex(groups.index, fill_value=False)]
+        singles = result.unmatched(one_side)
+        if groups.empty or singles.empty:
+            continue
+        group_ids, single_rows = nearest_by_amount(groups, singles, result.tolerance_days)
+        ids = np.arange(len(group_ids))
+        local_id = pd.Series(ids, index=group_ids)
+        members = labels[labels.isin(group_ids)]
+        member_rows = members.index.to_numpy()
+        member_ids = local_id.loc[members.to_numpy()].to_numpy()
+        if many_side == "bank":
+            result.record(member_rows, single_rows, member_ids, ids, 2)
+        else:
+            result.record(single_rows, member_rows, ids, member_ids, 2)
+
+
+STAGES = (
+    ("Matching by reference", match_by_reference),
+    ("Matching by amount and date", match_by_amount),
+    ("Matching grouped book lines", lambda result: match_groups(result, many_side="book")),
+    ("Matching grouped bank lines", lambda result: match_groups(result, many_side="bank")),
+)
+UNMATCHED_LINES = (
+    ("Outstanding Checks", "book", True),
+    ("Deposits in Transit", "book", False),
+    ("Bank Service Fees", "bank", True),
+)
+
+
+def reconcile(bank, book, tolerance_days=3, start=0.0, end=1.0):
+    """Match a bank statement against a cash book (both from read_transactions).
+
+    Progress from ``start`` to ``end`` is reported between passes when running
+    as a background job.
+    """
+    result = Reconciliation(bank, book, tolerance_days)
+    for i, (message, match) in enumerate(STAGES):
+        report(start + (end - start) * i / len(STAGES), message, result.pass_counts())
+        match(result)
+    return result
+
+
+def reconcile_statements(bank_csv, book_csv, tolerance_days=3):
+    """Read and match two statement CSVs given as bytes.
+
+    Returns the Reconciliation and, per adjustment in UNMATCHED_LINES, the
+    full CSV rows of the unmatched lines behind it.
+    """
+    sources = {"bank": io.BytesIO(bank_csv), "book": io.BytesIO(book_csv)}
+    report(0.0, "Reading the bank statement")
+    bank = read_transactions(sources["bank"])
+    report(0.15, "Reading the cash book")
+    book = read_transactions(sources["book"])
+    result = reconcile(bank, book, tolerance_days, start=0.3, end=0.9)
+    report(0.9, "Collecting unmatched lines", result.pass_counts())
+    unmatched = {label: read_rows(sources[side], result.unmatched_rows(side, outflows))
+                 for label, side, outflows in UNMATCHED_LINES}
+    return result, unmatched
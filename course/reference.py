@@ -0,0 +1,89 @@
+import functools
+import hashlib
+import json
+import os
+from types import MappingProxyType
+
+import streamlit as st
+
+# --- Shared Reference Data ---
+# Option lists, answer keys and example tables are immutable course content.
+# They are loaded from course/content/*.json once per process and shared by
+# every session through st.cache_resource, instead of being rebuilt on every
+# rerun of every session. The cache key is a digest of the content files, so
+# editing a file invalidates the store on the next rerun.
+#
+# Everything handed out is read-only (mappings are proxies, lists are tuples);
+# DataFrames are shared as well and must not be modified in place.
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+
+
+def content_files():
+    return sorted(
+        os.path.join(CONTENT_DIR, name)
+        for name in os.listdir(CONTENT_DIR)
+        if name.endswith(".json")
+    )
+
+
+def content_digest():
+    return files_digest(content_files())
+
+
+def files_digest(paths):
+    # stat() is cheap enough for every rerun; the files are only re-read and
+    # re-hashed when a name, size or modification time changes.
+    signature = tuple(
+        (path, stat.st_size, stat.st_mtime_ns)
+        for path, stat in ((path, os.stat(path)) for path in paths)
+    )
+    return hash_content(signature)
+
+
+@functools.lru_cache(maxsize=8)
+def hash_content(signature):
+    digest = hashlib.sha256()
+    for path, _, _ in signature:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_reference_data(digest):
+    data = {}
+    for path in content_files():
+        with open(path, encoding="utf-8") as f:
+            data[os.path.splitext(os.path.basename(path))[0]] = freeze(json.load(f))
+    return MappingProxyType(data)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def load_reference_frame(digest, section, name):
+    import pandas as pd
+
+    spec = load_reference_data(digest)[section][name]
+    return pd.DataFrame(
+        {column: list(values) for column, values in spec["data"].items()},
+        index=list(spec["index"]) if "index" in spec else None,
+    )
+
+
+def reference_data(section):
+    """Read-only content of ``course/content/<section>.json``."""
+    return load_reference_data(content_digest())[section]
+
+
+def reference_frame(section, name):
+    """Shared DataFrame built from a ``{"data": ..., "index": ...}`` entry."""
+    return load_reference_frame(content_digest(), section, name)
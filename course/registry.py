@@ -0,0 +1,14 @@
+from course.catalog import course_catalog
+
+
+# --- Page Registry ---
+# The sidebar lists the pages of the content catalog (course/content/pages/,
+# see course.catalog) in file order. Pages are compiled once per process;
+# their exercise modules are imported the first time an exercise renders
+# (Python caches them in sys.modules afterwards), so a rerun only pays for the
+# page being viewed and heavy libraries such as pandas are only loaded by the
+# pages that use them.
+
+def pages():
+    """Sidebar label -> catalog Page, recompiled when a page file changes."""
+    return course_catalog().pages
@@ -0,0 +1,343 @@
+import numpy as np
+import pandas as pd
+
+from course.depreciation import column
+from course.journal import encode_dates, encode_labels, to_cents
+from course.recurring import Schedule
+
+# --- Straight-Line Rent Recognition ---
+# Recognizes rental income for a whole rent roll on a straight-line basis.
+# The rent roll has one row per lease: ``lease``, ``start`` and ``end`` dates
+# (both inclusive), ``monthly_rent`` and optionally ``property``,
+# ``escalation`` (e.g. 0.03 for 3% per step), ``escalation_months`` (months
+# between steps, default 12), ``free_months`` (rent-free lease months at the
+# start) and ``incentive`` (a lump sum paid to the tenant at the start).
+#
+# Every lease is expanded to one row per calendar month it touches, for the
+# whole portfolio at once with array operations:
+#
+#   cash          rent billed: each lease month's rent (escalated, zero while
+#                 rent-free) prorated by its days in the calendar month, so
+#                 mid-month starts, ends and anniversaries split correctly
+#   straight-line total rent over the term spread evenly by day
+#   amortization  the incentive spread evenly by day (reduces income)
+#   accrued       straight-line rent recognized minus cash billed so far:
+#                 straight-line rent receivable when positive, deferred
+#                 rent when negative
+#   unamortized   the incentive not yet amortized
+#
+# Spread amounts are computed from cumulative days and rounded once, in
+# integer cents, so each lease's straight-line rent sums exactly to its total
+# cash rent and the accrued balance ends at zero.
+#
+# RecognitionEngine keeps the last result and a hash of every lease's terms.
+# Recognizing an amended rent roll only recomputes the leases whose hash
+# changed; the other leases' rows are copied over.
+
+TERM_COLUMNS = ("property", "start", "end", "rent", "escalation", "escalation_months", "free_months", "incentive")
+RECEIVABLE_ACCOUNT = "Accounts Receivable"
+STRAIGHT_LINE_ACCOUNT = "Straight-Line Rent Receivable"
+INCOME_ACCOUNT = "Rental Income"
+AMORTIZATION_ACCOUNT = "Lease Incentive Amortization"
+INCENTIVE_ACCOUNT = "Lease Incentives"
+CASH_ACCOUNT = "Cash"
+# Journal lines per lease month: (account, category, entry type, amount column).
+LINE_TEMPLATE = (
+    (RECEIVABLE_ACCOUNT, "Asset", 0, "cash"),
+    (STRAIGHT_LINE_ACCOUNT, "Asset", 0, "accrual"),
+    (STRAIGHT_LINE_ACCOUNT, "Asset", 1, "deferral"),
+    (INCOME_ACCOUNT, "Revenue", 1, "straight_line"),
+    (AMORTIZATION_ACCOUNT, "Revenue", 0, "amortization"),
+    (INCENTIVE_ACCOUNT, "Asset", 1, "amortization"),
+    (INCENTIVE_ACCOUNT, "Asset", 0, "incentive_paid"),
+    (CASH_ACCOUNT, "Asset", 1, "incentive_paid"),
+)
+
+
+def read_rent_roll(frame):
+    """Validate and encode a rent roll; dates become day numbers, amounts cents."""
+    frame = frame.rename(columns=lambda name: str(name).strip().lower().replace(" ", "_")).reset_index(drop=True)
+    missing = {"lease", "start", "end", "monthly_rent"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"Rent roll is missing column(s): {', '.join(sorted(missing))}.")
+    leases = frame["lease"].astype(str).str.strip()
+    if leases.duplicated().any():
+        raise ValueError(f"Duplicate lease id: {leases[leases.duplicated()].iloc[0]}")
+    start = pd.to_datetime(frame["start"], errors="coerce").to_numpy().astype("datetime64[D]")
+    end = pd.to_datetime(frame["end"], errors="coerce").to_numpy().astype("datetime64[D]")
+    if np.isnat(start).any() or np.isnat(end).any():
+        raise ValueError("Every lease needs a start and an end date.")
+    if (end < start).any():
+        raise ValueError(f"Lease {leases[end < start].iloc[0]} ends before it starts.")
+    roll = pd.DataFrame({
+        "lease": leases,
+        "property": column(frame, "property", "").fillna("").astype(str),
+        "start": start.astype(np.int64),
+        "end": end.astype(np.int64),
+        "rent": to_cents(frame["monthly_rent"].fillna(0)),
+        "escalation": pd.to_numeric(column(frame, "escalation", 0)).fillna(0).to_numpy(dtype=np.float64),
+        "escalation_months": pd.to_numeric(column(frame, "escalation_months", 12)).fillna(12).to_numpy(np.int64),
+        "free_months": pd.to_numeric(column(frame, "free_months", 0)).fillna(0).to_numpy(dtype=np.int64),
+        "incentive": to_cents(column(frame, "incentive", 0).fillna(0)),
+    })
+    if (roll["escalation_months"] <= 0).any():
+        raise ValueError("Escalation months must be positive.")
+    if ((roll["rent"] < 0) | (roll["incentive"] < 0) | (roll["free_months"] < 0)).any():
+        raise ValueError("Rent, incentive and free months cannot be negative.")
+    return roll
+
+
+def lease_sums(values, first_row, count):
+    """Running totals of ``values`` restarting at each lease's first row."""
+    totals = np.cumsum(values)
+    return totals - np.repeat(totals[first_row] - values[first_row], count)
+
+
+def spread(total, cumulative_days, term_days, first_row):
+    """Cumulative and per-month shares of ``total`` by days elapsed, in whole cents."""
+    cumulative = (2 * total * cumulative_days + term_days) // (2 * term_days)
+    previous = np.zeros_like(cumulative)
+    previous[1:] = cumulative[:-1]
+    previous[first_row] = 0
+    return cumulative, cumulative - previous
+
+
+def lease_months(start, end):
+    """Expand leases to one row per calendar month they touch.
+
+    ``start`` and ``end`` are inclusive day numbers. Returns the per-row
+    arrays (lease, k = calendar month of the lease from 0, month, first and
+    last day of the lease in that month, month length) and the rows per lease.
+    """
+    start_month = start.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    count = end.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) - start_month + 1
+    first_row = np.cumsum(count) - count
+    lease = np.repeat(np.arange(len(start), dtype=np.int32), count)
+    k = np.arange(int(count.sum()), dtype=np.int64) - np.repeat(first_row, count)
+    month = start_month[lease] + k
+    month_first = month.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    month_length = (month + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - month_first
+    return {
+        "lease": lease,
+        "k": k,
+        "month": month,
+        "month_first": month_first,
+        "month_length": month_length,
+        "first_day": np.maximum(month_first, start[lease]),
+        "last_day": np.minimum(month_first + month_length - 1, end[lease]),
+    }, count
+
+
+def lease_periods(roll):
+    """One row per lease and calendar month; see the module comment."""
+    start = roll["start"].to_numpy()
+    end = roll["end"].to_numpy()
+    calendar, count = lease_months(start, end)
+    lease, k, month = calendar["lease"], calendar["k"], calendar["month"]
+    month_first, month_length = calendar["month_first"], calendar["month_length"]
+    first_day, last_day = calendar["first_day"], calendar["last_day"]
+    first_row = np.cumsum(count) - count
+    # Lease month k starts on the start day of month, clipped to short months.
+    start_month_first = start.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]")
+    day_of_month = start - start_month_first.astype(np.int64)
+    anniversary = np.where(k == 0, start[lease], month_first + np.minimum(day_of_month[lease], month_length - 1))
+    days_before = np.clip(np.minimum(anniversary, last_day + 1) - first_day, 0, None)  # in lease month k - 1
+    days_after = np.clip(last_day + 1 - np.maximum(anniversary, first_day), 0, None)  # in lease month k
+
+    rent = roll["rent"].to_numpy()[lease].astype(np.float64)
+    growth = 1 + roll["escalation"].to_numpy()[lease]
+    steps = roll["escalation_months"].to_numpy()[lease]
+    free = roll["free_months"].to_numpy()[lease]
+
+    def lease_month_rent(m):
+        escalated = np.round(rent * growth ** (np.maximum(m, 0) // steps))
+        return np.where(m >= free, escalated, 0.0)
+
+    cash = np.round((days_before * lease_month_rent(k - 1) + days_after * lease_month_rent(k))
+                    / month_length).astype(np.int64)
+    days = days_before + days_after
+    cumulative_days = lease_sums(days, first_row, count)
+    term_days = (end - start + 1)[lease]
+    cash_to_date = lease_sums(cash, first_row, count)
+    total_cash = np.repeat(cash_to_date[first_row + count - 1], count)
+    straight_line_to_date, straight_line = spread(total_cash, cumulative_days, term_days, first_row)
+    incentive = roll["incentive"].to_numpy()[lease]
+    amortized, amortization = spread(incentive, cumulative_days, term_days, first_row)
+    return {
+        "lease": lease,
+        "month": month.astype(np.int32),
+        "period": (k + 1).astype(np.int32),
+        "days": days.astype(np.int32),
+        "cash": cash,
+        "straight_line": straight_line,
+        "amortization": amortization,
+        "accrued": straight_line_to_date - cash_to_date,
+        "unamortized": incentive - amortized,
+        "incentive_paid": np.where(k == 0, incentive, 0),
+    }, count
+
+
+def block_rows(starts, lengths):
+    """Row positions ``starts[i] : starts[i] + lengths[i]`` for every block, concatenated."""
+    total = int(lengths.sum())
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total)
+
+
+class Recognition:
+    """Straight-line recognition rows for a rent roll, grouped by lease."""
+
+    def __init__(self, roll, rows, count, versions, changes):
+        self.leases = pd.Index(roll["lease"].to_numpy(), name="lease")
+        self.properties = roll["property"].to_numpy()
+        self.rows = rows
+        self.count = count
+        self.first_row = np.cumsum(count) - count
+        self.versions = versions  # lease -> hash of its terms
+        self.changes = changes  # {"added": n, "changed": n, "removed": n, "reused": n}
+
+    def __len__(self):
+        return len(self.rows["cash"])
+
+    def lease_rows(self, lease):
+        position = self.leases.get_loc(lease)
+        return slice(self.first_row[position], self.first_row[position] + self.count[position])
+
+    def to_frame(self, start=0, stop=None):
+        rows = slice(start, stop)
+        values = {name: array[rows] for name, array in self.rows.items()}
+        return pd.DataFrame({
+            "Lease": self.leases.to_numpy()[values["lease"]],
+            "Property": self.properties[values["lease"]],
+            "Month": values["month"].astype("datetime64[M]").astype(str),
+            "Days": values["days"],
+            "Cash Rent ($)": values["cash"] / 100,
+            "Straight-Line Rent ($)": values["straight_line"] / 100,
+            "Incentive Amortization ($)": values["amortization"] / 100,
+            "Rental Income ($)": (values["straight_line"] - values["amortization"]) / 100,
+            "Accrued (Deferred) Rent ($)": values["accrued"] / 100,
+            "Unamortized Incentive ($)": values["unamortized"] / 100,
+        })
+
+    def lease_schedule(self, lease):
+        rows = self.lease_rows(lease)
+        return self.to_frame(rows.start, rows.stop).drop(columns=["Lease", "Property"])
+
+    def monthly_totals(self):
+        """Portfolio totals per calendar month."""
+        month = self.rows["month"]
+        first = int(month.min()) if len(month) else 0
+        position = month - first
+        totals = {name: np.bincount(position, self.rows[name]).astype(np.int64)
+                  for name in ("cash", "straight_line", "amortization", "accrued", "unamortized")}
+        months = np.arange(first, first + len(totals["cash"])).astype("datetime64[M]").astype(str)
+        return pd.DataFrame({
+            "Cash Rent ($)": totals["cash"] / 100,
+            "Straight-Line Rent ($)": totals["straight_line"] / 100,
+            "Rental Income ($)": (totals["straight_line"] - totals["amortization"]) / 100,
+            "Accrued (Deferred) Rent ($)": totals["accrued"] / 100,
+            "Unamortized Incentive ($)": totals["unamortized"] / 100,
+        }, index=pd.Index(months, name="Month"))
+
+    def journal(self, lease=None, month=None):
+        """Journal lines for one lease, one month (``"2025-03"``) or the whole roll.
+
+        Each lease month is one entry: Accounts Receivable for the rent
+        billed, Straight-Line Rent Receivable for the difference to
+        straight-line income, Rental Income, and the incentive amortization;
+        the first month also records the incentive paid.
+        """
+        rows = np.arange(len(self))
+        if lease is not None:
+            rows = rows[self.lease_rows(lease)]
+        if month is not None:
+            rows = rows[self.rows["month"][rows] == np.datetime64(month, "M").astype(np.int64)]
+        values = {name: self.rows[name][rows] for name in ("cash", "straight_line", "amortization", "incentive_paid")}
+        difference = values["straight_line"] - values["cash"]
+        values["accrual"] = np.maximum(difference, 0)
+        values["deferral"] = np.maximum(-difference, 0)
+        cents = np.stack([values[name] for *_, name in LINE_TEMPLATE], axis=1)
+        keep = cents != 0
+        entry, position = np.nonzero(keep)
+        accounts, (account_codes,) = encode_labels(np.array([account for account, *_ in LINE_TEMPLATE]))
+        categories, (category_codes,) = encode_labels(np.array([category for _, category, *_ in LINE_TEMPLATE]))
+        month_end = (self.rows["month"][rows] + 1).astype("datetime64[M]").astype("datetime64[D]") - 1
+        date, dates = encode_dates(month_end[entry])
+        return LeaseJournal(
+            lease=self.rows["lease"][rows][entry],
+            period=self.rows["period"][rows][entry],
+            entry=entry.astype(np.int32),
+            date=date,
+            account=account_codes[position],
+            category=category_codes[position],
+            entry_type=np.array([entry_type for _, _, entry_type, _ in LINE_TEMPLATE], dtype=np.int8)[position],
+            cents=cents[keep],
+            accounts=accounts,
+            categories=categories,
+            dates=dates,
+            lease_ids=self.leases.to_numpy(),
+        )
+
+
+class LeaseJournal(Schedule):
+    """Recognition journal lines; ``lease`` is a position in ``lease_ids``."""
+
+    def __init__(self, *args, lease_ids, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lease_ids = lease_ids
+
+    def leading_columns(self, rows, period_label="Lease Month", include_lease=True):
+        columns = super().leading_columns(rows, period_label, include_lease)
+        if include_lease:
+            columns["Lease"] = self.lease_ids[columns["Lease"]]
+        return columns
+
+
+class RecognitionEngine:
+    """Recognizes rent rolls, recomputing only leases amended since the last run."""
+
+    def __init__(self):
+        self.last = None  # Recognition
+
+    def recognize(self, frame):
+        roll = read_rent_roll(frame)
+        versions = pd.Series(pd.util.hash_pandas_object(roll[list(TERM_COLUMNS)], index=False).to_numpy(),
+                             index=pd.Index(roll["lease"].to_numpy()), dtype=np.uint64)
+        previous = self.last
+        if previous is None:
+            old_position = np.full(len(roll), -1)
+            removed = 0
+        else:
+            old_position = previous.versions.index.get_indexer(versions.index)
+            removed = len(previous.versions) - int((old_position >= 0).sum())
+        new = old_position < 0
+        changed = new.copy()
+        if previous is not None:
+            changed[~new] = previous.versions.to_numpy()[old_position[~new]] != versions.to_numpy()[~new]
+
+        fresh, fresh_count = lease_periods(roll[changed])
+        if changed.all():
+            rows, count = fresh, fresh_count
+        else:
+            # Reused leases' rows are copied from the previous result, then
+            # every lease's block is put back in rent roll order.
+            reused = old_position[~changed]
+            kept = block_rows(previous.first_row[reused], previous.count[reused])
+            count = np.empty(len(roll), dtype=np.int64)
+            count[~changed] = previous.count[reused]
+            count[changed] = fresh_count
+            source = np.empty(len(roll), dtype=np.int64)
+            source[~changed] = np.cumsum(previous.count[reused]) - previous.count[reused]
+            source[changed] = len(kept) + np.cumsum(fresh_count) - fresh_count
+            order = block_rows(source, count)
+            rows = {name: np.concatenate([previous.rows[name][kept], fresh[name]])[order]
+                    for name in fresh if name != "lease"}
+            rows["lease"] = np.repeat(np.arange(len(roll), dtype=np.int32), count)
+        changes = {
+            "added": int(new.sum()),
+            "changed": int((changed & ~new).sum()),
+            "removed": removed,
+            "reused": int((~changed).sum()),
+        }
+        self.last = Recognition(roll, rows, count, versions, changes)
+        return self.last
@@ -0,0 +1,324 @@
+import numpy as np
+import pandas as pd
+
+from course.chart_of_accounts import CATEGORIES
+from course.statements import Ledger
+
+# --- Ledger Snapshots ---
+# What-if scenarios ("post this accrual", "pay this invoice a month late")
+# branch from one ledger instead of copying it. A Snapshot never changes;
+# posting, voiding or merging returns a new one that reuses the old one's
+# chunks and appends its own:
+#
+#   chunks     tuple of Chunks, each the journal lines of one operation (a
+#              batch of entries, or the reversal of voided entries); the lines
+#              are read-only and shared by every snapshot that contains them
+#   root       the Ledger of the lines the lineage started from, shared
+#   delta      a Ledger of everything posted or voided since the root
+#   voided     entry numbers taken back out
+#
+# A branch is just another name for a snapshot, so dozens of sessions can each
+# keep many branches of one large ledger while holding its lines once. What a
+# branch owns is its delta: the chunks it added and a matrix of only the
+# accounts and months those touched. Statements read root + delta, assembled
+# on request (see Snapshot.ledger).
+#
+# Listing entries (e.g. to pick one to void) reads an entry index: each chunk
+# describes its own entries once, on first request, and a snapshot keeps the
+# concatenation of its chunks' descriptions without the voided entries.
+#
+# Voiding never rewrites a chunk. The entry's lines stay where they are (and
+# are hidden from listings) and a chunk with their reversal is appended, so the
+# delta nets them out. Rescheduling is a void plus the same lines reposted on
+# another date.
+#
+# Snapshots of one lineage share a prefix of chunks, so Diff and merge find the
+# fork point by chunk identity and only look at what each side appended since.
+# Merging replays one side's chunks onto the other; entry numbers the source
+# assigned after the fork are moved past the target's. An entry both sides
+# voided since the fork is a conflict.
+
+CHUNK_LINES = 1 << 16
+
+
+class Chunk:
+    """Journal lines appended by one operation; ``voids`` lists the entries a reversal chunk takes out."""
+
+    def __init__(self, journals, voids=frozenset()):
+        for journal in journals:
+            for values in journal.columns().values():
+                values.setflags(write=False)
+        self.journals = journals
+        self.voids = voids
+        entries = [journal.entry for journal in journals if len(journal)]
+        self.first = min(int(entry.min()) for entry in entries) if entries else 0
+        self.last = max(int(entry.max()) for entry in entries) if entries else -1
+        self.lines = sum(len(journal) for journal in journals)
+        self.index = None
+
+    def entries(self):
+        """Date and accounts (joined with " / ") of each entry in this chunk, indexed by entry number."""
+        if self.index is None:
+            journals = [journal for journal in self.journals if len(journal)]
+            entry = np.concatenate([journal.entry for journal in journals]) if journals else np.array([], np.int32)
+            order = np.argsort(entry, kind="stable")
+            entry = entry[order]
+            first = np.r_[True, entry[1:] != entry[:-1]] if len(entry) else np.array([], bool)
+            starts = np.flatnonzero(first)
+            dates = np.concatenate([journal.dates[journal.date] for journal in journals] or
+                                   [np.array([], "datetime64[D]")])[order]
+            names = np.concatenate([np.asarray(journal.accounts, dtype=object)[journal.account]
+                                    for journal in journals] or [np.array([], object)])[order]
+            # One string per entry: names prefixed with " / " after the first, summed per entry.
+            labels = np.where(first, "", " / ").astype(object) + names
+            self.index = pd.DataFrame({
+                "Date": dates[starts],
+                "Accounts": np.add.reduceat(labels, starts) if len(starts) else labels,
+            }, index=pd.Index(entry[starts], name="Entry"))
+        return self.index
+
+    def renumbered(self, start, offset):
+        """This chunk with entries from ``start`` on moved by ``offset``."""
+        if not offset:
+            return self
+        journals = tuple(journal.replace(entry=np.where(journal.entry >= start, journal.entry + offset,
+                                                        journal.entry).astype(np.int32))
+                         for journal in self.journals)
+        return Chunk(journals, frozenset(entry + offset if entry >= start else entry for entry in self.voids))
+
+
+def entry_lines(chunks, entries):
+    """Journals of the posted lines of ``entries`` (sorted entry numbers) found in ``chunks``."""
+    found = []
+    for chunk in chunks:
+        if chunk.voids or chunk.last < entries[0] or chunk.first > entries[-1]:
+            continue
+        for journal in chunk.journals:
+            rows = np.isin(journal.entry, entries)
+            if rows.any():
+                found.append(journal.take(rows))
+    return found
+
+
+def split(journal, chunk_lines=CHUNK_LINES):
+    """Cut a journal into chunks of about ``chunk_lines`` lines without splitting an entry.
+
+    Entries must be in order to be cut; otherwise the journal stays whole.
+    """
+    if len(journal) <= chunk_lines or (np.diff(journal.entry) < 0).any():
+        return [journal]
+    cuts = np.searchsorted(journal.entry, journal.entry[chunk_lines::chunk_lines])
+    bounds = [0, *np.unique(cuts[cuts > 0]).tolist(), len(journal)]
+    return [journal.take(slice(start, stop)) for start, stop in zip(bounds, bounds[1:])]
+
+
+def fork(a, b):
+    """Number of leading chunks snapshots ``a`` and ``b`` share."""
+    shared = 0
+    for mine, theirs in zip(a.chunks, b.chunks):
+        if mine is not theirs:
+            break
+        shared += 1
+    return shared
+
+
+def check_lineage(a, b):
+    if a.root is not b.root:
+        raise ValueError("These scenarios branch from different ledgers.")
+
+
+class Snapshot:
+    """Immutable ledger state; see the module comment."""
+
+    def __init__(self, chunks, root, delta, voided=frozenset(), next_entry=0, lines=0):
+        self.chunks = chunks
+        self.root = root
+        self.delta = delta
+        self.voided = voided
+        self.next_entry = next_entry
+        self.lines = lines
+        self.index = None
+
+    @classmethod
+    def from_journal(cls, journal, chunk_lines=CHUNK_LINES):
+        """The root snapshot of a journal. Raises ValueError if it does not balance."""
+        root = Ledger()
+        root.post(journal)
+        chunks = tuple(Chunk((part,)) for part in split(journal, chunk_lines))
+        next_entry = int(journal.entry.max()) + 1 if len(journal) else 0
+        return cls(chunks, root.seal(), Ledger().seal(), next_entry=next_entry, lines=len(journal))
+
+    def ledger(self):
+        """Statements ledger of this snapshot: the shared root plus this branch's delta.
+
+        The root itself (read-only) when nothing has changed; otherwise built
+        on each call and not kept, so idle branches hold only their deltas.
+        """
+        if not len(self.delta.accounts):
+            return self.root
+        ledger = self.root.copy()
+        ledger.include(self.delta)
+        ledger.lines = self.lines
+        return ledger
+
+    def extend(self, chunks, next_entry=None):
+        delta = self.delta.copy()
+        lines, voided = self.lines, set(self.voided)
+        for chunk in chunks:
+            for journal in chunk.journals:
+                delta.post(journal)
+            lines += -chunk.lines if chunk.voids else chunk.lines
+            voided |= chunk.voids
+        return Snapshot(self.chunks + tuple(chunks), self.root, delta.seal(), frozenset(voided),
+                        self.next_entry if next_entry is None else next_entry, lines)
+
+    # --- Operations -----------------------------------------------------------
+
+    def post(self, journal):
+        """A snapshot with ``journal``'s entries added, numbered after this snapshot's.
+
+        Raises ValueError (and posts nothing) if the journal does not balance.
+        """
+        if not len(journal):
+            raise ValueError("There are no lines to post.")
+        numbers, entry = np.unique(journal.entry, return_inverse=True)
+        entries = journal.replace(entry=(self.next_entry + entry).astype(np.int32))
+        return self.extend([Chunk((entries,))], self.next_entry + len(numbers))
+
+    def voiding(self, entries):
+        """The reversal Chunk of ``entries`` and their original lines."""
+        entries = np.unique(np.asarray(entries, dtype=np.int64))
+        if not len(entries):
+            raise ValueError("Choose at least one entry.")
+        voided = sorted(self.voided.intersection(entries.tolist()))
+        if voided:
+            raise ValueError(f"Entry {voided[0]} is already voided.")
+        lines = entry_lines(self.chunks, entries)
+        found = np.unique(np.concatenate([journal.entry for journal in lines])) if lines else []
+        missing = np.setdiff1d(entries, found)
+        if len(missing):
+            raise ValueError(f"There is no entry {missing[0]} to void.")
+        reversal = tuple(journal.replace(entry_type=(1 - journal.entry_type).astype(np.int8)) for journal in lines)
+        return Chunk(reversal, frozenset(entries.tolist())), lines
+
+    def void(self, entries):
+        """A snapshot with ``entries`` reversed out."""
+        chunk, _ = self.voiding(entries)
+        return self.extend([chunk])
+
+    def reschedule(self, entries, date):
+        """A snapshot with ``entries`` voided and reposted on ``date`` (e.g. an invoice paid late)."""
+        chunk, lines = self.voiding(entries)
+        numbers = np.unique(np.concatenate([journal.entry for journal in lines]))
+        day = np.array([date], dtype="datetime64[D]")
+        moved = tuple(
+            journal.replace(entry=(self.next_entry + np.searchsorted(numbers, journal.entry)).astype(np.int32),
+                            date=np.zeros(len(journal), dtype=np.int32), dates=day)
+            for journal in lines
+        )
+        return self.extend([chunk, Chunk(moved)], self.next_entry + len(numbers))
+
+    # --- Lines ----------------------------------------------------------------
+
+    def entries(self):
+        """Date and accounts of every entry not voided, indexed by entry number (kept once built)."""
+        if self.index is None:
+            frames = [chunk.entries() for chunk in self.chunks if not chunk.voids]
+            entries = pd.concat(frames) if frames else Chunk(()).entries()
+            self.index = entries[~entries.index.isin(list(self.voided))]
+        return self.index
+
+    def to_frame(self):
+        """Every line not voided, decoded for display."""
+        voided = np.array(sorted(self.voided), dtype=np.int64)
+        frames = [
+            journal.take(~np.isin(journal.entry, voided)).to_frame()
+            for chunk in self.chunks if not chunk.voids for journal in chunk.journals
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+class Diff:
+    """What ``other`` changed relative to ``base`` since the two forked."""
+
+    def __init__(self, base, other):
+        check_lineage(base, other)
+        shared = fork(base, other)
+        self.base = base
+        self.other = other
+        self.removed = base.chunks[shared:]
+        self.added = other.chunks[shared:]
+
+    def __bool__(self):
+        return bool(self.removed or self.added)
+
+    def lines(self):
+        """The lines each side appended since the fork (voids shown as the lines they reverse)."""
+        frames = []
+        for side, chunks in (("Base", self.removed), ("Scenario", self.added)):
+            for chunk in chunks:
+                for journal in chunk.journals:
+                    if chunk.voids:
+                        journal = journal.replace(entry_type=(1 - journal.entry_type).astype(np.int8))
+                    frame = journal.to_frame()
+                    frame.insert(0, "Change", "Voided" if chunk.voids else "Posted")
+                    frame.insert(0, "Side", side)
+                    frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def balances(self, month=None):
+        """Accounts whose balance through ``month`` differs, with both balances and the change.
+
+        Only the two deltas are compared, plus the root balances of the accounts they touch.
+        """
+        base, other = delta_balances(self.base.delta, month), delta_balances(self.other.delta, month)
+        change = other.sub(base, fill_value=0)
+        change = change[change != 0]
+        root = self.base.root
+        before = (pd.Series(root.balances(month), index=root.accounts).reindex(change.index, fill_value=0)
+                  if len(root.accounts) else pd.Series(0, index=change.index))
+        before = before + base.reindex(change.index, fill_value=0)
+        categories = pd.Series(
+            [CATEGORIES[code] for code in np.concatenate([root.category, self.base.delta.category,
+                                                          self.other.delta.category])],
+            index=root.accounts.append([self.base.delta.accounts, self.other.delta.accounts]),
+        )
+        categories = categories[~categories.index.duplicated()]
+        return pd.DataFrame({
+            "Account": change.index,
+            "Category": categories.reindex(change.index).to_numpy(),
+            "Base ($)": before.to_numpy() / 100,
+            "Scenario ($)": (before + change).to_numpy() / 100,
+            "Change ($)": change.to_numpy() / 100,
+        })
+
+
+def delta_balances(ledger, month):
+    if not len(ledger.accounts):
+        return pd.Series(dtype=np.int64)
+    return pd.Series(ledger.balances(month), index=ledger.accounts)
+
+
+def merge(source, target):
+    """``target`` with every change ``source`` made since they forked replayed after its own.
+
+    Raises ValueError if both voided (or rescheduled) the same entry since the fork.
+    """
+    check_lineage(source, target)
+    shared = fork(source, target)
+    theirs, ours = source.chunks[shared:], target.chunks[shared:]
+    if not theirs:
+        return target
+    if not ours:
+        return source
+    start = max((chunk.last for chunk in source.chunks[:shared]), default=-1) + 1
+    clash = sorted(
+        entry for entry in frozenset().union(*(chunk.voids for chunk in theirs))
+        & frozenset().union(*(chunk.voids for chunk in ours)) if entry < start
+    )
+    if clash:
+        raise ValueError(f"Both scenarios change entr{'y' if len(clash) == 1 else 'ies'} "
+                         f"{', '.join(map(str, clash))}; merge one of them by hand.")
+    offset = target.next_entry - start
+    return target.extend([chunk.renumbered(start, offset) for chunk in theirs],
+                         target.next_entry + source.next_entry - start)
@@ -0,0 +1,288 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from course.chart_of_accounts import CATEGORIES
+
+# --- Financial Statements ---
+# Trial balance, income statement, balance sheet and cash flow statement from
+# posted journal lines. The ledger never keeps the lines themselves: posting
+# adds each line's signed amount (debits positive, in cents) into a
+# materialized (accounts x months) activity matrix, plus a (categories x
+# months) total. Posting one entry touches only its cells; posting a whole
+# Journal of millions of lines is one bincount. Statements read the matrix,
+# so refreshing them costs the same however long the ledger is.
+#
+# After every post the accounting equation is checked from the category
+# totals: Assets = Liabilities + Equity, with Equity including earnings to
+# date (revenue less expenses not yet closed to retained earnings).
+#
+# The cash flow statement uses the indirect method: net income, adjusted by
+# the change in each non-cash balance sheet account, grouped into operating,
+# investing and financing activities by account (see FLOW_SECTIONS).
+
+ASSETS, LIABILITIES, EQUITY, REVENUE, EXPENSES = range(len(CATEGORIES))
+# Category label prefixes accepted on journal lines ("Asset", "Expense", ...).
+CATEGORY_PREFIXES = {"asset": ASSETS, "liabi": LIABILITIES, "equit": EQUITY, "reven": REVENUE,
+                     "incom": REVENUE, "expen": EXPENSES}
+FLOW_SECTIONS = ("Cash", "Operating", "Investing", "Financing")
+# Name keywords that place a balance sheet account in a cash flow section;
+# anything else is operating.
+FLOW_KEYWORDS = (
+    ("cash", "Cash"),
+    ("accumulated depreciation", "Operating"),
+    ("land", "Investing"),
+    ("building", "Investing"),
+    ("equipment", "Investing"),
+    ("vehicle", "Investing"),
+    ("improvement", "Investing"),
+    ("property & equipment", "Investing"),
+    ("mortgage", "Financing"),
+    ("loan", "Financing"),
+    ("notes payable", "Financing"),
+)
+
+
+def category_code(label):
+    code = CATEGORY_PREFIXES.get(str(label).strip().lower()[:5])
+    if code is None:
+        raise ValueError(f"Unknown account category: {label!r}")
+    return code
+
+
+def flow_section(account, category):
+    if category in (REVENUE, EXPENSES):
+        return None
+    name = account.lower()
+    for keyword, section in FLOW_KEYWORDS:
+        if keyword in name:
+            return section
+    return "Financing" if category == EQUITY else "Operating"
+
+
+class Ledger:
+    """Account x month balances maintained as entries are posted."""
+
+    def __init__(self):
+        self.accounts = pd.Index([], dtype=object, name="account")
+        self.category = np.zeros(0, dtype=np.int8)
+        self.section = []
+        self.first_month = None
+        self.activity = np.zeros((0, 0), dtype=np.int64)  # (accounts, months)
+        self.category_activity = np.zeros((len(CATEGORIES), 0), dtype=np.int64)
+        self.lines = 0
+        self.in_balance = True
+
+    def copy(self):
+        """An independent ledger with the same balances (copies the matrices, which never hold lines)."""
+        ledger = copy.copy(self)
+        ledger.category = self.category.copy()
+        ledger.section = list(self.section)
+        ledger.activity = self.activity.copy()
+        ledger.category_activity = self.category_activity.copy()
+        return ledger
+
+    def seal(self):
+        """Make the matrices read-only, for ledgers shared between sessions; copy() to change one."""
+        for array in (self.category, self.activity, self.category_activity):
+            array.setflags(write=False)
+        return self
+
+    # --- Posting ------------------------------------------------------------
+
+    def account_codes(self, names, categories):
+        """Ledger rows for account names, adding new accounts as needed.
+
+        Raises ValueError (and adds nothing) if a new account's category is unknown.
+        """
+        names = pd.Index(names).astype(str)
+        codes = self.accounts.get_indexer(names)
+        new = codes < 0
+        if new.any():
+            added = names[new]
+            # Every category is checked before the ledger changes.
+            category = np.array([category_code(label) for label in np.asarray(categories)[new]], dtype=np.int8)
+            self.accounts = self.accounts.append(added)
+            self.category = np.append(self.category, category)
+            self.section.extend(flow_section(name, code) for name, code in zip(added, category))
+            self.activity = np.pad(self.activity, ((0, len(added)), (0, 0)))
+            codes = self.accounts.get_indexer(names)
+        return codes
+
+    def month_codes(self, months):
+        """Matrix columns for datetime64[M] months, widening the matrix as needed."""
+        months = np.asarray(months, dtype="datetime64[M]")
+        if not len(months):
+            return np.zeros(0, dtype=np.int64)
+        low, high = months.min(), months.max()
+        if self.first_month is None:
+            self.first_month = low
+        before = max(0, int((self.first_month - low).astype(np.int64)))
+        after = max(0, int((high - self.first_month).astype(np.int64)) + before + 1 - self.activity.shape[1])
+        if before or after:
+            self.activity = np.pad(self.activity, ((0, 0), (before, after)))
+            self.category_activity = np.pad(self.category_activity, ((0, 0), (before, after)))
+            self.first_month = self.first_month - before
+        return (months - self.first_month).astype(np.int64)
+
+    def post(self, journal):
+        """Post every line of a Journal; returns whether the equation holds.
+
+        Raises ValueError (and posts nothing) if debits do not equal credits.
+        """
+        if not journal.is_balanced():
+            debit, credit = journal.totals()
+            raise ValueError(f"Entry does not balance: debits ${debit:,.2f}, credits ${credit:,.2f}.")
+        if journal.date is None:
+            raise ValueError("Journal lines need dates to be posted.")
+        # Map the journal's (small) label dictionaries first, then index. An
+        # account's category is the first one its lines use.
+        used = np.bincount(journal.account.astype(np.int64) * len(journal.categories) + journal.category,
+                           minlength=len(journal.accounts) * len(journal.categories))
+        used = used.reshape(len(journal.accounts), len(journal.categories)) > 0
+        rows = np.flatnonzero(used.any(axis=1))
+        labels = np.asarray(journal.categories, dtype=object)[used[rows].argmax(axis=1)]
+        mapping = np.zeros(len(journal.accounts), dtype=np.int64)
+        mapping[rows] = self.account_codes(np.asarray(journal.accounts, dtype=object)[rows], labels)
+        date_months = self.month_codes(np.asarray(journal.dates, dtype="datetime64[M]"))
+
+        account = mapping[journal.account]
+        month = date_months[journal.date]
+        signed = np.where(journal.entry_type == 0, journal.cents, -journal.cents)
+        self.add(account, month, signed)
+        self.lines += len(journal)
+        self.in_balance = self.check()
+        return self.in_balance
+
+    def include(self, other):
+        """Add another ledger's activity (e.g. a scenario's changes) into this one."""
+        if not len(other.accounts):
+            return self.in_balance
+        rows = self.account_codes(other.accounts, [CATEGORIES[code] for code in other.category])
+        columns = self.month_codes(other.months)
+        self.activity[np.ix_(rows, columns)] += other.activity
+        # Totals by this ledger's category of each account, which wins if the two disagree.
+        np.add.at(self.category_activity, (self.category[rows][:, None], columns[None, :]), other.activity)
+        self.lines += other.lines
+        self.in_balance = self.check()
+        return self.in_balance
+
+    def add(self, account, month, signed):
+        months = self.activity.shape[1]
+        if len(signed) < 10_000:
+            np.add.at(self.activity, (account, month), signed)
+            np.add.at(self.category_activity, (self.category[account], month), signed)
+            return
+        # Large batches: one bincount over the flattened matrix. Float64 sums
+        # are exact for any realistic total (below 2**53 cents).
+        cells = np.bincount(account * months + month, weights=signed, minlength=self.activity.size)
+        self.activity += np.round(cells).astype(np.int64).reshape(self.activity.shape)
+        by_category = np.bincount(self.category[account].astype(np.int64) * months + month, weights=signed,
+                                  minlength=self.category_activity.size)
+        self.category_activity += np.round(by_category).astype(np.int64).reshape(self.category_activity.shape)
+
+    def check(self, month=None):
+        """Assets = Liabilities + Equity (including earnings to date) through ``month``."""
+        totals = self.category_balances(month)
+        assets = totals[ASSETS]
+        liabilities, equity, earnings = -totals[LIABILITIES], -totals[EQUITY], -(totals[REVENUE] + totals[EXPENSES])
+        return assets == liabilities + equity + earnings
+
+    # --- Periods ------------------------------------------------------------
+
+    @property
+    def months(self):
+        if self.first_month is None:
+            return np.array([], dtype="datetime64[M]")
+        return self.first_month + np.arange(self.activity.shape[1])
+
+    def offset(self, month):
+        """Months from the ledger's first month to ``month`` (negative before it)."""
+        return int((np.datetime64(month, "M") - self.first_month).astype(np.int64))
+
+    def column(self, month):
+        """Matrix column of ``month``, clipped to the ledger's range (-1 before its first month)."""
+        if self.first_month is None:
+            return -1
+        if month is None:
+            return self.activity.shape[1] - 1
+        return min(max(self.offset(month), -1), self.activity.shape[1] - 1)
+
+    def balances(self, month=None):
+        """Cumulative balance of every account through ``month`` (inclusive)."""
+        return self.activity[:, :self.column(month) + 1].sum(axis=1)
+
+    def category_balances(self, month=None):
+        return self.category_activity[:, :self.column(month) + 1].sum(axis=1)
+
+    def activity_between(self, start, end):
+        """Net activity of every account from ``start`` to ``end`` months (inclusive).
+
+        Zero for every account when the range lies outside the ledger's months.
+        """
+        first = 0 if start is None or self.first_month is None else max(self.offset(start), 0)
+        stop = self.column(end) + 1
+        return self.activity[:, first:max(stop, first)].sum(axis=1)
+
+    # --- Statements -----------------------------------------------------------
+
+    def trial_balance(self, month=None):
+        balances = self.balances(month)
+        keep = balances != 0
+        return pd.DataFrame({
+            "Account": self.accounts[keep],
+            "Category": [CATEGORIES[code] for code in self.category[keep]],
+            "Debit ($)": np.where(balances[keep] > 0, balances[keep], 0) / 100,
+            "Credit ($)": np.where(balances[keep] < 0, -balances[keep], 0) / 100,
+        })
+
+    def income_statement(self, start=None, end=None):
+        activity = self.activity_between(start, end)
+        rows = []
+        for category, label, sign in ((REVENUE, "Revenue", -1), (EXPENSES, "Expenses", 1)):
+            selected = (self.category == category) & (activity != 0)
+            rows += [(label, account, sign * cents) for account, cents in zip(self.accounts[selected], activity[selected])]
+            rows.append((label, f"Total {label}", sign * int(activity[self.category == category].sum())))
+        net = -int(activity[np.isin(self.category, (REVENUE, EXPENSES))].sum())
+        rows.append(("", "Net Income", net))
+        return statement_frame(rows)
+
+    def balance_sheet(self, month=None):
+        balances = self.balances(month)
+        earnings = -int(balances[np.isin(self.category, (REVENUE, EXPENSES))].sum())
+        rows = []
+        for category, label, sign in ((ASSETS, "Assets", 1), (LIABILITIES, "Liabilities", -1), (EQUITY, "Equity", -1)):
+            selected = (self.category == category) & (balances != 0)
+            rows += [(label, account, sign * cents) for account, cents in zip(self.accounts[selected], balances[selected])]
+            total = sign * int(balances[self.category == category].sum())
+            if category == EQUITY:
+                rows.append((label, "Current Earnings", earnings))
+                total += earnings
+            rows.append((label, f"Total {label}", total))
+        liabilities_equity = rows[-1][2] + next(row[2] for row in rows if row[1] == "Total Liabilities")
+        rows.append(("", "Total Liabilities & Equity", liabilities_equity))
+        return statement_frame(rows)
+
+    def cash_flow(self, start=None, end=None):
+        """Indirect-method cash flow statement for ``start`` to ``end`` months."""
+        activity = self.activity_between(start, end)
+        section = np.array(self.section, dtype=object)
+        net_income = -int(activity[np.isin(self.category, (REVENUE, EXPENSES))].sum())
+        rows = [("Operating", "Net Income", net_income)]
+        totals = {"Operating": net_income}
+        for name in ("Operating", "Investing", "Financing"):
+            selected = (section == name) & (activity != 0)
+            # A debit (increase) in an asset uses cash; a credit is a source.
+            rows += [(name, f"Change in {account}", -cents) for account, cents in
+                     zip(self.accounts[selected], activity[selected])]
+            totals[name] = totals.get(name, 0) - int(activity[section == name].sum())
+            rows.append((name, f"Net Cash from {name} Activities", totals[name]))
+        rows.append(("", "Net Change in Cash", sum(totals.values())))
+        rows.append(("", "Change in Cash Accounts", int(activity[section == "Cash"].sum())))
+        return statement_frame(rows)
+
+
+def statement_frame(rows):
+    frame = pd.DataFrame(rows, columns=["Section", "Line", "Cents"])
+    return pd.DataFrame({"Section": frame["Section"], "Line": frame["Line"], "Amount ($)": frame["Cents"] / 100})
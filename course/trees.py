@@ -0,0 +1,68 @@
+import numpy as np
+
+# --- Parent-Array Trees ---
+# Hierarchies (entity ownership, account rollups) are stored as a ``parent``
+# array: parent[i] is the index of node i's parent, or ROOT for a top-level
+# node. The helpers below work level by level with array operations, so their
+# cost grows with the depth of the tree rather than with Python-level visits
+# of each node.
+
+ROOT = -1
+
+
+def tree_depths(parent):
+    depth = np.zeros(len(parent), dtype=np.int64)
+    current = np.array(parent, copy=True)
+    for _ in range(len(parent) + 1):
+        climbing = current != ROOT
+        if not climbing.any():
+            return depth
+        depth[climbing] += 1
+        current[climbing] = parent[current[climbing]]
+    raise ValueError("The hierarchy contains a cycle.")
+
+
+def ancestors(parent, node):
+    """``node`` followed by its ancestors up to the top of its tree."""
+    path = [node]
+    while parent[path[-1]] != ROOT:
+        path.append(parent[path[-1]])
+    return np.array(path)
+
+
+def descendants(parent, depth, node):
+    """``node`` and every node below it."""
+    inside = np.zeros(len(parent), dtype=bool)
+    inside[node] = True
+    for level in range(int(depth[node]) + 1, int(depth.max(initial=0)) + 1):
+        nodes = np.flatnonzero(depth == level)
+        inside[nodes] = inside[parent[nodes]]
+    return np.flatnonzero(inside)
+
+
+def subtree_sums(parent, depth, local):
+    """Roll ``local`` values (one row per node) up into every ancestor."""
+    totals = np.array(local, copy=True)
+    for level in range(int(depth.max(initial=0)), 0, -1):
+        nodes = np.flatnonzero(depth == level)
+        np.add.at(totals, parent[nodes], totals[nodes])
+    return totals
+
+
+def lowest_common_ancestor(parent, depth, a, b):
+    """Pairwise lowest common ancestor of nodes ``a`` and ``b`` (ROOT if none)."""
+    a, b = np.array(a, copy=True), np.array(b, copy=True)
+    # Lift the deeper side until both are at the same depth, then lift both.
+    while True:
+        deeper_a = depth[a] > depth[b]
+        deeper_b = depth[b] > depth[a]
+        if not (deeper_a.any() or deeper_b.any()):
+            break
+        a[deeper_a] = parent[a[deeper_a]]
+        b[deeper_b] = parent[b[deeper_b]]
+    differ = a != b
+    while differ.any():
+        a[differ] = parent[a[differ]]
+        b[differ] = parent[b[differ]]
+        differ = (a != b) & (a != ROOT)
+    return np.where(a == b, a, ROOT)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from course.catalog import read_catalog
+
+
+def quiz(section="practice", key="q1", submit="submit_practice", **question):
+    return {"type": "multiple_choice", "section": section, "title": section.title(),
+            "submit": {"key": submit, "label": "Submit"},
+            "questions": [{"key": key, "prompt": "Debit or credit?", "options": ["Debit", "Credit"],
+                           "answer": "Debit", **question}]}
+
+
+def write_pages(directory, *pages):
+    for number, blocks in enumerate(pages, 1):
+        page = {"label": f"Page {number}", "blocks": blocks}
+        (directory / f"{number:02d}-page{number}.json").write_text(json.dumps(page))
+    return directory
+
+
+def test_the_shipped_catalog_compiles():
+    catalog = read_catalog()
+    assert catalog.pages and catalog.sections()
+
+
+def test_pages_and_quizzes_are_read_in_file_order(tmp_path):
+    catalog = read_catalog(write_pages(tmp_path, [{"type": "header", "text": "One"}], [quiz()]))
+
+    assert list(catalog.pages) == ["Page 1", "Page 2"]
+    assert catalog.pages["Page 2"].name == "page2"
+    assert catalog.sections() == {"practice": "Practice"}
+
+
+@pytest.mark.parametrize("blocks, message", [
+    ([{"type": "expander", "title": "More", "blocks": [{"type": "markdwon", "text": "x"}]}],
+     "01-page1.json: blocks[0].blocks[0]: unknown block type 'markdwon'"),
+    ([{"type": "header"}], "01-page1.json: blocks[0]: missing 'text'"),
+    ([{"type": "expander", "title": "More", "expanded": "yes", "blocks": []}],
+     "blocks[0]: 'expanded' must be true or false"),
+    ([quiz(answer="Both")], "blocks[0].questions[0]: answer 'Both' is not one of the options"),
+    ([quiz(), quiz(section="other", submit="submit_other")], "blocks[1].questions[0]: widget key 'q1' is already used"),
+    ([quiz(), quiz(key="q2")], "blocks[1]: quiz section 'practice' is already used by 'Practice'"),
+    ([{"type": "exercise", "function": "course.pages.module1.pipe_exercise"}],
+     "'function' must look like 'package.module:function'"),
+    ([{"type": "table", "section": "module1", "name": "no_such_table"}], "no reference table 'no_such_table'"),
+    ([{"type": "adaptive_quiz", "section": "drill", "title": "Drill", "key": "drill", "topics": ["taxes"],
+       "submit": {"key": "check", "label": "Check"}}], "'topics' must be some of"),
+])
+def test_invalid_blocks_name_the_file_and_block(tmp_path, blocks, message):
+    write_pages(tmp_path, blocks)
+
+    with pytest.raises(ValueError) as error:
+        read_catalog(tmp_path)
+
+    assert message in str(error.value)
+
+
+def test_widget_keys_are_unique_across_pages(tmp_path):
+    write_pages(tmp_path, [quiz()], [quiz(section="other", submit="submit_practice", key="q2")])
+
+    with pytest.raises(ValueError, match=r"02-page2.json: blocks\[0\].submit: widget key 'submit_practice' "
+                                         r"is already used by 01-page1.json: blocks\[0\].submit"):
+        read_catalog(tmp_path)
+
+
+def test_unreadable_files_and_repeated_labels(tmp_path):
+    (tmp_path / "01-broken.json").write_text("{\"label\": ")
+    with pytest.raises(ValueError, match="01-broken.json: Expecting value"):
+        read_catalog(tmp_path)
+
+    (tmp_path / "01-broken.json").write_text(json.dumps({"label": "Page 2", "blocks": []}))
+    write_pages(tmp_path, [], [])
+    with pytest.raises(ValueError, match="02-page2.json: page label 'Page 2' is already used"):
+        read_catalog(tmp_path)
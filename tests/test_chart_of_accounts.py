@@ -0,0 +1,15 @@
+import pandas as pd
+
+from course.chart_of_accounts import ChartOfAccounts
+
+
+def test_multi_word_search_finds_matches_past_the_suggestion_cap():
+    rows = [(str(5000 + i), f"Repairs Item {i}", "") for i in range(200)]
+    chart = ChartOfAccounts(pd.DataFrame(rows + [("5999", "Repairs Roof Reserve", "")],
+                                         columns=["number", "name", "parent"]))
+    roof = chart.row("5999")
+    assert chart.search("rep roo") == [roof]
+    assert chart.search("roo rep") == [roof]
+    assert chart.search("repairs roof reserve") == [roof]
+    assert chart.search("rep it 19", limit=3) == [chart.row("5019"), chart.row("5190"), chart.row("5191")]
+    assert chart.search("rep zzz") == []
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from course.grading import grade
+
+KEY = pd.DataFrame({
+    "Exercise": ["rent", "rent"],
+    "Account": ["Cash", "Rental Income"],
+    "Entry Type": ["Debit", "Credit"],
+    "Amount ($)": [1500.0, 1500.0],
+})
+
+
+def submission(rows, learner="ada"):
+    return pd.DataFrame(
+        [(learner, "rent", *row) for row in rows],
+        columns=["Submission", "Exercise", "Account", "Entry Type", "Amount ($)"],
+    )
+
+
+def test_balanced_entry_in_any_order_passes():
+    grades = grade(submission([("Rental Income", "Credit", 1500.0), ("Cash", "Debit", 1500.0)]), KEY)
+
+    assert list(grades.lines["status"]) == ["Correct", "Correct"]
+    result = grades.result("ada", "rent")
+    assert result["balanced"] and result["passed"]
+    assert result["correct"] == 2 and result["missing"] == 0
+
+
+def test_unbalanced_entry_flags_the_wrong_amount():
+    grades = grade(submission([("Cash", "Debit", 1500.0), ("Rental Income", "Credit", 1400.0)]), KEY)
+
+    assert list(grades.lines["status"]) == ["Correct", "Amount outside tolerance"]
+    assert grades.feedback("ada")["Detail"].iloc[1] == "Expected $1,500.00"
+    result = grades.result("ada", "rent")
+    assert not result["balanced"] and not result["passed"]
+    assert (result["debit_cents"], result["credit_cents"]) == (150000, 140000)
+
+
+def test_wrong_side_extra_and_blank_lines():
+    grades = grade(submission([
+        ("Cash", "Credit", 1500.0),
+        ("Rental Income", "Debit", 1500.0),
+        ("Accounts Receivable", "Debit", 1500.0),
+        ("", "", ""),
+    ]), KEY)
+
+    assert list(grades.lines["status"]) == [
+        "Wrong entry type", "Wrong entry type", "Account not in answer", "Blank line",
+    ]
+    assert list(grades.feedback("ada")["Detail"][:2]) == ["Should be a Debit", "Should be a Credit"]
+    result = grades.result("ada", "rent")
+    assert result["missing"] == 2 and not result["passed"]
+
+
+def test_cohort_lines_are_graded_per_learner():
+    cohort = pd.concat([
+        submission([("Cash", "Debit", 1500.0), ("Rental Income", "Credit", 1500.0)], "ada"),
+        submission([("Cash", "Debit", 1500.0), ("Cash", "Debit", 1500.0)], "bob"),
+    ], ignore_index=True)
+
+    grades = grade(cohort, KEY)
+
+    assert list(grades.lines["status"][2:]) == ["Correct", "Duplicate line"]
+    assert dict(zip(grades.summary["submission"], grades.summary["passed"])) == {"ada": True, "bob": False}
+
+
+def test_unreadable_amount_is_reported():
+    rows = submission([("Cash", "Debit", "1500"), ("Rental Income", "Credit", "fifteen hundred")]).astype(str)
+
+    with pytest.raises(ValueError, match="'fifteen hundred'"):
+        grade(rows, KEY)
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from course.jobs import Cancelled, JobRunner, job_target, report
+
+
+def count_up(steps, delay=0.0):
+    for step in range(steps):
+        report(step / steps, f"Step {step}", step)
+        time.sleep(delay)
+    return steps
+
+
+@pytest.fixture(scope="module")
+def runner():
+    runner = JobRunner(workers=1)
+    yield runner
+    runner.shutdown()
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_the_same_job_is_only_started_once(runner):
+    job = runner.submit(count_up, 3, label="Counting")
+
+    assert runner.submit(count_up, 3) is job
+    assert job.result(timeout=30) == 3
+    assert (job.status, job.progress, job.label) == ("finished", 1.0, "Counting")
+    assert runner.submit(count_up, 3) is job
+    assert runner.submit(count_up, 4) is not job
+    assert runner.submit(count_up, 5, identity="five") is runner.submit(count_up, 6, identity="five")
+
+
+def test_cancelling_a_running_job_stops_it_at_its_next_report(runner):
+    job = runner.submit(count_up, 100_000, 0.01)
+    wait_for(lambda: job.partial is not None)
+
+    job.cancel()
+
+    with pytest.raises(Cancelled):
+        job.result(timeout=30)
+    assert job.status == "cancelled"
+    assert job.partial < 100_000 - 1
+    # A cancelled job starts again on the next submit.
+    again = runner.submit(count_up, 100_000, 0.01)
+    assert again is not job
+    again.cancel()
+    with pytest.raises(Cancelled):
+        again.result(timeout=30)
+
+
+def test_cancelling_a_queued_job_never_runs_it(runner):
+    running = runner.submit(count_up, 50, 0.01)
+    queued = runner.submit(count_up, 2, identity="queued")
+
+    queued.cancel()
+
+    with pytest.raises(Cancelled):
+        queued.result(timeout=30)
+    assert queued.partial is None
+    assert running.result(timeout=30) == 50
+
+
+def test_jobs_must_be_importable_by_the_workers():
+    def local():
+        pass
+
+    with pytest.raises(ValueError, match="top level"):
+        job_target(local)
+    assert job_target(count_up).endswith(":count_up")
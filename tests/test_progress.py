@@ -0,0 +1,57 @@
+import pytest
+
+from course.progress import ProgressStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    yield store
+    store.pool.close()
+
+
+def test_flush_waits_for_every_queued_attempt(store):
+    for number in range(1200):  # more than one batch
+        store.submit(f"learner-{number % 7}", "quiz", [("q1", "a", number % 2 == 0), ("q2", "b", True)])
+    store.flush()
+
+    attempts = store.learner_attempts("learner-0", "quiz")
+    assert len(attempts) == len(range(0, 1200, 7))
+    assert int(store.score_distribution("quiz")["Attempts"].sum()) == 1200
+
+
+def test_summary_tables(store):
+    store.submit("ana", "quiz", [("q1", "a", True), ("q2", "b", False)])
+    store.submit("ben", "quiz", [("q1", "c", False), ("q2", "b", False)])
+    store.submit("ana", "quiz", [("q1", "a", True), ("q2", "d", True)])
+    store.submit("ana", "essay", [("Essay", "Accruals match revenue and expense.", None)])
+    store.flush()
+
+    scores = store.score_distribution("quiz")
+    assert scores.values.tolist() == [[0, 2, 1], [1, 2, 1], [2, 2, 1]]
+    rates = store.question_error_rates("quiz")
+    assert rates.set_index("Question")[["Attempts", "Errors"]].to_dict("index") == {
+        "q1": {"Attempts": 3, "Errors": 1}, "q2": {"Attempts": 3, "Errors": 2}}
+    assert store.score_distribution("essay").empty
+    assert store.responses("essay")["Answer"].tolist() == ["Accruals match revenue and expense."]
+    assert store.learner_answers("ana", "quiz").values.tolist() == [
+        ["q1", 1], ["q2", 0], ["q1", 1], ["q2", 1]]
+
+
+def test_failed_write_is_raised_once_and_writing_continues(store, monkeypatch):
+    write = store.write
+
+    def broken(batch):
+        raise TypeError("malformed submission")
+
+    monkeypatch.setattr(store, "write", broken)
+    store.submit("ana", "quiz", [("q1", "a", True)])
+    with pytest.raises(TypeError, match="malformed submission"):
+        store.flush()
+    assert store.writer.is_alive()
+
+    monkeypatch.setattr(store, "write", write)
+    store.submit("ana", "quiz", [("q1", "b", False)])
+    store.flush()  # the failure was already reported
+    assert isinstance(store.error, TypeError)
+    assert store.learner_answers("ana", "quiz").values.tolist() == [["q1", 0]]
@@ -0,0 +1,90 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from course.progress import ProgressStore
+from course.questionbank import TOPICS, Learner, QuestionBank, learner_seed
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return QuestionBank(variants=50)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr("course.feedback.progress_store", lambda: store)
+    yield store
+    store.pool.close()
+
+
+def draw(bank, learner, correct):
+    number = bank.pick(learner)
+    learner.record(bank.cell(number), correct)
+    return number
+
+
+def test_the_weakest_topic_is_asked_at_the_learners_level(bank):
+    learner = Learner(learner_seed("ana"), TOPICS)
+    learner.level.update(accruals=2, revenue=2)
+
+    assert bank.cell(bank.pick(learner)) == ("depreciation", 1)
+    learner.record(("depreciation", 1), True)
+    learner.record(("depreciation", 1), True)
+    assert learner.level["depreciation"] == 2
+    learner.record(("depreciation", 2), False)
+    assert learner.level["depreciation"] == 1
+
+
+def test_a_learner_walks_a_cell_without_repeats(bank):
+    learner = Learner(learner_seed("ana"), ["accruals"])
+    cell = ("accruals", 1)
+    numbers = [draw(bank, learner, False) for _ in range(len(bank.cells[cell]))]
+
+    assert sorted(numbers) == sorted(bank.cells[cell].tolist())
+    other = Learner(learner_seed("ben"), ["accruals"])
+    assert [draw(bank, other, False) for _ in range(10)] != numbers[:10]
+
+
+def test_saved_answers_resume_where_the_learner_left_off(bank, store):
+    learner = Learner(learner_seed("ana"), TOPICS)
+    answers = []
+    for correct in (True, True, False, True, True, True, False, True):
+        number = draw(bank, learner, correct)
+        answers.append((bank.question(number).template.key, "choice", correct))
+    store.submit("ana", "practice", answers[:5])
+    store.submit("ana", "practice", answers[5:])
+    store.flush()
+
+    history = store.learner_answers("ana", "practice")
+    resumed = Learner(learner_seed("ana"), TOPICS).replay(bank, zip(history["Question"], history["Correct"]))
+    assert (resumed.level, resumed.drawn) == (learner.level, learner.drawn)
+    assert bank.pick(resumed) == bank.pick(learner)
+
+
+def adaptive_quiz_page():
+    import streamlit as st
+
+    from course.catalog import Compiler
+
+    st.query_params["learner"] = "ana"
+    Compiler("practice.json", {}, {}).page({"label": "Practice", "blocks": [{
+        "type": "adaptive_quiz", "section": "practice", "title": "Practice", "key": "practice",
+        "questions": 3, "topics": ["accruals"], "submit": {"key": "check", "label": "Check Answer"},
+    }]}, "practice").render()
+
+
+def test_a_finished_run_is_saved_as_one_attempt(store):
+    at = AppTest.from_function(adaptive_quiz_page, default_timeout=30).run()
+    for _ in range(3):
+        store.flush()
+        assert not store.learner_attempts("ana", "practice").shape[0]
+        choice = next(radio for radio in at.radio if radio.key.startswith("practice_"))
+        choice.set_value(choice.options[0]).run()
+        at.button(key="check").click().run()
+    store.flush()
+
+    assert not at.exception
+    attempts = store.learner_attempts("ana", "practice")
+    assert attempts[["Score", "Out Of"]].values.tolist() == [[at.session_state["practice_exam"]["correct"], 3]]
+    assert len(store.learner_answers("ana", "practice")) == 3
@@ -0,0 +1,99 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from course.reconciliation import UNMATCHED, parse_cents, read_transactions, reconcile, reconcile_statements
+
+
+def statement(*lines):
+    """Lines of (date, amount, reference) as read from a CSV."""
+    text = "Date,Amount,Reference\n" + "\n".join(",".join(line) for line in lines)
+    return read_transactions(io.StringIO(text))
+
+
+def matched_with(result, bank_row):
+    """Book rows matched together with one bank row."""
+    match = result.bank_match[bank_row]
+    assert match != UNMATCHED
+    return np.flatnonzero(result.book_match == match).tolist()
+
+
+def test_reference_pass_pairs_duplicates_in_date_order():
+    bank = statement(("2025-03-05", "-200.00", "1001"), ("2025-03-03", "-200.00", "1001"),
+                     ("2025-03-20", "-75.00", "1002"))
+    book = statement(("2025-03-01", "-200.00", "1001"), ("2025-03-04", "-200.00", "1001"),
+                     ("2025-03-02", "-75.00", "1002"))
+
+    result = reconcile(bank, book, tolerance_days=3)
+
+    assert matched_with(result, 1) == [0]
+    assert matched_with(result, 0) == [1]
+    # Same reference and amount, but 18 days apart.
+    assert result.bank_match[2] == result.book_match[2] == UNMATCHED
+    assert result.pass_counts()["Reference"] == (2, 2)
+
+
+def test_amount_pass_takes_the_nearest_date_within_tolerance():
+    bank = statement(("2025-03-10", "500.00", ""), ("2025-03-11", "500.00", ""), ("2025-03-20", "-40.00", ""))
+    book = statement(("2025-03-12", "500.00", ""), ("2025-03-08", "500.00", ""), ("2025-03-14", "-40.00", ""))
+
+    result = reconcile(bank, book, tolerance_days=3)
+
+    assert matched_with(result, 0) == [1]
+    assert matched_with(result, 1) == [0]
+    assert result.bank_match[2] == result.book_match[2] == UNMATCHED
+    assert result.pass_counts()["Amount & date"] == (2, 2)
+
+    wider = reconcile(bank, book, tolerance_days=6)
+    assert matched_with(wider, 2) == [2]
+
+
+def test_grouped_pass_matches_many_lines_to_one():
+    # Two book receipts banked as one deposit, and one book payment the bank
+    # cleared in two parts under the same reference.
+    bank = statement(("2025-03-15", "300.00", ""), ("2025-03-16", "-100.00", "7001"),
+                     ("2025-03-17", "-150.00", "7001"))
+    book = statement(("2025-03-14", "120.00", ""), ("2025-03-14", "180.00", ""),
+                     ("2025-03-16", "-250.00", "7001"))
+
+    result = reconcile(bank, book, tolerance_days=3)
+
+    assert matched_with(result, 0) == [0, 1]
+    assert result.bank_match[1] == result.bank_match[2]
+    assert matched_with(result, 1) == [2]
+    assert result.pass_counts()["Grouped"] == (3, 3)
+    assert result.outstanding_checks == result.deposits_in_transit == result.bank_fees == 0
+
+
+def test_leftover_lines_are_classified():
+    bank = statement(("2025-03-03", "1000.00", "D1"), ("2025-03-31", "-12.50", ""), ("2025-03-31", "3.25", ""))
+    book = statement(("2025-03-02", "1000.00", "D1"), ("2025-03-29", "-420.00", "1010"),
+                     ("2025-03-31", "800.00", "D2"))
+
+    result = reconcile(bank, book)
+
+    assert result.outstanding_checks == 420.00
+    assert result.deposits_in_transit == 800.00
+    assert result.bank_fees == 12.50
+    assert result.unrecorded_bank_credits == 3.25
+
+
+def test_reconcile_statements_returns_the_unmatched_rows():
+    bank = b"Date,Amount,Reference,Memo\n2025-03-03,\"$1,000.00\",D1,Deposit\n2025-03-31,(12.50),,Service fee\n"
+    book = b"Date,Amount,Reference,Memo\n2025-03-02,1000,D1,Rent\n2025-03-29,-420,1010,Repairs\n"
+
+    result, unmatched = reconcile_statements(bank, book)
+
+    assert unmatched["Outstanding Checks"]["Memo"].tolist() == ["Repairs"]
+    assert unmatched["Deposits in Transit"].empty
+    assert unmatched["Bank Service Fees"]["Memo"].tolist() == ["Service fee"]
+    assert result.pass_counts()["Reference"] == (1, 1)
+
+
+def test_parse_cents_reads_formatted_amounts():
+    values = pd.Series(["12.34", "$1,500.00", "(15.00)", " -2 "])
+    assert parse_cents(values).tolist() == [1234, 150000, -1500, -200]
+    with pytest.raises(ValueError, match="'12..34'"):
+        parse_cents(pd.Series(["1.00", "12..34"]))
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from course.revenue import RecognitionEngine
+
+ROLL = pd.DataFrame({
+    "lease": ["L1", "L2", "L3", "L4"],
+    "property": ["Elm St", "Elm St", "Oak Ave", "Oak Ave"],
+    "start": ["2024-01-15", "2024-03-01", "2023-07-01", "2024-06-10"],
+    "end": ["2026-01-14", "2025-02-28", "2028-06-30", "2025-06-09"],
+    "monthly_rent": [2500.0, 1800.0, 4200.0, 950.0],
+    "escalation": [0.03, 0.0, 0.025, 0.0],
+    "free_months": [2, 0, 3, 1],
+    "incentive": [5000.0, 0.0, 12000.0, 0.0],
+})
+
+
+def assert_same_recognition(actual, expected):
+    pd.testing.assert_frame_equal(actual.to_frame(), expected.to_frame())
+    pd.testing.assert_frame_equal(actual.monthly_totals(), expected.monthly_totals())
+    pd.testing.assert_frame_equal(actual.journal().to_frame(), expected.journal().to_frame())
+
+
+def test_every_lease_straight_lines_its_cash_rent():
+    result = RecognitionEngine().recognize(ROLL)
+
+    schedule = result.to_frame()
+    totals = schedule.groupby("Lease")[["Cash Rent ($)", "Straight-Line Rent ($)"]].sum()
+    assert totals["Cash Rent ($)"].round(2).tolist() == totals["Straight-Line Rent ($)"].round(2).tolist()
+    last = schedule.groupby("Lease").tail(1)
+    assert last["Accrued (Deferred) Rent ($)"].tolist() == [0.0] * 4
+    assert last["Unamortized Incentive ($)"].tolist() == [0.0] * 4
+
+
+@pytest.mark.parametrize("amend", [
+    lambda roll: roll.assign(monthly_rent=roll["monthly_rent"].where(roll["lease"] != "L2", 1900.0)),
+    lambda roll: roll[roll["lease"] != "L3"],
+    lambda roll: pd.concat([roll, ROLL.iloc[[0]].assign(lease="L5", start="2025-02-01")], ignore_index=True),
+    lambda roll: roll.iloc[::-1],
+    lambda roll: roll.assign(end=roll["end"].where(roll["lease"] != "L1", "2027-01-14"), free_months=0),
+], ids=["changed", "removed", "added", "reordered", "several changed"])
+def test_amended_roll_equals_a_full_recompute(amend):
+    engine = RecognitionEngine()
+    engine.recognize(ROLL)
+    amended = amend(ROLL)
+
+    incremental = engine.recognize(amended)
+
+    assert_same_recognition(incremental, RecognitionEngine().recognize(amended))
+    assert incremental.changes["reused"] > 0
+
+
+def test_changes_are_counted():
+    engine = RecognitionEngine()
+    engine.recognize(ROLL)
+    kept = ROLL[ROLL["lease"] != "L4"]
+    kept = kept.assign(monthly_rent=kept["monthly_rent"].where(kept["lease"] != "L1", 2600.0))
+    amended = pd.concat([kept, ROLL.iloc[[1]].assign(lease="L6")], ignore_index=True)
+
+    changes = engine.recognize(amended).changes
+
+    assert changes == {"added": 1, "changed": 1, "removed": 1, "reused": 2}
@@ -0,0 +1,28 @@
+import pandas as pd
+
+from course.journal import Journal
+from course.snapshots import Snapshot
+
+
+def journal():
+    return Journal.from_frame(pd.DataFrame({
+        "Entry": [0, 0, 1, 1, 1, 2, 2],
+        "Date": ["2025-01-31", "2025-01-31", "2025-02-28", "2025-02-28", "2025-02-28", "2025-03-31", "2025-03-31"],
+        "Account": ["Cash", "Rental Income", "Repairs", "Utilities", "Cash", "Cash", "Owner Equity"],
+        "Category": ["Asset", "Revenue", "Expense", "Expense", "Asset", "Asset", "Equity"],
+        "Entry Type": ["Debit", "Credit", "Debit", "Debit", "Credit", "Debit", "Credit"],
+        "Amount ($)": [500.0, 500.0, 120.0, 80.0, 200.0, 1000.0, 1000.0],
+    }))
+
+
+def test_entries_follow_voids_and_reschedules():
+    root = Snapshot.from_journal(journal())
+    assert root.entries()["Accounts"].to_dict() == {
+        0: "Cash / Rental Income", 1: "Repairs / Utilities / Cash", 2: "Cash / Owner Equity"}
+
+    branch = root.void([0]).reschedule([1], pd.Timestamp("2025-04-30"))
+    entries = branch.entries()
+    assert entries.index.tolist() == [2, 3]
+    assert entries.at[3, "Accounts"] == "Repairs / Utilities / Cash"
+    assert entries.at[3, "Date"] == pd.Timestamp("2025-04-30")
+    assert root.entries().index.tolist() == [0, 1, 2]
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from course.journal import Journal
+from course.statements import Ledger
+
+
+def entry(category):
+    return Journal.from_frame(pd.DataFrame({
+        "Date": ["2025-03-31", "2025-03-31"],
+        "Account": ["Cash", "Mystery Account"],
+        "Category": ["Asset", category],
+        "Entry Type": ["Debit", "Credit"],
+        "Amount ($)": [100.0, 100.0],
+    }))
+
+
+@pytest.mark.parametrize("category", ["Nonsense", ""])
+def test_bad_category_posts_nothing(category):
+    ledger = Ledger()
+    ledger.post(entry("Revenue").replace(accounts=["Cash", "Rental Income"]))
+    before = ledger.trial_balance()
+
+    with pytest.raises(ValueError, match="Unknown account category"):
+        ledger.post(entry(category))
+
+    assert list(ledger.accounts) == ["Cash", "Rental Income"]
+    assert len(ledger.category) == len(ledger.section) == ledger.activity.shape[0] == 2
+    pd.testing.assert_frame_equal(ledger.trial_balance(), before)
+    assert ledger.post(entry("Revenue"))
+    assert "Mystery Account" in set(ledger.trial_balance()["Account"])
+
+
+def test_ranges_outside_the_ledger_have_no_activity():
+    ledger = Ledger()
+    for month, amount in (("2025-01-31", 100.0), ("2025-02-28", 200.0), ("2025-03-31", 400.0)):
+        ledger.post(Journal.from_frame(pd.DataFrame({
+            "Date": [month, month],
+            "Account": ["Cash", "Rental Income"],
+            "Category": ["Asset", "Revenue"],
+            "Entry Type": ["Debit", "Credit"],
+            "Amount ($)": [amount, amount],
+        })))
+    cash = list(ledger.accounts).index("Cash")
+
+    assert ledger.activity_between("2024-06", "2024-10")[cash] == 0
+    assert ledger.activity_between(None, "2024-12")[cash] == 0
+    assert ledger.activity_between("2025-06", "2025-09")[cash] == 0
+    assert ledger.activity_between("2024-01", "2025-02")[cash] == 30000
+    assert ledger.activity_between("2025-02", "2025-12")[cash] == 60000
+    assert ledger.balances("2024-12")[cash] == 0
+    assert (ledger.category_balances("2024-11") == 0).all()
+    assert ledger.income_statement("2024-01", "2024-11")["Amount ($)"].abs().sum() == 0